@@ -0,0 +1,68 @@
+"""
+Times post substring searches with each search engine:
+the per-post scan loop, the trigram index, the phrase index, the text buffer
+and all of them together, as chosen by cost.
+
+The text buffer only beats the scan loop on selective queries that the
+indexes cannot narrow down, such as phrases of common words or queries
+too short for a trigram. Queries matching most posts are handed back to
+the loop, and the indexes win wherever they apply, so the buffer is only
+used when neither index is cheaper than a scan.
+
+Run from the repository root:
+    python -m benchmarks.substring_search [number of posts]
+"""
+import random
+import sys
+import time
+from blogging.blog import Blog
+from blogging.configuration import Configuration
+
+WORDS = [
+    "journey", "storm", "trip", "once", "upon", "time", "step", "river", "Straße",
+    "mountain", "city", "train", "coffee", "morning", "evening", "letter", "garden",
+]
+QUERIES = [
+    "e", "st", "zz", "our", "river", "Coffee Mor", "ain to", "upon time step", "zzz", "a"
+]
+ENGINES = {
+    "scan": {"trigram_index": False, "phrase_index": False, "text_buffer": False},
+    "trigram": {"trigram_index": True, "phrase_index": False, "text_buffer": False},
+    "phrase": {"trigram_index": False, "phrase_index": True, "text_buffer": False},
+    "buffer": {"trigram_index": False, "phrase_index": False, "text_buffer": True},
+    "all": {"trigram_index": True, "phrase_index": True, "text_buffer": True},
+}
+
+
+def main(post_count: int = 20000, rounds: int = 5):
+    # keep everything in memory, and time the engines rather than the cache
+    Configuration.autosave = False
+    Configuration.query_cache_size = 0
+
+    generator = random.Random(1)
+    blog = Blog(1, "benchmark", "url", "email")
+    for i in range(post_count):
+        blog.create_post(
+            " ".join(generator.choices(WORDS, k=4)), " ".join(generator.choices(WORDS, k=12))
+        )
+
+    print(f"{post_count} posts, best of {rounds} rounds, milliseconds per query")
+    print("query".ljust(14) + "".join(engine.rjust(10) for engine in ENGINES) + "   matches")
+    for query in QUERIES:
+        timings = []
+        for settings in ENGINES.values():
+            for name, value in settings.items():
+                setattr(Configuration, name, value)
+            # build the engine's index outside of the timings
+            matches = len(blog.retrieve_posts(query))
+            best = float("inf")
+            for _ in range(rounds):
+                start = time.perf_counter()
+                blog.retrieve_posts(query)
+                best = min(best, time.perf_counter() - start)
+            timings.append(best * 1000)
+        print(repr(query).ljust(14) + "".join(f"{t:10.2f}" for t in timings) + f"{matches:10d}")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
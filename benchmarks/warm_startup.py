@@ -0,0 +1,58 @@
+"""
+Times loading a blog and answering its first searches, with the search
+indexes rebuilt from the posts (cold) or loaded from the saved index
+file (warm).
+
+Run from the repository root:
+    python -m benchmarks.warm_startup [number of posts]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+from blogging.blog import Blog
+from blogging.configuration import Configuration
+
+WORDS = [
+    "journey", "storm", "trip", "once", "upon", "time", "step", "river", "Straße",
+    "mountain", "city", "train", "coffee", "morning", "evening", "letter", "garden",
+]
+
+
+def first_searches(persist_indexes: bool) -> float:
+    Configuration.persist_indexes = persist_indexes
+    start = time.perf_counter()
+    blog = Blog(1, "benchmark", "url", "email")
+    blog.retrieve_posts("river", whole_words=True)
+    blog.retrieve_posts("coffee mor")
+    return time.perf_counter() - start
+
+
+def main(post_count: int = 20000, rounds: int = 3):
+    # time the indexes rather than the cache
+    Configuration.query_cache_size = 0
+    records_dir = tempfile.TemporaryDirectory()
+    Configuration.records_path = records_dir.name
+
+    generator = random.Random(1)
+    blog = Blog(1, "benchmark", "url", "email")
+    for i in range(post_count):
+        blog.create_post(
+            " ".join(generator.choices(WORDS, k=4)), " ".join(generator.choices(WORDS, k=12))
+        )
+    # fold the journal, then save the indexes once they are built
+    blog.postPickle.compact()
+    first_searches(True)
+    index_file = os.path.join(records_dir.name, "1" + Configuration.index_extension)
+
+    cold = min(first_searches(False) for _ in range(rounds))
+    warm = min(first_searches(True) for _ in range(rounds))
+    print(f"{post_count} posts, best of {rounds} rounds, index file {os.path.getsize(index_file)} bytes")
+    print(f"cold {cold * 1000:10.2f} ms")
+    print(f"warm {warm * 1000:10.2f} ms")
+    records_dir.cleanup()
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -1,4 +1,5 @@
-from blogging.dao.post_dao import PostDAOPickle
+from blogging.dao.post_dao import PostDAO, create_post_dao
+from blogging.helper import normalize_text
 from blogging.post import Post
 
 
@@ -7,15 +8,48 @@ class Blog:
         # the unique ID of the blog
         self.id: int = id
 
+        # code of the last created post, persisted with the blog metadata
         self.counter = 0
 
-        self.postPickle = PostDAOPickle(self)
+        # the posts are only loaded from the records file on first access
+        self._post_dao: PostDAO | None = None
 
         # blog data
         self.name: str = name
         self.url: str = url
         self.email: str = email
 
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @name.setter
+    def name(self, name: str) -> None:
+        self._name = name
+        # normalized once here so searches don't normalize every blog on every query
+        self.folded_name = normalize_text(name)
+
+    @property
+    def postPickle(self) -> PostDAO:
+        """
+        The DAO holding the posts of the blog,
+        created and loaded the first time it is needed
+        """
+        if self._post_dao is None:
+            self._post_dao = create_post_dao(self)
+        return self._post_dao
+
+    @property
+    def posts(self) -> list[Post]:
+        """
+        The posts of the blog, from the first created to the last created
+        """
+        return self.postPickle.posts
+
+    @posts.setter
+    def posts(self, posts: list[Post]) -> None:
+        self.postPickle.posts = posts
+
     def set_values(self, id: int, name: str, url: str, email: str) -> None:
         """
         Sets the values of the blog.
@@ -28,6 +62,8 @@ class Blog:
 
         # Only Update data if it is different
         if self.id != id:
+            # the posts are found by the blog ID, so they are loaded before it changes
+            self.postPickle
             self.id = id
         if self.name != name:
             self.name = name
@@ -55,15 +91,72 @@ class Blog:
         """
         return self.postPickle.search_post(code)
 
-    def retrieve_posts(self, text: str) -> list[Post]:
+    def retrieve_posts(self, text: str, whole_words: bool = False) -> list[Post]:
         """
         Retrieves all posts given a search text.
         Args: text (str): the text to find in posts
+                whole_words (bool): match the words of the text as whole words,
+                in any order, instead of as a substring
 
         Returns a list of all posts that contain
         the search query in the title or text
         """
-        return self.postPickle.retrieve_posts(search_string=text)
+        return self.postPickle.retrieve_posts(search_string=text, whole_words=whole_words)
+
+    def retrieve_posts_regex(self, pattern: str, flags: int = 0):
+        """
+        Retrieves the posts matching a regular expression, as they are found.
+        Args: pattern (str): the regular expression to search posts for
+                flags (int): the re flags, e.g. re.IGNORECASE
+
+        Returns a generator of the posts whose title or text
+        matches the pattern, from the first created to the last created
+        """
+        return self.postPickle.retrieve_posts_regex(pattern, flags)
+
+    def rank_posts(self, text: str, k: int = 10) -> list[Post]:
+        """
+        Retrieves the posts most relevant to a search text,
+        scored with BM25 over their titles and texts.
+        Args: text (str): the words to find in posts
+                k (int): the number of posts to return
+
+        Returns a list of at most k posts that contain any
+        word of the search text, most relevant first
+        """
+        return self.postPickle.rank_posts(text, k)
+
+    def posts_between(self, start, end, field: str = "update_time") -> list[Post]:
+        """
+        Retrieves the posts created or updated in a time range.
+        Args: start (tuple): the earliest timestamp (year, month, day, hour, minute),
+                or None for no lower bound
+                end (tuple): the timestamp past the latest, or None for no upper bound
+                field (str): "creation_time" or "update_time"
+
+        Returns a list of the posts whose timestamp is at or after start
+        and before end, from the oldest timestamp to the newest
+        """
+        return self.postPickle.posts_between(start, end, field)
+
+    def query_posts(self, query: str) -> list[Post]:
+        """
+        Retrieves the posts matching a query, e.g. title:trip AND NOT "long journey"
+        or updated:>=2026-01-31, see blogging.query.parser.parse for the syntax.
+        Args: query (str): the query
+
+        Returns a list of the matching posts, from the first created to the last created
+        """
+        return self.postPickle.query_posts(query)
+
+    def explain_posts(self, query: str) -> str:
+        """
+        Runs a query, timing every stage of the plan chosen for it.
+        Args: query (str): the query
+
+        Returns the plan as text
+        """
+        return self.postPickle.explain_posts(query)
 
     def update_post(self, code: int, title: str, text: str) -> Post:
         """
@@ -99,6 +192,33 @@ class Blog:
         """
         return self.postPickle.list_posts()
 
+    def iter_posts(self, text: str = None, whole_words: bool = False,  # type: ignore
+                   newest_first: bool = False):
+        """
+        Streams the posts of a blog, so that a caller can stop early
+        without all of them being read.
+        Args: text (str): the text to find in posts as retrieve_posts does,
+                or None for every post
+                whole_words (bool): match the words of the text as whole words
+                newest_first (bool): from the last created post instead of the first created
+
+        Returns a generator of the posts
+        """
+        return self.postPickle.iter_posts(text, whole_words, newest_first)
+
+    def page_posts(self, limit: int, cursor=None) -> tuple:
+        """
+        Lists one page of posts from a blog,
+        from the last created post to the first created post.
+        Args: limit (int): the number of posts in a page
+                cursor (str): the cursor returned with the previous page,
+                or None for the first page
+
+        Returns a tuple of the list of posts in the page and the
+        cursor of the next page, or None if it is the last page
+        """
+        return self.postPickle.page_posts(limit, cursor)
+
     def to_list(self):
         return [self.id, self.name, self.email, self.url]
 
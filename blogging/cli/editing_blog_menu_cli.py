@@ -1,3 +1,5 @@
+from itertools import islice
+from blogging.configuration import Configuration
 from blogging.controller import Controller
 from blogging.exception.illegal_access_exception import IllegalAccessException
 from blogging.exception.no_current_blog_exception import NoCurrentBlogException
@@ -133,12 +135,16 @@ class EditingBlogMenuCLI():
     def list_full_blog_contents(self):
         print('LIST FULL BLOG CONTENTS:\n')
         try:
-            posts = self.controller.list_posts()
-            if posts:
-                for post in posts:
-                    self.print_post_data(post)
-            else:
+            posts = self.controller.iter_posts(newest_first=True)
+            page = list(islice(posts, Configuration.page_size))
+            if not page:
                 print('\nBlog is empty.\n')
+            while page:
+                for post in page:
+                    self.print_post_data(post)
+                page = list(islice(posts, Configuration.page_size))
+                if not page or input('Type ENTER for more posts, or q to stop: ').lower() == 'q':
+                    break
         except IllegalAccessException:
             print('\nMUST LOGIN FIRST.')
         except NoCurrentBlogException:
@@ -1,3 +1,5 @@
+from itertools import islice
+from blogging.configuration import Configuration
 from blogging.controller import Controller
 from blogging.exception.invalid_logout_exception import InvalidLogoutException
 from blogging.exception.illegal_access_exception import IllegalAccessException
@@ -177,12 +179,16 @@ class MainMenuCLI():
     def list_all_blogs(self):
         print('LIST ALL BLOGS:\n')
         try:
-            blogs = self.controller.list_blogs()
-            if blogs:
-                for blog in blogs:
-                    print(blog)
-            else:
+            blogs = self.controller.iter_blogs()
+            page = list(islice(blogs, Configuration.page_size))
+            if not page:
                 print('\nNo blogs registered in the system.\n')
+            while page:
+                for blog in page:
+                    print(blog)
+                page = list(islice(blogs, Configuration.page_size))
+                if not page or input('Type ENTER for more blogs, or q to stop: ').lower() == 'q':
+                    break
         except IllegalAccessException:
             print('\nMUST LOGIN FIRST.')
 
@@ -3,7 +3,66 @@ class Configuration():
     autosave=True
     users_file = "blogging/users.txt"
     blogs_file = "blogging/blogs.json"
+    blogs_journal_file = "blogging/blogs.log"
     records_path = "blogging/records"
     records_extension = ".dat"
+    # how files are rewritten: "none" in place, "atomic" through a temporary file
+    # and a rename, "fsync" like atomic and also synced to disk
+    durability = "atomic"
+    # "json" keeps blogs in blogs_file and posts in records_path,
+    # "sqlite" keeps both in database_file (always saved, regardless of autosave)
+    storage_backend = "json"
+    database_file = "blogging/blogging.db"
+    # append mutations to journals instead of rewriting blogs.json and the records files
+    journaling = True
+    journal_extension = ".log"
+    # number of post journal records appended before folding them into a new snapshot
+    journal_compaction_threshold = 500
+    # the blogs journal is compacted in the background once it is larger than both
+    # this many bytes and blogs.json, or once its oldest line is this many seconds old
+    blogs_journal_max_bytes = 64 * 1024
+    blogs_journal_max_age = 60
+    # save mutations on a background thread, coalescing the mutations made within
+    # write_behind_interval_ms, or as soon as write_behind_max_ops are pending
+    write_behind = False
+    write_behind_interval_ms = 200
+    write_behind_max_ops = 100
+    # save the built search indexes next to blogs.json and the records files,
+    # and load them at startup instead of rebuilding them while still up to date
+    persist_indexes = True
+    index_extension = ".idx"
+    # answer whole word post searches from a word index built on first use
+    full_text_index = True
+    # narrow substring searches of three or more characters with a trigram index,
+    # and score fuzzy blog name searches with a trigram similarity index
+    trigram_index = True
+    # narrow post substring searches of two or more words with a positional index of
+    # the words, checking they appear in a row, built on first use
+    phrase_index = True
+    # the lowest share of trigrams a blog name and a fuzzy search must have in common
+    fuzzy_threshold = 0.3
+    # answer post substring searches by scanning one contiguous buffer of all the
+    # normalized titles and texts of a blog, in place of checking every post when
+    # the phrase and trigram indexes cannot narrow the search down more cheaply
+    text_buffer = False
+    # run regular expression searches once over all the posts of a blog joined
+    # together, rather than once per post, when the pattern has no anchors or lookarounds
+    regex_buffer = True
+    # complete blog name prefixes from a sorted index of the names
+    prefix_index = True
+    # how much more a word in a post title counts than one in its text when ranking
+    rank_title_weight = 2.0
+    # searches across all blogs are split into shards of this many blogs, searched
+    # by search_processes worker processes (0 for one per CPU); fewer blogs than
+    # one shard are searched in process
+    search_shard_size = 32
+    search_processes = 0
+    # reject a blog whose URL or email, once normalized, another blog already has
+    unique_blog_urls = False
+    unique_blog_emails = False
+    # number of post and blog searches whose results are cached, 0 to disable the cache
+    query_cache_size = 256
+    # number of blogs or posts the CLI and GUI list at a time
+    page_size = 20
     
 
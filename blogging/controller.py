@@ -1,6 +1,9 @@
 from blogging.blog import Blog
 from blogging.post import Post
-from blogging.dao.blog_dao import BlogDAOJSON
+from blogging.dao.blog_dao import create_blog_dao
+from blogging.dao.global_search import search_all_posts
+from blogging.dao.query_cache import query_cache
+from blogging.dao.write_behind import write_behind_flusher
 from blogging.helper import get_password_hash, raise_exception
 from blogging.configuration import Configuration
 from blogging.exception.invalid_login_exception import InvalidLoginException
@@ -32,7 +35,8 @@ class Controller:
 
         self.is_logged_in: bool = False
         self.blogs: list[Blog] = []
-        self.blogJSON = BlogDAOJSON()
+        # the storage backend is picked by the Configuration
+        self.blogJSON = create_blog_dao()
         self.current_blog: Blog = None  # type:ignore
 
     # LOG IN/OUT METHODS
@@ -55,6 +59,8 @@ class Controller:
         if not self.is_logged_in:
             raise_exception(InvalidLogoutException, "Can't log out if not logged in")
 
+        # make sure the session's changes are on disk
+        write_behind_flusher.drain()
         self.is_logged_in = False
         return True
 
@@ -93,17 +99,78 @@ class Controller:
         new_blog: Blog = Blog(id, name, url, email)
         return self.blogJSON.create_blog(new_blog)
 
-    def retrieve_blogs(self, search_string: str) -> list[Blog]:
+    def retrieve_blogs(self, search_string: str, fuzzy: bool = False) -> list[Blog]:
         """
         Retrieve blogs whose name contains the given filter string.
 
         Args: name (str): The fuzzy find filter string
+              fuzzy (bool): tolerate typos, returning the blogs whose name is
+              similar to the filter string, most similar first
         Returns list of blogs or raises an error
         """
         if not self.is_logged_in:
             raise_exception(IllegalAccessException, "must be logged in to search blogs")
 
-        return self.blogJSON.retrieve_blogs(search_string)
+        return self.blogJSON.retrieve_blogs(search_string, fuzzy)
+
+    def complete_blog_names(self, prefix: str, k: int = 10) -> list[str]:
+        """
+        Suggests the names of blogs as their start is being typed.
+        Args: prefix (str): the start of the name, in any case
+              k (int): the most names to suggest
+        Returns the distinct matching names in alphabetical order
+        """
+        if not self.is_logged_in:
+            raise_exception(IllegalAccessException, "must be logged in to search blogs")
+
+        return self.blogJSON.complete_blog_names(prefix, k)
+
+    def find_blog_by_url(self, url: str):
+        """
+        Find the blog at the given URL, ignoring its scheme, "www." and case.
+        Args: url (str): the URL of the blog
+        Returns the Blog, or None if no blog has that URL
+        """
+        if not self.is_logged_in:
+            raise_exception(IllegalAccessException, "must be logged in to search blogs")
+
+        return self.blogJSON.find_blog_by_url(url)
+
+    def find_blog_by_email(self, email: str):
+        """
+        Find the blog with the given email, in any case.
+        Args: email (str): the email of the blog
+        Returns the Blog, or None if no blog has that email
+        """
+        if not self.is_logged_in:
+            raise_exception(IllegalAccessException, "must be logged in to search blogs")
+
+        return self.blogJSON.find_blog_by_email(email)
+
+    def query_blogs(self, query: str) -> list[Blog]:
+        """
+        Retrieve the blogs matching a query, terms like travel, name:"my trips",
+        url:example.com, email:me@example.com or id:>10 combined with AND, OR,
+        NOT and parentheses.
+        Args: query (str): the query
+        Returns list of blogs in creation order,
+        raises InvalidQueryException if the query is invalid
+        """
+        if not self.is_logged_in:
+            raise_exception(IllegalAccessException, "must be logged in to search blogs")
+
+        return self.blogJSON.query_blogs(query)
+
+    def explain_blogs(self, query: str) -> str:
+        """
+        Run a blog query, timing every stage of its plan.
+        Args: query (str): the query
+        Returns the chosen plan as text
+        """
+        if not self.is_logged_in:
+            raise_exception(IllegalAccessException, "must be logged in to search blogs")
+
+        return self.blogJSON.explain_blogs(query)
 
     def update_blog(
         self, search_id, new_id: int, name: str, url: str, email: str
@@ -162,6 +229,33 @@ class Controller:
             )
         return self.blogJSON.list_blogs()
 
+    def iter_blogs(self, search_string: str = None, newest_first: bool = False):  # type: ignore
+        """
+        Stream the blogs in the system, optionally those whose name contains a filter string.
+        Args: search_string (str): the filter string, None for every blog
+              newest_first (bool): from the last created blog instead of the first created
+        Returns: a generator of the blogs
+        """
+        if not self.is_logged_in:
+            raise_exception(
+                IllegalAccessException, "can't list blogs when not logged in"
+            )
+        return self.blogJSON.iter_blogs(search_string, newest_first)
+
+    def page_blogs(self, limit: int, cursor: str = None) -> tuple:  # type: ignore
+        """
+        List one page of the blogs in the system, in increasing ID order.
+        Args: limit (int): the number of blogs in a page
+              cursor (str): the cursor returned with the previous page, None for the first page
+        Returns: a tuple of the list of blogs in the page and the cursor
+        of the next page, None if this is the last page
+        """
+        if not self.is_logged_in:
+            raise_exception(
+                IllegalAccessException, "can't list blogs when not logged in"
+            )
+        return self.blogJSON.page_blogs(limit, cursor)
+
     def set_current_blog(self, id: int) -> None:
         """
         Sets the current blog
@@ -243,11 +337,13 @@ class Controller:
 
         return self.current_blog.search_post(code)
 
-    def retrieve_posts(self, text: str):
+    def retrieve_posts(self, text: str, whole_words: bool = False):
         """
         Retrieves all the post given a text search string
 
         Args: text (str), the text to find
+              whole_words (bool), match the words of the text as whole words,
+              in any order, instead of as a substring
         Returns a list of all posts that contain that text in the post
         """
         if not self.is_logged_in:
@@ -258,7 +354,122 @@ class Controller:
         if not self.current_blog:
             raise_exception(NoCurrentBlogException, "No current blog set")
 
-        return self.current_blog.retrieve_posts(text)
+        return self.current_blog.retrieve_posts(text, whole_words)
+
+    def retrieve_posts_regex(self, pattern: str, flags: int = 0):
+        """
+        Retrieves the posts of the current blog matching a regular expression,
+        e.g. dates or ticket numbers
+
+        Args: pattern (str), the regular expression
+              flags (int), the re flags, e.g. re.IGNORECASE
+        Returns a generator of the matching posts, so callers can stop early;
+        raises IllegalOperationException if the pattern is invalid
+        """
+        if not self.is_logged_in:
+            raise_exception(
+                IllegalAccessException, "can't retrieve posts without being logged in"
+            )
+
+        if not self.current_blog:
+            raise_exception(NoCurrentBlogException, "No current blog set")
+
+        return self.current_blog.retrieve_posts_regex(pattern, flags)
+
+    def rank_posts(self, text: str, k: int = 10):
+        """
+        Retrieves the posts of the current blog most relevant to a text search string
+
+        Args: text (str), the words to find
+              k (int), the number of posts to return
+        Returns a list of at most k posts, most relevant first
+        """
+        if not self.is_logged_in:
+            raise_exception(
+                IllegalAccessException, "can't rank posts without being logged in"
+            )
+
+        if not self.current_blog:
+            raise_exception(NoCurrentBlogException, "No current blog set")
+
+        return self.current_blog.rank_posts(text, k)
+
+    def posts_between(self, start, end, field: str = "update_time"):
+        """
+        Retrieves the posts of the current blog created or updated in a time range,
+        e.g. what changed since a given time when end is None
+
+        Args: start (tuple), the earliest timestamp, None for no lower bound
+              end (tuple), the timestamp past the latest, None for no upper bound
+              field (str), "creation_time" or "update_time"
+        Returns a list of the posts in range, from the oldest timestamp to the newest
+        """
+        if not self.is_logged_in:
+            raise_exception(
+                IllegalAccessException, "can't retrieve posts without being logged in"
+            )
+
+        if not self.current_blog:
+            raise_exception(NoCurrentBlogException, "No current blog set")
+
+        return self.current_blog.posts_between(start, end, field)
+
+    def query_posts(self, query: str):
+        """
+        Retrieves the posts of the current blog matching a query, terms like
+        journey, "long journey", title:trip, text:storm, code:>10 or
+        updated:>=2026-01-31 combined with AND, OR, NOT and parentheses
+
+        Args: query (str), the query
+        Returns a list of the matching posts, from the first created to the last created,
+        raises InvalidQueryException if the query is invalid
+        """
+        if not self.is_logged_in:
+            raise_exception(
+                IllegalAccessException, "can't retrieve posts without being logged in"
+            )
+
+        if not self.current_blog:
+            raise_exception(NoCurrentBlogException, "No current blog set")
+
+        return self.current_blog.query_posts(query)
+
+    def explain_posts(self, query: str) -> str:
+        """
+        Runs a post query on the current blog, timing every stage of its plan,
+        to find out why a query is slow
+
+        Args: query (str), the query
+        Returns the chosen plan as text
+        """
+        if not self.is_logged_in:
+            raise_exception(
+                IllegalAccessException, "can't retrieve posts without being logged in"
+            )
+
+        if not self.current_blog:
+            raise_exception(NoCurrentBlogException, "No current blog set")
+
+        return self.current_blog.explain_posts(query)
+
+    def search_all_posts(self, text: str, limit: int = None):  # type: ignore
+        """
+        Retrieves the posts of every blog that contain a text search string,
+        no current blog needed
+
+        Args: text (str), the text to find
+              limit (int), the most posts to return, None for all of them
+        Returns a list of (blog id, post) pairs, in blog order
+        and from the first created post to the last created in each blog
+        """
+        if not self.is_logged_in:
+            raise_exception(
+                IllegalAccessException, "can't search posts without being logged in"
+            )
+
+        # the workers read the records, so pending mutations go first
+        write_behind_flusher.drain()
+        return search_all_posts(self.blogJSON.list_blogs(), text, limit)
 
     def update_post(self, code: int, title: str, text: str) -> Post:
         """
@@ -313,6 +524,52 @@ class Controller:
 
         return self.current_blog.list_posts()
 
+    def iter_posts(self, text: str = None, whole_words: bool = False,  # type: ignore
+                   newest_first: bool = False):
+        """
+        Streams the posts in the current blog, optionally those containing a text
+        Args: text (str), the text to find, None for every post
+              whole_words (bool), match the words of the text as whole words
+              newest_first (bool), from the last created post instead of the first created
+        Returns a generator of the posts
+        """
+        if not self.is_logged_in:
+            raise_exception(
+                IllegalAccessException, "can't list posts without being logged in"
+            )
+
+        if not self.current_blog:
+            raise_exception(NoCurrentBlogException, "No current blog set")
+
+        return self.current_blog.iter_posts(text, whole_words, newest_first)
+
+    def page_posts(self, limit: int, cursor: str = None) -> tuple:  # type: ignore
+        """
+        Lists one page of the posts in the current blog, from the last created
+        Args: limit (int), the number of posts in a page
+              cursor (str), the cursor returned with the previous page, None for the first page
+        Returns a tuple of the list of posts in the page and the cursor
+        of the next page, None if this is the last page
+        """
+        if not self.is_logged_in:
+            raise_exception(
+                IllegalAccessException, "can't list posts without being logged in"
+            )
+
+        if not self.current_blog:
+            raise_exception(NoCurrentBlogException, "No current blog set")
+
+        return self.current_blog.page_posts(limit, cursor)
+
+    def query_cache_stats(self) -> dict:
+        """
+        Reports how well the search result cache is doing, to size it
+        Args: None
+        Returns a dict of the hit, miss and eviction counts
+        and the number of cached searches
+        """
+        return query_cache.stats()
+
 
 if __name__ == "__main__":
     controller = Controller()
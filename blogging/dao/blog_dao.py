@@ -1,9 +1,40 @@
 from abc import ABC, abstractmethod
+import copy
+from itertools import islice
 import json
+import os
+import pickle
+import threading
+import time
 from blogging.configuration import Configuration
-from blogging.helper import binary_search, json_update_file, raise_exception
+from blogging.helper import (
+    bytes_append_file,
+    bytes_update_file,
+    decode_cursor,
+    encode_cursor,
+    json_read_lines,
+    json_update_file,
+    normalize_email,
+    normalize_text,
+    normalize_url,
+    raise_exception,
+    remove_file,
+)
 from blogging.blog import Blog
 from blogging.dao.blog_encoder_decoder import BlogDecoder, BlogEncoder
+from blogging.dao.sqlite_database import get_connection
+from blogging.dao.query_cache import next_generation, query_cache
+from blogging.dao.write_behind import write_behind_flusher
+from blogging.index.hash_index import HashIndex
+from blogging.index.index_file import load_indexes, save_indexes
+from blogging.index.ngram_index import NgramIndex, similarity
+from blogging.index.prefix_index import PrefixIndex
+from blogging.index.sorted_index import SortedIndex
+from blogging.index.trigram_index import TrigramIndex
+from blogging.query.parser import BLOG_FIELDS, parse
+from blogging.query.planner import QueryPlan
+from blogging.query.sources import BlogSource
+from blogging.query.sql import BLOG_COLUMNS, explain_sql, to_sql
 from blogging.exception.illegal_access_exception import IllegalAccessException
 from blogging.exception.illegal_operation_exception import IllegalOperationException
 
@@ -19,7 +50,27 @@ class BlogDAO(ABC):
         pass
 
     @abstractmethod
-    def retrieve_blogs(self, search_string):
+    def retrieve_blogs(self, search_string, fuzzy=False):
+        pass
+
+    @abstractmethod
+    def complete_blog_names(self, prefix, k):
+        pass
+
+    @abstractmethod
+    def find_blog_by_url(self, url):
+        pass
+
+    @abstractmethod
+    def find_blog_by_email(self, email):
+        pass
+
+    @abstractmethod
+    def query_blogs(self, query):
+        pass
+
+    @abstractmethod
+    def explain_blogs(self, query):
         pass
 
     @abstractmethod
@@ -34,11 +85,25 @@ class BlogDAO(ABC):
     def list_blogs(self):
         pass
 
+    @abstractmethod
+    def iter_blogs(self, search_string=None, newest_first=False):
+        pass
+
+    @abstractmethod
+    def page_blogs(self, limit, cursor=None):
+        pass
+
 
 class BlogDAOJSON(BlogDAO):
     def __init__(self):
         self.autosave = Configuration.autosave
+        self.journaling = Configuration.journaling
         self.blogs_file = Configuration.blogs_file
+        self.blogs_journal_file = Configuration.blogs_journal_file
+        # the indexes built over blogs.json, see _save_indexes
+        self.blogs_index_file = (
+            os.path.splitext(self.blogs_file)[0] + Configuration.index_extension
+        )
         self.blogs = []
         try:
             file = open(self.blogs_file, "r")
@@ -49,15 +114,366 @@ class BlogDAOJSON(BlogDAO):
             print(f"FILE ERROR ###{FileError}###")
             json_update_file(self.blogs, self.blogs_file, Encoder=BlogEncoder)
 
+        # primary index of the blogs by their unique ID
+        self.blogs_by_id: dict[int, Blog] = {blog.id: blog for blog in self.blogs}
+        # creation order of the blogs, to sort the results of index lookups
+        self.blog_positions: dict[int, int] = {
+            blog.id: position for position, blog in enumerate(self.blogs)
+        }
+        self.next_position = len(self.blogs)
+        # sorted blog IDs, to page through the blogs by ID, built on first use
+        self.id_index: SortedIndex | None = None
+        # normalized URL and email -> IDs of the blogs having them, built on first use
+        self.url_index: HashIndex | None = None
+        self.email_index: HashIndex | None = None
+        # changes on every create, update and delete, invalidating the cached searches
+        self.generation = next_generation()
+        # substring index over the blog names, built on the first search that needs it
+        self.name_index: TrigramIndex | None = None
+        # sorted blog names for completing prefixes, built on first use
+        self.prefix_index: PrefixIndex | None = None
+        # similarity index over the blog names for fuzzy searches, built on first use
+        self.fuzzy_index: NgramIndex | None = None
+
+        # keeps the blogs and the journal consistent while they are
+        # saved on the write-behind or compaction threads
+        self.lock = threading.RLock()
+        # encoded journal lines waiting to be written
+        self.pending_lines: list[str] = []
+        self.compaction_thread: threading.Thread | None = None
+        # one compaction at a time, as each trims the journal the previous one left
+        self.compaction_lock = threading.Lock()
+        # size of the journal and the time its oldest line was appended
+        self.journal_bytes = 0
+        self.journal_started: float | None = None
+        # the generation whose blogs are exactly those of blogs.json,
+        # None while the journal or unsaved mutations hold more
+        self.snapshot_generation: int | None = None
+
+        self._load_indexes()
+        # replay the mutations saved since the last compaction,
+        # updating the indexes loaded along with blogs.json
+        journal = json_read_lines(self.blogs_journal_file, Decoder=BlogDecoder, repair=True)
+        for record in journal:
+            self._replay(record)
+        if not journal:
+            self.snapshot_generation = self.generation
+        if os.path.exists(self.blogs_journal_file):
+            self.journal_bytes = os.path.getsize(self.blogs_journal_file)
+            self.journal_started = os.path.getmtime(self.blogs_journal_file)
+
+    def _replay(self, record: dict):
+        """
+        Applies one journal line to the blogs list.
+        Lines already folded into blogs.json are skipped, so the journal
+        can safely be replayed over a newer blogs.json.
+        Args: record (dict): the journaled operation
+        """
+        operation = record["op"]
+        if operation == "create":
+            blog = self.search_blog(record["blog"].id)
+            if blog:
+                self._set_blog_values(blog, record["blog"])
+            else:
+                self._add_blog(record["blog"])
+        elif operation == "update":
+            blog = self.search_blog(record["key"])
+            new_blog = record["blog"]
+            if blog and (new_blog.id == record["key"] or not self.search_blog(new_blog.id)):
+                self._set_blog_values(blog, new_blog)
+        elif operation == "delete":
+            self._remove_blog(record["key"])
+
+    def _add_blog(self, blog: Blog):
+        self.generation = next_generation()
+        self.blogs.append(blog)
+        self.blogs_by_id[blog.id] = blog
+        self.blog_positions[blog.id] = self.next_position
+        self.next_position += 1
+        for index, fields in self._built_indexes():
+            index.add(blog.id, fields(blog))
+
+    def _set_blog_values(self, blog: Blog, new_blog: Blog):
+        """
+        Copies the values of new_blog into blog, re-keying the index if the ID changes
+        """
+        self.generation = next_generation()
+        old_blog = copy.copy(blog)
+        blog.set_values(id=new_blog.id, name=new_blog.name, url=new_blog.url, email=new_blog.email)
+        if blog.id != old_blog.id:
+            del self.blogs_by_id[old_blog.id]
+            self.blogs_by_id[blog.id] = blog
+            self.blog_positions[blog.id] = self.blog_positions.pop(old_blog.id)
+        for index, fields in self._built_indexes():
+            if blog.id != old_blog.id or fields(blog) != fields(old_blog):
+                index.remove(old_blog.id, fields(old_blog))
+                index.add(blog.id, fields(blog))
+
+    def _remove_blog(self, key: int):
+        blog = self.blogs_by_id.pop(key, None)
+        if blog:
+            self.generation = next_generation()
+            self.blogs = [blog for blog in self.blogs if blog.id != key]
+            del self.blog_positions[key]
+            for index, fields in self._built_indexes():
+                index.remove(key, fields(blog))
+
+    def _get_name_index(self) -> TrigramIndex:
+        if self.name_index is None:
+            self.name_index = TrigramIndex()
+            for blog in self.blogs:
+                self.name_index.add(blog.id, (blog.name,))
+            self._save_indexes()
+        return self.name_index
+
+    def _get_prefix_index(self) -> PrefixIndex:
+        if self.prefix_index is None:
+            self.prefix_index = PrefixIndex((blog.id, (blog.name,)) for blog in self.blogs)
+            self._save_indexes()
+        return self.prefix_index
+
+    def _get_fuzzy_index(self) -> NgramIndex:
+        if self.fuzzy_index is None:
+            self.fuzzy_index = NgramIndex()
+            for blog in self.blogs:
+                self.fuzzy_index.add(blog.id, (blog.name,))
+            self._save_indexes()
+        return self.fuzzy_index
+
+    def _get_id_index(self) -> SortedIndex:
+        if self.id_index is None:
+            self.id_index = SortedIndex((blog.id, (blog.id,)) for blog in self.blogs)
+            self._save_indexes()
+        return self.id_index
+
+    def _get_url_index(self) -> HashIndex:
+        if self.url_index is None:
+            self.url_index = HashIndex(normalize_url, ((blog.id, (blog.url,)) for blog in self.blogs))
+            self._save_indexes()
+        return self.url_index
+
+    def _get_email_index(self) -> HashIndex:
+        if self.email_index is None:
+            self.email_index = HashIndex(
+                normalize_email, ((blog.id, (blog.email,)) for blog in self.blogs)
+            )
+            self._save_indexes()
+        return self.email_index
+
+    def _built_indexes(self) -> list:
+        """
+        The built indexes, each with the function giving the fields it indexes
+        """
+        name = lambda blog: (blog.name,)
+        indexes = [
+            (self.name_index, name),
+            (self.prefix_index, name),
+            (self.fuzzy_index, name),
+            (self.id_index, lambda blog: (blog.id,)),
+            (self.url_index, lambda blog: (blog.url,)),
+            (self.email_index, lambda blog: (blog.email,)),
+        ]
+        return [(index, fields) for index, fields in indexes if index is not None]
+
+    def _check_unique(self, blog: Blog, key=None) -> None:
+        """
+        Raises IllegalOperationException if another blog than the one with
+        the given key already has the URL or email of the blog, when the
+        Configuration asks for them to be unique
+        """
+        if Configuration.unique_blog_urls and self._get_url_index().lookup(blog.url) - {key}:
+            raise_exception(IllegalOperationException, "a blog with this URL already exists")
+        if Configuration.unique_blog_emails and self._get_email_index().lookup(blog.email) - {key}:
+            raise_exception(IllegalOperationException, "a blog with this email already exists")
+
+    def _dump_indexes(self):
+        """
+        Returns the built indexes pickled, or None if none is built
+        """
+        indexes = {
+            "name_index": self.name_index,
+            "prefix_index": self.prefix_index,
+            "fuzzy_index": self.fuzzy_index,
+            "id_index": self.id_index,
+            "url_index": self.url_index,
+            "email_index": self.email_index,
+        }
+        if all(index is None for index in indexes.values()):
+            return None
+        return pickle.dumps(indexes, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def _load_indexes(self) -> None:
+        """
+        Loads the indexes saved along with blogs.json, unless it changed since
+        """
+        if not Configuration.persist_indexes:
+            return
+        indexes = load_indexes(self.blogs_index_file, self.blogs_file)
+        if indexes:
+            self.name_index = indexes["name_index"]
+            self.prefix_index = indexes["prefix_index"]
+            self.fuzzy_index = indexes["fuzzy_index"]
+            self.id_index = indexes["id_index"]
+            self.url_index = indexes["url_index"]
+            self.email_index = indexes["email_index"]
+
+    def _save_indexes(self) -> None:
+        """
+        Saves the built indexes once a new one is built. The saved indexes
+        must match blogs.json, so while the journal or unsaved mutations
+        hold more blogs, they are left to the next compaction, which saves
+        them along with the new blogs.json.
+        """
+        if not Configuration.persist_indexes or not self.autosave:
+            return
+        with self.lock:
+            if self.generation != self.snapshot_generation:
+                return
+            indexes = self._dump_indexes()
+        if indexes is not None:
+            save_indexes(self.blogs_index_file, self.blogs_file, indexes)
+
+    def _first_created(self, keys: set):
+        if not keys:
+            return None
+        return self.blogs_by_id[min(keys, key=self.blog_positions.__getitem__)]
+
+    def _persist(self, record: dict):
+        """
+        Saves one mutation, right away or later on the write-behind thread
+        Args: record (dict): the operation, its key and the new blog
+        """
+        if not self.autosave:
+            return
+
+        if self.journaling:
+            # encoded now so later changes to the blog don't leak into the line
+            self.pending_lines.append(json.dumps(record, cls=BlogEncoder))
+
+        if Configuration.write_behind:
+            write_behind_flusher.mark_dirty(self.blogs_file, self.flush)
+        else:
+            self.flush()
+
+    def flush(self):
+        """
+        Writes the pending mutations, either as lines appended to the journal
+        or by rewriting blogs.json when journaling is off
+        """
+        if not self.journaling:
+            with self.lock:
+                payload = [BlogEncoder().default(blog) for blog in self.blogs]
+                generation = self.generation
+            json_update_file(payload, self.blogs_file, Encoder=BlogEncoder)
+            self.snapshot_generation = generation
+            return
+
+        with self.lock:
+            lines, self.pending_lines = self.pending_lines, []
+            if not lines:
+                return
+            try:
+                self.journal_bytes += bytes_append_file(
+                    ("\n".join(lines) + "\n").encode("utf-8"), self.blogs_journal_file
+                )
+            except Exception as e:
+                print(f"Error Writing to File, {e}")
+                # kept ahead of the lines added since, to be written by the next flush
+                self.pending_lines[:0] = lines
+                if Configuration.write_behind:
+                    write_behind_flusher.mark_dirty(self.blogs_file, self.flush)
+                return
+            if self.journal_started is None:
+                self.journal_started = time.time()
+
+        if self._compaction_due():
+            self.compact(background=True)
+
+    def _compaction_due(self) -> bool:
+        """
+        The journal is due once it is bigger than blogs.json (and the minimum size),
+        which keeps the cost of bulk creation linear, or once it gets too old
+        """
+        if self.journal_started is None:
+            return False
+        try:
+            snapshot_bytes = os.path.getsize(self.blogs_file)
+        except OSError:
+            snapshot_bytes = 0
+        if self.journal_bytes >= max(Configuration.blogs_journal_max_bytes, snapshot_bytes):
+            return True
+        return time.time() - self.journal_started >= Configuration.blogs_journal_max_age
+
+    def compact(self, background: bool = False):
+        """
+        Folds the journal into blogs.json.
+        Args: background (bool): write blogs.json on a separate thread
+        """
+        if self.compaction_thread and self.compaction_thread.is_alive():
+            if background:
+                # a compaction is already running, it will catch up next time
+                return
+            self.compaction_thread.join()
+
+        if background:
+            self.compaction_thread = threading.Thread(target=self._fold_journal)
+            self.compaction_thread.start()
+        else:
+            self._fold_journal()
+
+    def wait_for_compaction(self):
+        """
+        Blocks until a running background compaction has finished
+        """
+        if self.compaction_thread:
+            self.compaction_thread.join()
+
+    def _fold_journal(self):
+        """
+        Writes a blogs.json snapshot and the indexes taken with it, then drops
+        the journal lines it covers while keeping the lines appended since.
+        The lines still pending are left to be appended after those, where
+        replaying them over the snapshot changes nothing.
+        """
+        with self.compaction_lock:
+            with self.lock:
+                payload = [BlogEncoder().default(blog) for blog in self.blogs]
+                # the saved indexes must match the snapshot, so they are taken together
+                indexes = self._dump_indexes() if Configuration.persist_indexes else None
+                generation = self.generation
+                # the journal lines up to here are covered by the snapshot
+                journal_offset = self.journal_bytes
+
+            if not json_update_file(payload, self.blogs_file, Encoder=BlogEncoder):
+                # the journal still holds every line blogs.json lacks
+                return
+            if indexes is not None:
+                save_indexes(self.blogs_index_file, self.blogs_file, indexes)
+            with self.lock:
+                tail = b""
+                try:
+                    with open(self.blogs_journal_file, "rb") as file:
+                        file.seek(journal_offset)
+                        tail = file.read()
+                except FileNotFoundError:
+                    pass
+
+                if tail:
+                    bytes_update_file(tail, self.blogs_journal_file)
+                    self.journal_started = time.time()
+                else:
+                    remove_file(self.blogs_journal_file)
+                    self.journal_started = None
+                self.journal_bytes = len(tail)
+                self.snapshot_generation = generation
+
     def search_blog(self, key: int):
         """
-        Search for a blog by its unique ID.
+        Search for a blog by its unique ID, in constant time.
         Args: key (int): Unique ID of the blog to search for
         Returns: the Blog if found, or None if not found
         """
-
-        sorted_blogs: list[Blog] = sorted(self.blogs, key=lambda blog: blog.id)
-        return binary_search(sorted_blogs, key)
+        return self.blogs_by_id.get(key)
 
     def create_blog(self, blog):
         """
@@ -67,26 +483,148 @@ class BlogDAOJSON(BlogDAO):
         Args: the new blog to create
         Returns: The created Blog or None if creation failed
         """
-        self.blogs.append(blog)
-        if self.autosave:
-            json_update_file(
-                payload=self.blogs, dest_file=self.blogs_file, Encoder=BlogEncoder
-            )
+        with self.lock:
+            self._check_unique(blog)
+            self._add_blog(blog)
+            self._persist({"op": "create", "blog": blog})
 
         return blog
 
-    def retrieve_blogs(self, search_string: str) -> list[Blog]:
+    def retrieve_blogs(self, search_string: str, fuzzy: bool = False) -> list[Blog]:
         """
         Retrieve blogs whose name contains the given filter string.
 
-        Args: search_string (str): The fuzzy find filter string
-        Returns list of blogs or raises an error
+        Args: search_string (str): The filter string
+              fuzzy (bool): tolerate typos, matching the names similar enough
+              to the filter string instead of the ones containing it
+        Returns list of blogs in creation order, or by decreasing similarity when fuzzy
         """
+        # repeated searches are answered from the cache until the blogs change
+        key = ("blogs", None, fuzzy, normalize_text(search_string))
+        with self.lock:
+            blogs = query_cache.get(key, self.generation)
+            if blogs is None:
+                if fuzzy:
+                    blogs = tuple(self._retrieve_similar_blogs(search_string))
+                else:
+                    blogs = tuple(self._search_blogs(search_string))
+                query_cache.put(key, self.generation, blogs)
+        return list(blogs)
+
+    def _search_blogs(self, search_string: str) -> list[Blog]:
+        candidates = None
+        if Configuration.trigram_index:
+            candidates = self._get_name_index().candidates(search_string)
+
+        if candidates is None:
+            # too short for the trigram index, every blog has to be checked
+            blogs = self.blogs
+        else:
+            blogs = [
+                self.blogs_by_id[key]
+                for key in sorted(candidates, key=self.blog_positions.__getitem__)
+            ]
+
+        search_string = normalize_text(search_string)
         filtered_blogs: list[Blog] = [
-            blog for blog in self.blogs if search_string.lower() in blog.name.lower()
+            blog for blog in blogs if search_string in blog.folded_name
         ]
         return filtered_blogs
 
+    def _retrieve_similar_blogs(self, search_string: str) -> list[Blog]:
+        threshold = Configuration.fuzzy_threshold
+        with self.lock:
+            if Configuration.trigram_index:
+                scores = self._get_fuzzy_index().similar(search_string, threshold)
+            else:
+                scores = {}
+                for blog in self.blogs:
+                    score = similarity(search_string, blog.name)
+                    if score and score >= threshold:
+                        scores[blog.id] = score
+            keys = sorted(scores, key=lambda key: (-scores[key], self.blog_positions[key]))
+            return [self.blogs_by_id[key] for key in keys]
+
+    def complete_blog_names(self, prefix: str, k: int) -> list[str]:
+        """
+        Completes the start of a blog name.
+
+        Args: prefix (str): the start of the name, in any case
+              k (int): the most names to return
+        Returns the distinct names starting with the prefix, in alphabetical order
+        """
+        names: list[str] = []
+        if not prefix or k <= 0:
+            return names
+
+        with self.lock:
+            if Configuration.prefix_index:
+                blogs = (self.blogs_by_id[key] for key in self._get_prefix_index().complete(prefix))
+            else:
+                prefix = normalize_text(prefix)
+                blogs = sorted(
+                    (blog for blog in self.blogs if blog.folded_name.startswith(prefix)),
+                    key=lambda blog: (blog.folded_name, blog.id),
+                )
+            for blog in blogs:
+                if blog.name not in names:
+                    names.append(blog.name)
+                    if len(names) == k:
+                        break
+        return names
+
+    def find_blog_by_url(self, url: str):
+        """
+        Find the blog at the given URL, through the URL index.
+        URLs are compared without their scheme, "www." and trailing "/", in any case.
+
+        Args: url (str): the URL of the blog
+        Returns: the first created Blog with that URL, or None if not found
+        """
+        with self.lock:
+            return self._first_created(self._get_url_index().lookup(url))
+
+    def find_blog_by_email(self, email: str):
+        """
+        Find the blog with the given email, through the email index.
+        Emails are compared in any case.
+
+        Args: email (str): the email of the blog
+        Returns: the first created Blog with that email, or None if not found
+        """
+        with self.lock:
+            return self._first_created(self._get_email_index().lookup(email))
+
+    def query_blogs(self, query: str) -> list[Blog]:
+        """
+        Retrieve the blogs matching a query, e.g. name:travel OR url:example.com,
+        through the indexes the planner finds cheapest.
+
+        Args: query (str): the query, see blogging.query.parser.parse
+        Returns list of blogs in creation order,
+        raises InvalidQueryException if the query is invalid
+        """
+        node = parse(query, BLOG_FIELDS)
+        key = ("blogs query", None, query)
+        with self.lock:
+            blogs = query_cache.get(key, self.generation)
+            if blogs is None:
+                keys = QueryPlan(node, BlogSource(self)).execute()
+                blogs = tuple(self.blogs_by_id[key] for key in keys)
+                query_cache.put(key, self.generation, blogs)
+        return list(blogs)
+
+    def explain_blogs(self, query: str) -> str:
+        """
+        Run a query past the cache, timing every stage of its plan.
+
+        Args: query (str): the query, see blogging.query.parser.parse
+        Returns the chosen plan as text, with the estimated and actual rows of every stage
+        """
+        node = parse(query, BLOG_FIELDS)
+        with self.lock:
+            return QueryPlan(node, BlogSource(self)).explain()
+
     def update_blog(self, key, blog) -> bool:
         """
         Update the blog with the given ID using the provided parameters.
@@ -108,9 +646,10 @@ class BlogDAOJSON(BlogDAO):
                 IllegalOperationException, "cannot update one blog with conflicting ID"
             )
 
-        blog_to_update.set_values(id=blog.id, name=blog.name, url=blog.url, email=blog.email)  # type: ignore
-        if self.autosave:
-            json_update_file(self.blogs, self.blogs_file, Encoder=BlogEncoder)
+        with self.lock:
+            self._check_unique(blog, key)
+            self._set_blog_values(blog_to_update, blog)  # type: ignore
+            self._persist({"op": "update", "key": key, "blog": blog_to_update})
         return True
 
     def delete_blog(self, key: int) -> bool:
@@ -127,9 +666,9 @@ class BlogDAOJSON(BlogDAO):
                 IllegalOperationException, "cannot delete a blog that doesnt exist"
             )
 
-        self.blogs = [blog for blog in self.blogs if blog.id != key]
-        if self.autosave:
-            json_update_file(self.blogs, self.blogs_file, Encoder=BlogEncoder)
+        with self.lock:
+            self._remove_blog(key)
+            self._persist({"op": "delete", "key": key})
         return True
 
     def list_blogs(self) -> list[Blog]:
@@ -140,6 +679,314 @@ class BlogDAOJSON(BlogDAO):
         """
         return self.blogs
 
+    def iter_blogs(self, search_string: str = None, newest_first: bool = False):  # type: ignore
+        """
+        Stream the blogs in the system, checking each one as it is read.
+        Args: search_string (str): the filter string retrieve_blogs takes, None for every blog
+              newest_first (bool): from the last created blog instead of the first created
+        Returns: a generator of the blogs
+        """
+        if search_string is not None:
+            search_string = normalize_text(search_string)
+        # deleting a blog builds a new list, so this one is never shrunk under the iteration
+        blogs = reversed(self.blogs) if newest_first else iter(self.blogs)
+        for blog in blogs:
+            if search_string is None or search_string in blog.folded_name:
+                yield blog
+
+    def page_blogs(self, limit: int, cursor=None):
+        """
+        List one page of blogs, in increasing ID order,
+        without copying the whole list.
+        Args: limit (int): the number of blogs in a page
+              cursor (str): the cursor returned with the previous page, None for the first page
+        Returns: a tuple of the list of blogs in the page and the cursor
+        of the next page, None if this is the last page
+        """
+        if limit < 1:
+            raise_exception(IllegalOperationException, "page size must be positive")
+
+        after = None if cursor is None else decode_cursor("blog", cursor)
+        with self.lock:
+            keys = self._get_id_index().ascending(after)
+            page = [self.blogs_by_id[key] for key in islice(keys, limit + 1)]
+
+        if len(page) <= limit:
+            return page, None
+        return page[:limit], encode_cursor("blog", page[limit - 1].id)
+
+
+class BlogDAOSQLite(BlogDAO):
+    def __init__(self):
+        self.connection = get_connection()
+
+    def _to_blog(self, row) -> Blog:
+        blog = Blog(id=row[0], name=row[1], url=row[2], email=row[3])
+        blog.counter = row[4]
+        return blog
+
+    def search_blog(self, key: int):
+        """
+        Search for a blog by its unique ID, using the primary key index.
+        Args: key (int): Unique ID of the blog to search for
+        Returns: the Blog if found, or None if not found
+        """
+        row = self.connection.execute(
+            "SELECT id, name, url, email, counter FROM blogs WHERE id = ?", (key,)
+        ).fetchone()
+        return self._to_blog(row) if row else None
+
+    def create_blog(self, blog):
+        """
+        Create a New Blog with the given parameters.
+
+        Args: the new blog to create
+        Returns: The created Blog
+        """
+        self._check_unique(blog)
+        with self.connection:
+            self.connection.execute(
+                "INSERT INTO blogs (id, name, url, email, norm_url, norm_email, counter, seq) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, (SELECT COALESCE(MAX(seq), 0) + 1 FROM blogs))",
+                (
+                    blog.id,
+                    blog.name,
+                    blog.url,
+                    blog.email,
+                    normalize_url(blog.url),
+                    normalize_email(blog.email),
+                    blog.counter,
+                ),
+            )
+        return blog
+
+    def retrieve_blogs(self, search_string: str, fuzzy: bool = False) -> list[Blog]:
+        """
+        Retrieve blogs whose name contains the given filter string.
+
+        Args: search_string (str): The filter string
+              fuzzy (bool): tolerate typos, matching the names similar enough
+              to the filter string instead of the ones containing it
+        Returns list of blogs in creation order, or by decreasing similarity when fuzzy
+        """
+        if fuzzy:
+            # scored in Python, SQLite has no similarity function
+            threshold = Configuration.fuzzy_threshold
+            scored = []
+            for blog in self.list_blogs():
+                score = similarity(search_string, blog.name)
+                if score and score >= threshold:
+                    scored.append((-score, len(scored), blog))
+            return [blog for _, _, blog in sorted(scored)]
+
+        return list(self.iter_blogs(search_string))
+
+    def complete_blog_names(self, prefix: str, k: int) -> list[str]:
+        """
+        Completes the start of a blog name.
+
+        Args: prefix (str): the start of the name, in any case
+              k (int): the most names to return
+        Returns the distinct names starting with the prefix, in alphabetical order
+        """
+        if not prefix or k <= 0:
+            return []
+
+        rows = self.connection.execute(
+            "SELECT name FROM blogs WHERE substr(fold(name), 1, length(fold(?))) = fold(?) "
+            "GROUP BY name ORDER BY fold(name), MIN(id) LIMIT ?",
+            (prefix, prefix, k),
+        )
+        return [row[0] for row in rows]
+
+    def find_blog_by_url(self, url: str):
+        """
+        Find the blog at the given URL, through the index on the normalized URLs.
+
+        Args: url (str): the URL of the blog
+        Returns: the first created Blog with that URL, or None if not found
+        """
+        row = self.connection.execute(
+            "SELECT id, name, url, email, counter FROM blogs "
+            "WHERE norm_url = ? ORDER BY seq LIMIT 1",
+            (normalize_url(url),),
+        ).fetchone()
+        return self._to_blog(row) if row else None
+
+    def find_blog_by_email(self, email: str):
+        """
+        Find the blog with the given email, through the index on the normalized emails.
+
+        Args: email (str): the email of the blog
+        Returns: the first created Blog with that email, or None if not found
+        """
+        row = self.connection.execute(
+            "SELECT id, name, url, email, counter FROM blogs "
+            "WHERE norm_email = ? ORDER BY seq LIMIT 1",
+            (normalize_email(email),),
+        ).fetchone()
+        return self._to_blog(row) if row else None
+
+    def _check_unique(self, blog: Blog, key=None) -> None:
+        """
+        Raises IllegalOperationException if another blog than the one with
+        the given key already has the URL or email of the blog, when the
+        Configuration asks for them to be unique
+        """
+        if Configuration.unique_blog_urls:
+            row = self.connection.execute(
+                "SELECT 1 FROM blogs WHERE norm_url = ? AND id IS NOT ? LIMIT 1",
+                (normalize_url(blog.url), key),
+            ).fetchone()
+            if row:
+                raise_exception(IllegalOperationException, "a blog with this URL already exists")
+        if Configuration.unique_blog_emails:
+            row = self.connection.execute(
+                "SELECT 1 FROM blogs WHERE norm_email = ? AND id IS NOT ? LIMIT 1",
+                (normalize_email(blog.email), key),
+            ).fetchone()
+            if row:
+                raise_exception(IllegalOperationException, "a blog with this email already exists")
+
+    def _query_sql(self, query: str):
+        node = parse(query, BLOG_FIELDS)
+        condition, parameters = to_sql(node, BLOG_COLUMNS)
+        sql = f"SELECT id, name, url, email, counter FROM blogs WHERE {condition} ORDER BY seq"
+        return node, sql, parameters
+
+    def query_blogs(self, query: str) -> list[Blog]:
+        """
+        Retrieve the blogs matching a query, compiled to SQL.
+
+        Args: query (str): the query, see blogging.query.parser.parse
+        Returns list of blogs in creation order
+        """
+        _, sql, parameters = self._query_sql(query)
+        return [self._to_blog(row) for row in self.connection.execute(sql, parameters)]
+
+    def explain_blogs(self, query: str) -> str:
+        """
+        Run a query, timing the planning and the execution.
+
+        Args: query (str): the query, see blogging.query.parser.parse
+        Returns the SQL and the plan SQLite chose as text
+        """
+        return explain_sql(self.connection, *self._query_sql(query))
+
+    def update_blog(self, key, blog) -> bool:
+        """
+        Update the blog with the given ID, moving its posts along
+        when the ID changes.
+
+        Args: key: unique ID, and blog: new Blog
+        Returns: True if update was successful, raises an error otherwise
+        """
+        if not self.search_blog(key):
+            raise_exception(
+                IllegalOperationException, "cannot update blog that doesnt exist"
+            )
+
+        if blog.id != key and self.search_blog(blog.id):
+            raise_exception(
+                IllegalOperationException, "cannot update one blog with conflicting ID"
+            )
+
+        self._check_unique(blog, key)
+        with self.connection:
+            self.connection.execute(
+                "UPDATE blogs SET id = ?, name = ?, url = ?, email = ?, norm_url = ?, "
+                "norm_email = ? WHERE id = ?",
+                (
+                    blog.id,
+                    blog.name,
+                    blog.url,
+                    blog.email,
+                    normalize_url(blog.url),
+                    normalize_email(blog.email),
+                    key,
+                ),
+            )
+            if blog.id != key:
+                self.connection.execute(
+                    "UPDATE posts SET blog_id = ? WHERE blog_id = ?", (blog.id, key)
+                )
+        return True
+
+    def delete_blog(self, key: int) -> bool:
+        """
+        Delete the blog by ID, along with its posts
+
+        Args: key (int): Unique ID for the blog to be deleted
+        Returns: True if deletion was successful, raises an error otherwise
+        """
+        if not self.search_blog(key):
+            raise_exception(
+                IllegalOperationException, "cannot delete a blog that doesnt exist"
+            )
+
+        with self.connection:
+            self.connection.execute("DELETE FROM posts WHERE blog_id = ?", (key,))
+            self.connection.execute("DELETE FROM blogs WHERE id = ?", (key,))
+        return True
+
+    def list_blogs(self) -> list[Blog]:
+        """
+        List all blogs in the system.
+        Args: None
+        Returns: a list of all the blogs in creation order.
+        """
+        return list(self.iter_blogs())
+
+    def iter_blogs(self, search_string: str = None, newest_first: bool = False):  # type: ignore
+        """
+        Stream the blogs in the system, reading them from the database as they are consumed.
+        Args: search_string (str): the filter string retrieve_blogs takes, None for every blog
+              newest_first (bool): from the last created blog instead of the first created
+        Returns: a generator of the blogs
+        """
+        sql = "SELECT id, name, url, email, counter FROM blogs"
+        parameters: list = []
+        if search_string is not None:
+            sql += " WHERE instr(fold(name), fold(?)) > 0"
+            parameters.append(search_string)
+        rows = self.connection.execute(
+            sql + (" ORDER BY seq DESC" if newest_first else " ORDER BY seq"), parameters
+        )
+        return (self._to_blog(row) for row in rows)
+
+    def page_blogs(self, limit: int, cursor=None):
+        """
+        List one page of blogs, in increasing ID order,
+        seeking the primary key to the cursor.
+        Args: limit (int): the number of blogs in a page
+              cursor (str): the cursor returned with the previous page, None for the first page
+        Returns: a tuple of the list of blogs in the page and the cursor
+        of the next page, None if this is the last page
+        """
+        if limit < 1:
+            raise_exception(IllegalOperationException, "page size must be positive")
+
+        sql = "SELECT id, name, url, email, counter FROM blogs"
+        parameters: list = []
+        if cursor is not None:
+            sql += " WHERE id > ?"
+            parameters.append(decode_cursor("blog", cursor))
+        rows = self.connection.execute(sql + " ORDER BY id LIMIT ?", parameters + [limit + 1])
+        page = [self._to_blog(row) for row in rows]
+
+        if len(page) <= limit:
+            return page, None
+        return page[:limit], encode_cursor("blog", page[limit - 1].id)
+
+
+def create_blog_dao() -> BlogDAO:
+    """
+    Creates the blog DAO for the storage backend picked in the Configuration
+    """
+    if Configuration.storage_backend == "sqlite":
+        return BlogDAOSQLite()
+    return BlogDAOJSON()
+
 
 if __name__ == "__main__":
     blogj = BlogDAOJSON()
@@ -16,6 +16,7 @@ class BlogEncoder(JSONEncoder):
                 "name": obj.name,
                 "email": obj.email,
                 "url": obj.url,
+                "counter": obj.counter,
             }
         return super().default(obj)
 
@@ -30,6 +31,9 @@ class BlogDecoder(JSONDecoder):
 
     def object_hook(self, dct):
         if "__type__" in dct and dct["__type__"] == "Blog":
-            return Blog(
+            blog = Blog(
                 id=dct["id"], name=dct["name"], email=dct["email"], url=dct["url"]
             )
+            blog.counter = dct.get("counter", 0)
+            return blog
+        return dct
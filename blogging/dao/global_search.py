@@ -0,0 +1,143 @@
+import atexit
+from collections import deque
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+from blogging.blog import Blog
+from blogging.configuration import Configuration
+from blogging.dao.post_dao import PostDAOPickle, PostDAOSQLite
+from blogging.post import Post
+
+# worker processes shared by every global search, started on first use
+executor: Optional[ProcessPoolExecutor] = None
+
+
+def _settings() -> dict:
+    """
+    The Configuration values a worker needs to find the records,
+    since workers do not see changes made to the Configuration after they start
+    """
+    settings = {
+        name: value
+        for name, value in vars(Configuration).items()
+        if not name.startswith("__")
+    }
+    # a single search over freshly loaded posts is cheaper as a scan
+    settings["full_text_index"] = False
+    settings["trigram_index"] = False
+    settings["phrase_index"] = False
+    return settings
+
+
+def search_shard(settings: dict, blog_ids: list, text: str, limit) -> list:
+    """
+    Searches the posts of a shard of blogs, straight from the records.
+    Runs in a worker process.
+    Args: settings (dict): the Configuration values of the caller
+            blog_ids (list): the IDs of the blogs in the shard
+            text (str): the text to find in the title or text of the posts
+            limit (int): stop once this many posts are found, None for no limit
+    Returns a list of (blog id, post) pairs, in blog and code order
+    """
+    for name, value in settings.items():
+        setattr(Configuration, name, value)
+
+    results: list[tuple[int, Post]] = []
+    for blog_id in blog_ids:
+        blog = Blog(blog_id, "", "", "")
+        if Configuration.storage_backend == "sqlite":
+            post_dao = PostDAOSQLite(blog)
+        else:
+            post_dao = PostDAOPickle(blog, read_only=True)
+        for post in post_dao.retrieve_posts(text):
+            results.append((blog_id, post))
+            if limit is not None and len(results) >= limit:
+                return results
+    return results
+
+
+def _worker_count() -> int:
+    return Configuration.search_processes or os.cpu_count() or 1
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global executor
+    if executor is None:
+        executor = ProcessPoolExecutor(max_workers=_worker_count())
+    return executor
+
+
+def shutdown_executor() -> None:
+    """
+    Stops the worker processes, if started, once their searches finish.
+    Runs at interpreter exit; the next global search starts new workers.
+    """
+    global executor
+    if executor is not None:
+        executor.shutdown(wait=True)
+        executor = None
+
+
+def _forget_executor() -> None:
+    # a forked child inherits the pool object, but neither its workers nor
+    # the thread feeding them, so it starts a pool of its own when it needs one
+    global executor
+    executor = None
+
+
+atexit.register(shutdown_executor)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_forget_executor)
+
+
+def search_all_posts(blogs: list[Blog], text: str, limit=None) -> list:
+    """
+    Searches the posts of every blog, fanning out shards of blogs
+    to worker processes and merging their results.
+    The records must be saved, so when autosave is off, or when there are
+    too few blogs to make the worker round trip worth it, the loaded
+    blogs are searched in this process instead.
+    Args: blogs (list): the blogs to search, in the order of the results
+            text (str): the text to find in the title or text of the posts
+            limit (int): the most posts to return, None for no limit
+    Returns a list of (blog id, post) pairs, in blog and code order
+    """
+    shard_size = max(1, Configuration.search_shard_size)
+    saved = Configuration.autosave or Configuration.storage_backend == "sqlite"
+    if not saved or len(blogs) <= shard_size:
+        results: list[tuple[int, Post]] = []
+        for blog in blogs:
+            # a one off search of every blog would only push the useful entries out of the cache
+            for post in blog.postPickle.retrieve_posts(text, cached=False):
+                if limit is not None and len(results) >= limit:
+                    return results
+                results.append((blog.id, post))
+        return results
+
+    settings = _settings()
+    blog_ids = [blog.id for blog in blogs]
+    shards = (
+        blog_ids[start : start + shard_size] for start in range(0, len(blog_ids), shard_size)
+    )
+    futures: deque = deque()
+    results = []
+
+    def submit() -> None:
+        shard = next(shards, None)
+        if shard is not None:
+            # the shards ahead of it leave at most this many posts to find
+            remaining = None if limit is None else limit - len(results)
+            futures.append(_get_executor().submit(search_shard, settings, shard, text, remaining))
+
+    # one shard per worker in flight, the next one submitted as each is merged,
+    # so that no shard is started once the limit is reached
+    for _ in range(_worker_count()):
+        submit()
+    while futures:
+        results.extend(futures.popleft().result())
+        if limit is not None and len(results) >= limit:
+            for future in futures:
+                future.cancel()
+            return results[:limit]
+        submit()
+    return results
@@ -1,9 +1,65 @@
 from abc import ABC, abstractmethod
+import copy
+from itertools import islice, takewhile
 import pickle
+import threading
 from blogging.configuration import Configuration
 from blogging.post import Post
+from blogging.dao.sqlite_database import get_connection, text_to_time, time_to_text
+from blogging.dao.query_cache import next_generation, query_cache
+from blogging.dao.write_behind import write_behind_flusher
+from blogging.helper import decode_cursor, encode_cursor, normalize_text, raise_exception
+from blogging.exception.illegal_operation_exception import IllegalOperationException
+from blogging.index.index_file import load_indexes, save_indexes
+from blogging.index.inverted_index import InvertedIndex, contains_words
+from blogging.index.positional_index import PositionalIndex
+from blogging.index.regex_buffer import RegexBuffer, buffer_safe, compile_pattern
+from blogging.index.sorted_index import SortedIndex
+from blogging.index.text_buffer import TextBuffer
+from blogging.index.trigram_index import TrigramIndex
+from blogging.query.parser import POST_FIELDS, parse
+from blogging.query.planner import CHECK_COST, QueryPlan
+from blogging.query.sources import PostSource, substring_access
+from blogging.query.sql import POST_COLUMNS, explain_sql, to_sql
 
-from blogging.helper import binary_search, pickle_update_file
+from blogging.helper import (
+    bytes_append_file,
+    bytes_update_file,
+    pickle_read_records,
+    pickle_update_file,
+    remove_file,
+)
+
+# the post timestamps that can be queried by range
+TIME_FIELDS = ("creation_time", "update_time")
+# number of posts iter_posts reads at a time while holding the lock
+ITERATION_BATCH = 256
+
+
+def regex_matches(compiled, posts):
+    """
+    Streams the posts whose title or text matches a compiled pattern
+    Args: compiled (re.Pattern): the pattern
+            posts: the posts to check, None entries are skipped
+    """
+    for post in posts:
+        if post is not None and (compiled.search(post.title) or compiled.search(post.text)):
+            yield post
+
+
+def post_matcher(search_string, whole_words: bool = False):
+    """
+    The check retrieve_posts makes on every post it scans
+    Args: search_string (str): the text to find, None to match every post
+            whole_words (bool): match the words of search_string as whole words
+    Returns a function telling whether a post matches
+    """
+    if search_string is None:
+        return lambda post: True
+    if whole_words:
+        return lambda post: contains_words(search_string, (post.title, post.text))
+    search_string = normalize_text(search_string)
+    return lambda post: search_string in post.folded_title or search_string in post.folded_text
 
 
 class PostDAO(ABC):
@@ -16,7 +72,27 @@ class PostDAO(ABC):
         pass
 
     @abstractmethod
-    def retrieve_posts(self, search_string):
+    def retrieve_posts(self, search_string, whole_words=False, cached=True):
+        pass
+
+    @abstractmethod
+    def retrieve_posts_regex(self, pattern, flags=0):
+        pass
+
+    @abstractmethod
+    def rank_posts(self, search_string, k):
+        pass
+
+    @abstractmethod
+    def posts_between(self, start, end, field="update_time"):
+        pass
+
+    @abstractmethod
+    def query_posts(self, query):
+        pass
+
+    @abstractmethod
+    def explain_posts(self, query):
         pass
 
     @abstractmethod
@@ -31,101 +107,854 @@ class PostDAO(ABC):
     def list_posts(self):
         pass
 
+    @abstractmethod
+    def iter_posts(self, search_string=None, whole_words=False, newest_first=False):
+        pass
+
+    @abstractmethod
+    def page_posts(self, limit, cursor=None):
+        pass
+
 
 class PostDAOPickle(PostDAO):
 
-    def __init__(self, blog):
+    def __init__(self, blog, read_only: bool = False):
 
         # Persistence variables and config
         self.autosave = Configuration.autosave
+        # a read only DAO loads the records but never writes them back
+        self.read_only = read_only
+        self.journaling = Configuration.journaling
         self.blog = blog
         self.blog_records_file = (
             Configuration.records_path
             + f"/{self.blog.id}"
             + Configuration.records_extension
         )
-        # the posts array
-        self.posts: list[Post] = []
+        self.blog_journal_file = (
+            Configuration.records_path
+            + f"/{self.blog.id}"
+            + Configuration.journal_extension
+        )
+        # the indexes built over the records file, see _save_indexes
+        self.blog_index_file = (
+            Configuration.records_path
+            + f"/{self.blog.id}"
+            + Configuration.index_extension
+        )
+        # number of journal records not yet folded into the records file
+        self.journal_length = 0
+        # pickled journal records waiting to be written
+        self.pending_records: list[bytes] = []
+        # keeps the posts consistent while the write-behind thread saves them
+        self.lock = threading.RLock()
+        # the posts indexed by code; codes are never reused,
+        # so insertion order is also creation order
+        self.posts_by_code: dict[int, Post] = {}
+        # word and substring indexes over the titles and texts,
+        # each built on the first search that needs it
+        self.word_index: InvertedIndex | None = None
+        self.substring_index: TrigramIndex | None = None
+        # word positions in the titles and texts for phrase searches, built on first use
+        self.phrase_index: PositionalIndex | None = None
+        # the normalized titles and texts packed into one buffer for
+        # Configuration.text_buffer searches, built on first use
+        self.text_buffer: TextBuffer | None = None
+        # the titles and texts joined for regular expression searches,
+        # with the generation of the posts it was built from
+        self.regex_buffer: tuple | None = None
+        # timestamp field -> sorted index of the posts by that timestamp,
+        # each built on the first range query over its field
+        self.time_indexes: dict[str, SortedIndex] = {}
+        # sorted post codes, to resume paging after any code, built on first use
+        self.code_index: SortedIndex | None = None
+        # changes on every create, update and delete, invalidating the cached searches
+        self.generation = next_generation()
+        # the generation whose posts are exactly those of the records file,
+        # None while the journal or unsaved mutations hold more
+        self.snapshot_generation: int | None = None
         if self.autosave:
 
             try:
-                # if there are posts set the counter to the maximum value
                 with open(self.blog_records_file, "rb") as file:
-                    self.posts = pickle.load(file)
-                    if self.posts:
-                        self.blog.counter = self.posts[-1].code
+                    snapshot = pickle.load(file)
+                # records files written before the counter was saved hold a bare list
+                if isinstance(snapshot, list):
+                    snapshot = {"counter": 0, "posts": snapshot}
+                self.posts = snapshot["posts"]
+                self.blog.counter = max(self.blog.counter, snapshot["counter"])
             except Exception as e:
             
                 # create the new file with an empty array initalized
-                pickle_update_file(self.posts, self.blog_records_file)
+                if not self.read_only:
+                    pickle_update_file(self._snapshot(), self.blog_records_file)
+            else:
+                self._load_indexes()
+
+            # replay the mutations saved since the last snapshot,
+            # updating the indexes loaded along with it
+            journal = pickle_read_records(self.blog_journal_file, repair=not self.read_only)
+            for operation, payload in journal:
+                self._replay(operation, payload)
+            self.journal_length = len(journal)
+            if not journal:
+                self.snapshot_generation = self.generation
+
+            # the counter from the blog metadata may lag behind the records
+            if self.posts_by_code:
+                self.blog.counter = max(self.blog.counter, max(self.posts_by_code))
+
+    @property
+    def posts(self) -> list[Post]:
+        """
+        The posts of the blog, from the first created to the last created
+        """
+        return list(self.posts_by_code.values())
+
+    @posts.setter
+    def posts(self, posts: list[Post]) -> None:
+        self.posts_by_code = {post.code: post for post in posts}
+        self.word_index = None
+        self.substring_index = None
+        self.phrase_index = None
+        self.text_buffer = None
+        self.time_indexes = {}
+        self.code_index = None
+        self.generation = next_generation()
+
+    def _get_word_index(self) -> InvertedIndex:
+        if self.word_index is None:
+            self.word_index = InvertedIndex()
+            for post in self.posts_by_code.values():
+                self.word_index.add(post.code, (post.title, post.text))
+            self._save_indexes()
+        return self.word_index
+
+    def _get_substring_index(self) -> TrigramIndex:
+        if self.substring_index is None:
+            self.substring_index = TrigramIndex()
+            for post in self.posts_by_code.values():
+                self.substring_index.add(post.code, (post.title, post.text))
+            self._save_indexes()
+        return self.substring_index
+
+    def _get_phrase_index(self) -> PositionalIndex:
+        if self.phrase_index is None:
+            self.phrase_index = PositionalIndex()
+            for post in self.posts_by_code.values():
+                self.phrase_index.add(post.code, (post.title, post.text))
+            self._save_indexes()
+        return self.phrase_index
+
+    def _get_text_buffer(self) -> TextBuffer:
+        if self.text_buffer is None:
+            self.text_buffer = TextBuffer(
+                (post.code, (post.title, post.text)) for post in self.posts_by_code.values()
+            )
+            self._save_indexes()
+        return self.text_buffer
+
+    def _get_time_index(self, field: str) -> SortedIndex:
+        if field not in self.time_indexes:
+            self.time_indexes[field] = SortedIndex(
+                (post.code, (getattr(post, field),)) for post in self.posts_by_code.values()
+            )
+            self._save_indexes()
+        return self.time_indexes[field]
+
+    def _get_code_index(self) -> SortedIndex:
+        if self.code_index is None:
+            self.code_index = SortedIndex((code, (code,)) for code in self.posts_by_code)
+            self._save_indexes()
+        return self.code_index
+
+    def _built_indexes(self) -> list:
+        """
+        The built indexes, each with the function giving the fields it indexes
+        """
+        text_fields = lambda post: (post.title, post.text)
+        indexes = [
+            (index, text_fields)
+            for index in (
+                self.word_index, self.substring_index, self.phrase_index, self.text_buffer
+            )
+            if index is not None
+        ]
+        for field, index in self.time_indexes.items():
+            indexes.append((index, lambda post, field=field: (getattr(post, field),)))
+        if self.code_index is not None:
+            indexes.append((self.code_index, lambda post: (post.code,)))
+        return indexes
+
+    def _dump_indexes(self):
+        """
+        Returns the built indexes pickled, or None if none is built
+        """
+        if not self._built_indexes():
+            return None
+        indexes = {
+            "word_index": self.word_index,
+            "substring_index": self.substring_index,
+            "phrase_index": self.phrase_index,
+            "text_buffer": self.text_buffer,
+            "time_indexes": self.time_indexes,
+            "code_index": self.code_index,
+        }
+        return pickle.dumps(indexes, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def _load_indexes(self) -> None:
+        """
+        Loads the indexes saved along with the records file, unless it changed since
+        """
+        if not Configuration.persist_indexes:
+            return
+        indexes = load_indexes(self.blog_index_file, self.blog_records_file)
+        if indexes:
+            self.word_index = indexes["word_index"]
+            self.substring_index = indexes["substring_index"]
+            # index files saved before phrase indexes existed lack one
+            self.phrase_index = indexes.get("phrase_index")
+            self.text_buffer = indexes["text_buffer"]
+            self.time_indexes = indexes["time_indexes"]
+            self.code_index = indexes["code_index"]
+
+    def _save_indexes(self) -> None:
+        """
+        Saves the built indexes once a new one is built. The saved indexes
+        must match the records file, so while the journal or unsaved
+        mutations hold more posts, they are left to the next compaction,
+        which saves them along with the new records file.
+        """
+        if not Configuration.persist_indexes or not self.autosave or self.read_only:
+            return
+        with self.lock:
+            if self.generation != self.snapshot_generation:
+                return
+            indexes = self._dump_indexes()
+        if indexes is not None:
+            save_indexes(self.blog_index_file, self.blog_records_file, indexes)
+
+    def _index_add(self, post: Post) -> None:
+        for index, fields in self._built_indexes():
+            index.add(post.code, fields(post))
+
+    def _index_update(self, post: Post, old_post: Post) -> None:
+        for index, fields in self._built_indexes():
+            index.update(post.code, fields(old_post), fields(post))
+
+    def _index_remove(self, post: Post) -> None:
+        for index, fields in self._built_indexes():
+            index.remove(post.code, fields(post))
+
+    def _snapshot(self) -> dict:
+        """
+        The content of the records file: the posts and the post code sequence
+        """
+        return {"counter": self.blog.counter, "posts": self.posts}
+
+    def _replay(self, operation: str, payload):
+        """
+        Applies one journal record to the posts array.
+        Replaying is idempotent, so a journal that was already
+        folded into the snapshot can safely be replayed again.
+        Args: operation (str) -> "create", "update" or "delete"
+              payload -> the post for create/update, the code for delete
+        """
+        if operation == "delete":
+            post = self.posts_by_code.pop(payload, None)
+            if post:
+                self._index_remove(post)
+            return
+
+        post = self.search_post(payload.code)
+        if post:
+            old_post = copy.copy(post)
+            post.title = payload.title
+            post.text = payload.text
+            post.creation_time = payload.creation_time
+            post.update_time = payload.update_time
+            self._index_update(post, old_post)
+        elif operation == "create":
+            self.posts_by_code[payload.code] = payload
+            self.blog.counter = max(self.blog.counter, payload.code)
+            self._index_add(payload)
+
+    def _persist(self, operation: str, payload):
+        """
+        Saves one mutation, right away or later on the write-behind thread
+        Args: operation (str) -> "create", "update" or "delete"
+              payload -> the post for create/update, the code for delete
+        """
+        if not self.autosave or self.read_only:
+            # only save if autosave is true
+            return
+
+        if self.journaling:
+            # pickled now so later changes to the post don't leak into the record
+            self.pending_records.append(pickle.dumps((operation, payload)))
+
+        if Configuration.write_behind:
+            write_behind_flusher.mark_dirty(self.blog_records_file, self.flush)
+        else:
+            self.flush()
+
+    def flush(self):
+        """
+        Writes the pending mutations, either as records appended to the journal
+        or by rewriting the whole records file when journaling is off
+        """
+        if not self.journaling:
+            with self.lock:
+                snapshot = pickle.dumps(self._snapshot())
+                generation = self.generation
+            try:
+                bytes_update_file(snapshot, self.blog_records_file)
+            except Exception as e:
+                print(f"Error Writing to File, {e}")
+                return
+            self.snapshot_generation = generation
+            return
+
+        with self.lock:
+            records, self.pending_records = self.pending_records, []
+        if not records:
+            return
+        try:
+            bytes_append_file(b"".join(records), self.blog_journal_file)
+        except Exception as e:
+            print(f"Error Writing to File, {e}")
+            with self.lock:
+                # kept ahead of the records added since, to be written by the next flush
+                self.pending_records[:0] = records
+            if Configuration.write_behind:
+                write_behind_flusher.mark_dirty(self.blog_records_file, self.flush)
+            return
+        self.journal_length += len(records)
+        if self.journal_length >= Configuration.journal_compaction_threshold:
+            self.compact()
+
+    def compact(self):
+        """
+        Folds the journal into a new snapshot of the records file
+        and starts over with an empty journal
+        """
+        with self.lock:
+            snapshot = pickle.dumps(self._snapshot())
+            # the saved indexes must match the snapshot, so they are taken together
+            indexes = self._dump_indexes() if Configuration.persist_indexes else None
+            generation = self.generation
+            # pending records are part of the snapshot
+            self.pending_records = []
+        try:
+            bytes_update_file(snapshot, self.blog_records_file)
+        except Exception as e:
+            print(f"Error Writing to File, {e}")
+            return
+        remove_file(self.blog_journal_file)
+        self.journal_length = 0
+        self.snapshot_generation = generation
+        if indexes is not None:
+            save_indexes(self.blog_index_file, self.blog_records_file, indexes)
 
     def search_post(self, key: int):
         """
         DAO implementaion of search_post
-        searches to find the post given current blog
+        searches to find the post given current blog, in constant time
         Args: key (int) -> the unique key to search for
         Return: The post or none if it can't be found
         """
-        return binary_search(self.posts, key)
+        return self.posts_by_code.get(key)
 
     def create_post(self, post: Post):
         """
-        DAO implementaion of create_post
+        DAO implementaion of create_post.
+        Codes come from the blog counter and are never reused
         Args: post (Post) -> the new post to be created
         Returns the created post
         """
-        self.blog.counter += 1
-        post.code = self.blog.counter
-        self.posts.append(post)
-        if self.autosave:
-            # only save if autosave is true
-            pickle_update_file(self.posts, self.blog_records_file)
+        with self.lock:
+            self.blog.counter += 1
+            post.code = self.blog.counter
+            self.posts_by_code[post.code] = post
+            self._index_add(post)
+            self.generation = next_generation()
+            self._persist("create", post)
         return post
 
-    def retrieve_posts(self, search_string: str):
+    def retrieve_posts(self, search_string: str, whole_words: bool = False, cached: bool = True):
         """
         Retrieves all the post given a text search string
 
         Args: search_string (str), the text to find
+              whole_words (bool), match the words of search_string as whole words,
+              in any order, instead of as a substring
+              cached (bool), answer from and save to the query cache
         Returns a list of all posts that contain that text in the post
         """
-        filtered_list: list[Post] = [
-            post
-            for post in self.posts
-            # fileter by search_string
-            if search_string.lower() in post.title.lower() or search_string.lower() in post.text.lower()
-        ]
+        if not cached:
+            with self.lock:
+                return self._search_posts(search_string, whole_words)
+
+        # repeated searches are answered from the cache until the posts change
+        key = ("posts", self.blog.id, whole_words, normalize_text(search_string))
+        with self.lock:
+            posts = query_cache.get(key, self.generation)
+            if posts is None:
+                posts = tuple(self._search_posts(search_string, whole_words))
+                query_cache.put(key, self.generation, posts)
+        return list(posts)
+
+    def _search_posts(self, search_string: str, whole_words: bool) -> list[Post]:
+        if whole_words:
+            if Configuration.full_text_index:
+                codes = self._get_word_index().search(search_string)
+                return [self.posts_by_code[code] for code in sorted(codes)]
+            matches = post_matcher(search_string, whole_words)
+            return [post for post in self.posts_by_code.values() if matches(post)]
+
+        candidates = None
+        access = substring_access(self, search_string)
+        scan_cost = len(self.posts_by_code) * CHECK_COST
+        if access is not None and access.cost + access.estimate * CHECK_COST < scan_cost:
+            candidates = access.fetch()
+        elif Configuration.text_buffer:
+            # the buffer stands in for the scan, when no index narrows the search down
+            codes = self._get_text_buffer().search(search_string)
+            if codes is not None:
+                return [self.posts_by_code[code] for code in sorted(codes)]
+
+        if candidates is None:
+            # every post has to be checked, when the phrase and trigram indexes cost
+            # more than a scan and the text buffer is off or finds most posts
+            posts = self.posts_by_code.values()
+        else:
+            posts = [self.posts_by_code[code] for code in sorted(candidates)]
+
+        matches = post_matcher(search_string)
+        filtered_list: list[Post] = [post for post in posts if matches(post)]
 
         return filtered_list
 
+    def retrieve_posts_regex(self, pattern: str, flags: int = 0):
+        """
+        Streams the posts whose title or text matches a regular expression
+
+        Args: pattern (str), the regular expression
+              flags (int), the re flags, e.g. re.IGNORECASE
+        Returns a generator of the matching posts, from the first created to the last created
+        """
+        compiled = compile_pattern(pattern, flags)
+        with self.lock:
+            if not (Configuration.regex_buffer and buffer_safe(pattern)):
+                return regex_matches(compiled, list(self.posts_by_code.values()))
+
+            # one search over all the posts finds the next candidate,
+            # which is then confirmed on its own title and text
+            if self.regex_buffer is None or self.regex_buffer[0] != self.generation:
+                self.regex_buffer = (
+                    self.generation,
+                    RegexBuffer(
+                        (post.code, (post.title, post.text))
+                        for post in self.posts_by_code.values()
+                    ),
+                )
+            candidates = self.regex_buffer[1].candidates(compiled)
+        return regex_matches(compiled, (self.posts_by_code.get(code) for code in candidates))
+
+    def rank_posts(self, search_string: str, k: int):
+        """
+        Retrieves the k posts most relevant to a text search string
+
+        Args: search_string (str), the words to find
+              k (int), the number of posts to return
+        Returns a list of the best matching posts, most relevant first
+        """
+        if Configuration.full_text_index:
+            index = self._get_word_index()
+        else:
+            index = InvertedIndex()
+            for post in self.posts_by_code.values():
+                index.add(post.code, (post.title, post.text))
+        codes = index.top_k(search_string, k, (Configuration.rank_title_weight, 1.0))
+        return [self.posts_by_code[code] for code in codes]
+
+    def posts_between(self, start, end, field: str = "update_time"):
+        """
+        Retrieves the posts with a timestamp in a time range
+
+        Args: start (tuple), the earliest timestamp, None for no lower bound
+              end (tuple), the timestamp past the latest, None for no upper bound
+              field (str), "creation_time" or "update_time"
+        Returns a list of the posts in range, from the oldest timestamp to the newest
+        """
+        if field not in TIME_FIELDS:
+            raise ValueError(f"cannot query posts by {field}")
+
+        with self.lock:
+            codes = self._get_time_index(field).between(start, end)
+            return [self.posts_by_code[code] for code in codes]
+
+    def query_posts(self, query: str):
+        """
+        Retrieves the posts matching a query, e.g. title:trip AND NOT "long journey"
+        or updated:>=2026-01-31, through the indexes the planner finds cheapest
+
+        Args: query (str), the query, see blogging.query.parser.parse
+        Returns a list of the matching posts, from the first created to the last created,
+        raises InvalidQueryException if the query is invalid
+        """
+        node = parse(query, POST_FIELDS)
+        key = ("posts query", self.blog.id, query)
+        with self.lock:
+            posts = query_cache.get(key, self.generation)
+            if posts is None:
+                codes = QueryPlan(node, PostSource(self)).execute()
+                posts = tuple(self.posts_by_code[code] for code in codes)
+                query_cache.put(key, self.generation, posts)
+        return list(posts)
+
+    def explain_posts(self, query: str) -> str:
+        """
+        Runs a query past the cache, timing every stage of its plan
+
+        Args: query (str), the query, see blogging.query.parser.parse
+        Returns the chosen plan as text, with the estimated and actual rows of every stage
+        """
+        node = parse(query, POST_FIELDS)
+        with self.lock:
+            return QueryPlan(node, PostSource(self)).explain()
+
     def update_post(self, key: int, new_title: str, new_text: str):
 
         post = self.search_post(key)
         if post:
-            post.set_values(new_title, new_text)
-            if self.autosave:
-                # only save if autosave is true
-                pickle_update_file(self.posts, self.blog_records_file)
+            with self.lock:
+                old_post = copy.copy(post)
+                post.set_values(new_title, new_text)
+                self._index_update(post, old_post)
+                self.generation = next_generation()
+                self._persist("update", post)
             return post
         return None
 
     def delete_post(self, key: int):
-        post_to_delete = self.search_post(key)
+        with self.lock:
+            post = self.posts_by_code.pop(key, None)
+            if post is None:
+                print("post with given code does not exist")
+                return False
+
+            self._index_remove(post)
+            self.generation = next_generation()
+            self._persist("delete", key)
+        return True
 
-        if not post_to_delete:
-            print("post with given code does not exist")
-            return False
+    def list_posts(self):  # type: ignore
 
-        self.blog.counter -= 1
+        post_in_reverse: list[Post] = list(reversed(self.posts_by_code.values()))
+        return post_in_reverse
 
-        self.posts = [post for post in self.posts if post.code != key]
+    def iter_posts(self, search_string: str = None, whole_words: bool = False,  # type: ignore
+                   newest_first: bool = False):
+        """
+        Streams the posts of the blog, checking each one as it is read
+        rather than collecting the matches first
 
-        if self.autosave:
-            # only save if autosave is true
-            pickle_update_file(self.posts, self.blog_records_file)
+        Args: search_string (str), the text to find as retrieve_posts does, None for every post
+              whole_words (bool), match the words of search_string as whole words
+              newest_first (bool), from the last created post instead of the first created
+        Returns a generator of the posts
+        """
+        matches = post_matcher(search_string, whole_words)
+        # the posts are kept in code order, so their codes are walked as they are
+        # rather than through the code index, which a listing would build and save
+        with self.lock:
+            codes = list(self.posts_by_code)
+        if newest_first:
+            codes.reverse()
+        start = 0
+        while True:
+            # a batch at a time, skipping the posts deleted between batches
+            with self.lock:
+                if start == len(codes) and not newest_first:
+                    # the posts created since come after the last code read
+                    last = codes[-1] if codes else 0
+                    created = takewhile(lambda code: code > last, reversed(self.posts_by_code))
+                    codes.extend(reversed(list(created)))
+                chunk = codes[start:start + ITERATION_BATCH]
+                batch = [self.posts_by_code[code] for code in chunk if code in self.posts_by_code]
+            if not chunk:
+                return
+            for post in batch:
+                if matches(post):
+                    yield post
+            start += len(chunk)
+
+    def page_posts(self, limit: int, cursor=None):
+        """
+        Lists one page of posts, from the last created to the first created,
+        without copying the whole blog
+
+        Args: limit (int), the number of posts in a page
+              cursor (str), the cursor returned with the previous page, None for the first page
+        Returns a tuple of the list of posts in the page and the cursor
+        of the next page, None if this is the last page
+        """
+        if limit < 1:
+            raise_exception(IllegalOperationException, "page size must be positive")
+
+        with self.lock:
+            if cursor is None:
+                # the dict is in code order, so the first page is read off its end
+                codes = reversed(self.posts_by_code)
+            else:
+                codes = self._get_code_index().descending(decode_cursor("post", cursor))
+            page = [self.posts_by_code[code] for code in islice(codes, limit + 1)]
+
+        if len(page) <= limit:
+            return page, None
+        return page[:limit], encode_cursor("post", page[limit - 1].code)
+
+
+class PostDAOSQLite(PostDAO):
+
+    SELECT = "SELECT code, title, text, creation_time, update_time FROM posts "
+
+    def __init__(self, blog):
+        self.connection = get_connection()
+        self.blog = blog
+
+    @property
+    def posts(self) -> list[Post]:
+        """
+        The posts of the blog, from the first created to the last created
+        """
+        rows = self.connection.execute(
+            self.SELECT + "WHERE blog_id = ? ORDER BY code", (self.blog.id,)
+        )
+        return [self._to_post(row) for row in rows]
+
+    def _to_post(self, row) -> Post:
+        post = Post(row[0], row[1], row[2])
+        post.creation_time = text_to_time(row[3])
+        post.update_time = text_to_time(row[4])
+        return post
+
+    def search_post(self, key: int):
+        """
+        DAO implementaion of search_post, using the (blog id, code) primary key
+        Args: key (int) -> the unique key to search for
+        Return: The post or none if it can't be found
+        """
+        row = self.connection.execute(
+            self.SELECT + "WHERE blog_id = ? AND code = ?", (self.blog.id, key)
+        ).fetchone()
+        return self._to_post(row) if row else None
+
+    def create_post(self, post: Post):
+        """
+        DAO implementaion of create_post.
+        The code is taken from the blog counter in the same transaction
+        Args: post (Post) -> the new post to be created
+        Returns the created post
+        """
+        with self.connection:
+            self.connection.execute(
+                "UPDATE blogs SET counter = counter + 1 WHERE id = ?", (self.blog.id,)
+            )
+            row = self.connection.execute(
+                "SELECT counter FROM blogs WHERE id = ?", (self.blog.id,)
+            ).fetchone()
+            self.blog.counter = row[0] if row else self.blog.counter + 1
+            post.code = self.blog.counter
+            self.connection.execute(
+                "INSERT INTO posts (blog_id, code, title, text, creation_time, update_time) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    self.blog.id,
+                    post.code,
+                    post.title,
+                    post.text,
+                    time_to_text(post.creation_time),
+                    time_to_text(post.update_time),
+                ),
+            )
+        return post
+
+    def retrieve_posts(self, search_string: str, whole_words: bool = False, cached: bool = True):
+        """
+        Retrieves all the post given a text search string
+
+        Args: search_string (str), the text to find
+              whole_words (bool), match the words of search_string as whole words,
+              in any order, instead of as a substring
+              cached (bool), unused, the database answers every search
+        Returns a list of all posts that contain that text in the post
+        """
+        return list(self.iter_posts(search_string, whole_words))
+
+    def retrieve_posts_regex(self, pattern: str, flags: int = 0):
+        """
+        Streams the posts whose title or text matches a regular expression,
+        reading the posts from the database as they are consumed
+
+        Args: pattern (str), the regular expression
+              flags (int), the re flags, e.g. re.IGNORECASE
+        Returns a generator of the matching posts, from the first created to the last created
+        """
+        compiled = compile_pattern(pattern, flags)
+        rows = self.connection.execute(
+            self.SELECT + "WHERE blog_id = ? ORDER BY code", (self.blog.id,)
+        )
+        return regex_matches(compiled, (self._to_post(row) for row in rows))
+
+    def rank_posts(self, search_string: str, k: int):
+        """
+        Retrieves the k posts most relevant to a text search string,
+        scored over a word index of the blog's posts
+
+        Args: search_string (str), the words to find
+              k (int), the number of posts to return
+        Returns a list of the best matching posts, most relevant first
+        """
+        posts = {post.code: post for post in self.posts}
+        index = InvertedIndex()
+        for post in posts.values():
+            index.add(post.code, (post.title, post.text))
+        codes = index.top_k(search_string, k, (Configuration.rank_title_weight, 1.0))
+        return [posts[code] for code in codes]
+
+    def posts_between(self, start, end, field: str = "update_time"):
+        """
+        Retrieves the posts with a timestamp in a time range,
+        using the (blog id, timestamp) indexes
+
+        Args: start (tuple), the earliest timestamp, None for no lower bound
+              end (tuple), the timestamp past the latest, None for no upper bound
+              field (str), "creation_time" or "update_time"
+        Returns a list of the posts in range, from the oldest timestamp to the newest
+        """
+        if field not in TIME_FIELDS:
+            raise ValueError(f"cannot query posts by {field}")
+
+        sql = self.SELECT + "WHERE blog_id = ?"
+        parameters: list = [self.blog.id]
+        if start is not None:
+            sql += f" AND {field} >= ?"
+            parameters.append(time_to_text(start))
+        if end is not None:
+            sql += f" AND {field} < ?"
+            parameters.append(time_to_text(end))
+        rows = self.connection.execute(sql + f" ORDER BY {field}, code", parameters)
+        return [self._to_post(row) for row in rows]
+
+    def _query_sql(self, query: str):
+        node = parse(query, POST_FIELDS)
+        condition, parameters = to_sql(node, POST_COLUMNS)
+        sql = self.SELECT + f"WHERE blog_id = ? AND ({condition}) ORDER BY code"
+        return node, sql, [self.blog.id] + parameters
+
+    def query_posts(self, query: str):
+        """
+        Retrieves the posts matching a query, compiled to SQL
+
+        Args: query (str), the query, see blogging.query.parser.parse
+        Returns a list of the matching posts, from the first created to the last created
+        """
+        _, sql, parameters = self._query_sql(query)
+        return [self._to_post(row) for row in self.connection.execute(sql, parameters)]
+
+    def explain_posts(self, query: str) -> str:
+        """
+        Runs a query, timing the planning and the execution
+
+        Args: query (str), the query, see blogging.query.parser.parse
+        Returns the SQL and the plan SQLite chose as text
+        """
+        return explain_sql(self.connection, *self._query_sql(query))
+
+    def update_post(self, key: int, new_title: str, new_text: str):
+        post = self.search_post(key)
+        if post:
+            post.set_values(new_title, new_text)
+            with self.connection:
+                self.connection.execute(
+                    "UPDATE posts SET title = ?, text = ?, update_time = ? "
+                    "WHERE blog_id = ? AND code = ?",
+                    (post.title, post.text, time_to_text(post.update_time), self.blog.id, key),
+                )
+            return post
+        return None
+
+    def delete_post(self, key: int):
+        with self.connection:
+            deleted = self.connection.execute(
+                "DELETE FROM posts WHERE blog_id = ? AND code = ?", (self.blog.id, key)
+            ).rowcount
+            if not deleted:
+                print("post with given code does not exist")
+                return False
         return True
 
     def list_posts(self):  # type: ignore
+        rows = self.connection.execute(
+            self.SELECT + "WHERE blog_id = ? ORDER BY code DESC", (self.blog.id,)
+        )
+        return [self._to_post(row) for row in rows]
 
-        post_in_reverse: list[Post] = self.posts[::-1]
-        return post_in_reverse
+    def iter_posts(self, search_string: str = None, whole_words: bool = False,  # type: ignore
+                   newest_first: bool = False):
+        """
+        Streams the posts of the blog, reading them from the database as they are consumed
+
+        Args: search_string (str), the text to find as retrieve_posts does, None for every post
+              whole_words (bool), match the words of search_string as whole words
+              newest_first (bool), from the last created post instead of the first created
+        Returns a generator of the posts
+        """
+        sql = self.SELECT + "WHERE blog_id = ?"
+        parameters: list = [self.blog.id]
+        if search_string is not None and not whole_words:
+            sql += " AND (instr(fold(title), fold(?)) > 0 OR instr(fold(text), fold(?)) > 0)"
+            parameters += [search_string, search_string]
+        rows = self.connection.execute(
+            sql + (" ORDER BY code DESC" if newest_first else " ORDER BY code"), parameters
+        )
+        matches = post_matcher(search_string if whole_words else None, whole_words)
+        return (post for post in map(self._to_post, rows) if matches(post))
+
+    def page_posts(self, limit: int, cursor=None):
+        """
+        Lists one page of posts, from the last created to the first created,
+        seeking the primary key to the cursor
+
+        Args: limit (int), the number of posts in a page
+              cursor (str), the cursor returned with the previous page, None for the first page
+        Returns a tuple of the list of posts in the page and the cursor
+        of the next page, None if this is the last page
+        """
+        if limit < 1:
+            raise_exception(IllegalOperationException, "page size must be positive")
+
+        sql = self.SELECT + "WHERE blog_id = ?"
+        parameters: list = [self.blog.id]
+        if cursor is not None:
+            sql += " AND code < ?"
+            parameters.append(decode_cursor("post", cursor))
+        rows = self.connection.execute(
+            sql + " ORDER BY code DESC LIMIT ?", parameters + [limit + 1]
+        )
+        page = [self._to_post(row) for row in rows]
+
+        if len(page) <= limit:
+            return page, None
+        return page[:limit], encode_cursor("post", page[limit - 1].code)
+
+
+def create_post_dao(blog) -> PostDAO:
+    """
+    Creates the post DAO of a blog for the storage backend picked in the Configuration
+    """
+    if Configuration.storage_backend == "sqlite":
+        return PostDAOSQLite(blog)
+    return PostDAOPickle(blog)
@@ -0,0 +1,84 @@
+from collections import OrderedDict
+from itertools import count
+import threading
+from blogging.configuration import Configuration
+
+# generations are unique across every DAO of the process, so an entry cached
+# for one DAO can never be mistaken for the results of another one
+_generations = count(1)
+
+
+def next_generation() -> int:
+    """
+    Returns a new generation for a DAO whose data changed
+    """
+    return next(_generations)
+
+
+class QueryCache:
+    """
+    Bounded LRU cache of search results. Every entry remembers the
+    generation of the DAO it was computed from; DAOs move to a new
+    generation on every mutation, so entries computed before a mutation
+    are never returned again and age out of the cache.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        # key -> (generation, results), from the least to the most recently used
+        self.entries: OrderedDict = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, generation: int):
+        """
+        Looks up the cached results of a query
+        Args: key: the scope, the blog ID and the normalized query
+                generation (int): the current generation of the DAO
+        Returns the results, or None if they are not cached or out of date
+        """
+        if Configuration.query_cache_size <= 0:
+            return None
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None or entry[0] != generation:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key, generation: int, results: tuple) -> None:
+        """
+        Caches the results of a query, evicting the least recently used
+        entries beyond Configuration.query_cache_size
+        """
+        if Configuration.query_cache_size <= 0:
+            return
+        with self.lock:
+            self.entries[key] = (generation, results)
+            self.entries.move_to_end(key)
+            while len(self.entries) > Configuration.query_cache_size:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self.lock:
+            self.entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> dict:
+        """
+        Returns the hit, miss and eviction counts and the number of cached queries
+        """
+        with self.lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self.entries),
+            }
+
+
+query_cache = QueryCache()
@@ -0,0 +1,104 @@
+import os
+import sqlite3
+from blogging.configuration import Configuration
+from blogging.helper import normalize_email, normalize_text, normalize_url
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS blogs (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    url TEXT NOT NULL,
+    email TEXT NOT NULL,
+    norm_url TEXT NOT NULL,
+    norm_email TEXT NOT NULL,
+    counter INTEGER NOT NULL DEFAULT 0,
+    seq INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS blogs_seq ON blogs (seq);
+CREATE INDEX IF NOT EXISTS blogs_norm_url ON blogs (norm_url);
+CREATE INDEX IF NOT EXISTS blogs_norm_email ON blogs (norm_email);
+CREATE TABLE IF NOT EXISTS posts (
+    blog_id INTEGER NOT NULL,
+    code INTEGER NOT NULL,
+    title TEXT NOT NULL,
+    text TEXT NOT NULL,
+    creation_time TEXT NOT NULL,
+    update_time TEXT NOT NULL,
+    PRIMARY KEY (blog_id, code)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS posts_creation_time ON posts (blog_id, creation_time);
+CREATE INDEX IF NOT EXISTS posts_update_time ON posts (blog_id, update_time);
+"""
+
+# one connection per process and database file
+_connections: dict = {}
+
+
+def get_connection(database_file: str = "") -> sqlite3.Connection:
+    """
+    Returns the connection to the database, opening it on first use
+    in WAL mode (so readers in other processes are never blocked)
+    and creating the schema if needed
+    Args: database_file (str): the database, defaults to Configuration.database_file
+    """
+    database_file = database_file or Configuration.database_file
+    key = (os.getpid(), database_file)
+    connection = _connections.get(key)
+    if connection is None:
+        connection = sqlite3.connect(database_file)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        # same case folding as the in-memory DAOs, sqlite's lower() is ascii only;
+        # only used by queries, no index or stored value depends on it
+        connection.create_function("fold", 1, normalize_text, deterministic=True)
+        _add_normalized_columns(connection)
+        connection.executescript(SCHEMA)
+        _connections[key] = connection
+    return connection
+
+
+def _add_normalized_columns(connection: sqlite3.Connection) -> None:
+    """
+    Upgrades a database whose blog URLs and emails were indexed through
+    the norm_url() and norm_email() functions of this process, which no
+    other sqlite client has, to the normalized norm_url and norm_email columns
+    """
+    columns = {row[1] for row in connection.execute("PRAGMA table_info(blogs)")}
+    if not columns or "norm_url" in columns:
+        return
+    with connection:
+        connection.execute("DROP INDEX IF EXISTS blogs_url")
+        connection.execute("DROP INDEX IF EXISTS blogs_email")
+        connection.execute("ALTER TABLE blogs ADD COLUMN norm_url TEXT NOT NULL DEFAULT ''")
+        connection.execute("ALTER TABLE blogs ADD COLUMN norm_email TEXT NOT NULL DEFAULT ''")
+        rows = connection.execute("SELECT id, url, email FROM blogs").fetchall()
+        connection.executemany(
+            "UPDATE blogs SET norm_url = ?, norm_email = ? WHERE id = ?",
+            [(normalize_url(url), normalize_email(email), id) for id, url, email in rows],
+        )
+
+
+def close_connections():
+    """
+    Closes every connection opened by this process
+    """
+    for key in [key for key in _connections if key[0] == os.getpid()]:
+        _connections.pop(key).close()
+
+
+def time_to_text(time_tuple: tuple) -> str:
+    """
+    Converts a post timestamp tuple (year, month, day, hour, minute)
+    to text that sorts in chronological order
+    """
+    return "%04d-%02d-%02d %02d:%02d" % tuple(time_tuple)
+
+
+def text_to_time(text: str) -> tuple:
+    """
+    Converts text written by time_to_text back to a timestamp tuple
+    """
+    date, clock = text.split(" ")
+    year, month, day = date.split("-")
+    hour, minute = clock.split(":")
+    return (int(year), int(month), int(day), int(hour), int(minute))
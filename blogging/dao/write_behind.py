@@ -0,0 +1,108 @@
+import atexit
+import signal
+import threading
+from blogging.configuration import Configuration
+
+
+class WriteBehindFlusher:
+    """
+    Collects the files made dirty by mutations and writes them on a background
+    thread, Configuration.write_behind_interval_ms after the first pending
+    mutation or as soon as Configuration.write_behind_max_ops are pending.
+    Several mutations of the same file are coalesced into a single flush.
+    """
+
+    def __init__(self):
+        self.condition = threading.Condition()
+        # serializes flushes between the background thread and drain(),
+        # reentrant for a signal handler interrupting a drain on the main thread
+        self.flush_lock = threading.RLock()
+        # file -> the callable that writes its pending mutations
+        self.dirty: dict = {}
+        self.pending_ops = 0
+        self.flushes = 0
+        self.thread: threading.Thread | None = None
+        self.hooks_installed = False
+
+    def mark_dirty(self, key, flush) -> None:
+        """
+        Schedules a flush
+        Args: key: the file that has pending mutations
+                flush: the callable that writes them
+        """
+        with self.condition:
+            self.dirty[key] = flush
+            self.pending_ops += 1
+            self._start()
+            self.condition.notify()
+
+    def drain(self) -> None:
+        """
+        Synchronously writes every pending mutation
+        """
+        with self.flush_lock:
+            with self.condition:
+                dirty, self.dirty = self.dirty, {}
+                self.pending_ops = 0
+            for flush in dirty.values():
+                try:
+                    flush()
+                except Exception as e:
+                    print(f"Error Writing to File, {e}")
+            self.flushes += len(dirty)
+
+    def _start(self) -> None:
+        if self.thread is None or not self.thread.is_alive():
+            self.thread = threading.Thread(
+                target=self._run, name="write-behind", daemon=True
+            )
+            self.thread.start()
+        if not self.hooks_installed:
+            self.hooks_installed = True
+            self._install_exit_hooks()
+
+    def _run(self) -> None:
+        while True:
+            with self.condition:
+                self.condition.wait_for(lambda: self.dirty)
+                # debounce: let more mutations pile up until the interval ends
+                self.condition.wait_for(
+                    lambda: self.pending_ops >= Configuration.write_behind_max_ops,
+                    timeout=Configuration.write_behind_interval_ms / 1000,
+                )
+            self.drain()
+
+    def _install_exit_hooks(self) -> None:
+        """
+        Drains the pending mutations at interpreter exit and on termination signals
+        """
+        atexit.register(self.drain)
+        if threading.current_thread() is not threading.main_thread():
+            # signal handlers can only be installed from the main thread
+            return
+
+        for name in ("SIGTERM", "SIGHUP"):
+            signum = getattr(signal, name, None)
+            if signum is None:
+                continue
+            previous = signal.getsignal(signum)
+            if previous == signal.SIG_IGN:
+                continue
+
+            def handler(signum, frame, previous=previous):
+                # the background thread may be flushing and waiting for a DAO lock
+                # this thread holds, then the exit unwinds it and atexit drains
+                if self.flush_lock.acquire(blocking=False):
+                    try:
+                        self.drain()
+                    finally:
+                        self.flush_lock.release()
+                if callable(previous):
+                    previous(signum, frame)
+                else:
+                    raise SystemExit(128 + signum)
+
+            signal.signal(signum, handler)
+
+
+write_behind_flusher = WriteBehindFlusher()
@@ -0,0 +1,2 @@
+class InvalidQueryException(Exception):
+	''' Invalid Query '''
\ No newline at end of file
@@ -27,6 +27,8 @@ class BloggingGUI(QMainWindow):
         # set autosave to True to ensure persistence is working
         self.configuration = Configuration()
         self.configuration.__class__.autosave = True
+        # a crash in the middle of a save must not lose the data files
+        self.configuration.__class__.durability = "atomic"
         # Continue here with your code!
 
        
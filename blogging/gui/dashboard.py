@@ -8,7 +8,7 @@ from blogging.gui.components.table_view import TableModel
 from blogging.controller import Controller
 
 
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QStringListModel
 from blogging.helper import convert_data
 from blogging.gui.components.utils import newQFrame, createShadow
 from blogging.gui.components.handle_error import ErrorGUI
@@ -32,6 +32,7 @@ from PyQt6.QtWidgets import (
     QSizePolicy,
     QDialog,
     QAbstractItemView,
+    QCompleter,
 )
 from PyQt6.QtGui import QPixmap, QColor, QCursor, QFont, QIntValidator
 
@@ -49,7 +50,10 @@ class Dashboard(QMainWindow):
         self.login_winodw = login_window
         self.blog_table_header = ["Id", "Name", "Email", "URL"]
         
-        self.table_list_data = self.controller.list_blogs()
+        # the blogs are shown a page at a time, the rest on request
+        self.table_list_data, blogs_cursor = self.controller.page_blogs(
+            Configuration.page_size
+        )
         self.blogs_table = QTableView()
         self.posts_page = PostsPage(controller=self.controller)
         self.blogs_page_main = BlogsPage(
@@ -57,6 +61,7 @@ class Dashboard(QMainWindow):
             controller=self.controller,
             table_header=self.blog_table_header,
             table_list_data=self.table_list_data,
+            blogs_cursor=blogs_cursor,
         )
 
         self.main_layout()
@@ -140,6 +145,18 @@ class Dashboard(QMainWindow):
         else:
             btn.setEnabled(True)
 
+    def handle_completion(self, input_text):
+        """
+        Suggests blog names matching the start of the search bar text
+        """
+        text = input_text.text()
+        if self.controller.get_current_blog() or not text or text.isdigit():
+            self.searchbar_completions.setStringList([])
+            return
+        self.searchbar_completions.setStringList(
+            self.controller.complete_blog_names(text, 10)
+        )
+
     def search_bar(self):
         searchbar = newQFrame(QHBoxLayout(), id="searchbar")
         sbl = searchbar.layout()  # type: ignore
@@ -150,6 +167,14 @@ class Dashboard(QMainWindow):
         self.searchbar_input.textChanged.connect(
             lambda: self.handle_search_button(self.searchbar_input, searchbar_submit)
         )
+        # type-ahead blog names, answered from the prefix index on every keystroke
+        self.searchbar_completions = QStringListModel()
+        completer = QCompleter(self.searchbar_completions, self)
+        completer.setCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
+        self.searchbar_input.setCompleter(completer)
+        self.searchbar_input.textEdited.connect(
+            lambda: self.handle_completion(self.searchbar_input)
+        )
         self.searchbar_input.setPlaceholderText("Blogs")
         searchbar_submit = CustomButton("Search")
         searchbar_submit.clicked.connect(
@@ -11,6 +11,7 @@ from PyQt6.QtWidgets import (
 from PyQt6.QtGui import QIntValidator
 
 from PyQt6.QtCore import Qt
+from blogging.configuration import Configuration
 from blogging.gui.components.table_view import TableModel
 from blogging.gui.components.custom_button import CustomButton
 from blogging.helper import convert_data
@@ -24,11 +25,14 @@ from blogging.gui.components.utils import int_input_validator
 class BlogsPage:
 
     def __init__(
-        self, blogs_table, table_list_data, table_header, controller: Controller
+        self, blogs_table, table_list_data, table_header, controller: Controller,
+        blogs_cursor=None,
     ):
         # Blogs Page
 
         self.table_list_data = table_list_data
+        # where the next page of blogs starts, None once every blog is shown
+        self.blogs_cursor = blogs_cursor
         self.controller = controller
         self.table_header = table_header
         self.blogs_table = blogs_table
@@ -86,15 +90,33 @@ class BlogsPage:
         delete_blog = CustomButton("Delete Blog")
         delete_blog.clicked.connect(self.handle_delete_blog)
 
+        self.more_blogs = CustomButton("More Blogs")
+        self.more_blogs.clicked.connect(self.handle_more_blogs)
+        self.more_blogs.setEnabled(self.blogs_cursor is not None)
+
         self.modifier_buttons = newQFrame(QHBoxLayout(), id="buttons")
         self.modifier_buttons_l = self.modifier_buttons.layout()
-        mb_list = [add_blog, update_blog, delete_blog]
+        mb_list = [add_blog, update_blog, delete_blog, self.more_blogs]
 
         [self.modifier_buttons_l.addWidget(widget) for widget in mb_list]
 
         blog_page_main_l.addWidget(self.modifier_buttons)
         self.bpl.addWidget(blogs_page_main, stretch=5)  # type: ignore
 
+    def handle_more_blogs(self):
+        """
+        Adds the next page of blogs to the table
+        """
+        if self.blogs_cursor is None:
+            return
+        blogs, self.blogs_cursor = self.controller.page_blogs(
+            Configuration.page_size, self.blogs_cursor
+        )
+        if blogs:
+            for row in convert_data(data=blogs):
+                self.blogs_table_model.add_row(row)
+        self.more_blogs.setEnabled(self.blogs_cursor is not None)
+
     def find_row_by_id(self, blog_id):
         """
         Ensures the correct row is removed when deleting.
@@ -11,6 +11,7 @@ from PyQt6.QtWidgets import (
 
 from PyQt6.QtCore import Qt
 
+from blogging.configuration import Configuration
 from blogging.gui.components.custom_button import CustomButton
 
 from blogging.gui.components.utils import newQFrame
@@ -22,6 +23,8 @@ from blogging.gui.components.handle_error import ErrorGUI
 class PostsPage:
     def __init__(self, controller: Controller):
         self.controller = controller
+        # where the next page of posts starts, None once every post is shown
+        self.posts_cursor = None
 
         self.plain_text_edit = QPlainTextEdit()
       
@@ -97,7 +100,23 @@ class PostsPage:
     def display_posts(self, posts=None):
         self.plain_text_edit.setPlainText("")
         if not posts:
-            posts = self.controller.list_posts()
+            posts, self.posts_cursor = self.controller.page_posts(Configuration.page_size)
+        else:
+            self.posts_cursor = None
+        self.append_posts(posts)
+
+    def display_more_posts(self):
+        """
+        Appends the next page of posts to the ones shown
+        """
+        if self.posts_cursor is None:
+            return
+        posts, self.posts_cursor = self.controller.page_posts(
+            Configuration.page_size, self.posts_cursor
+        )
+        self.append_posts(posts)
+
+    def append_posts(self, posts):
         try:
             for post in posts:
                 title_text = f"""
@@ -119,6 +138,7 @@ class PostsPage:
                 title="Uhm...",
                 error_msg="Something went wrong displaying posts"
             )
+        self.more_btn.setEnabled(self.posts_cursor is not None)
 
     def post_modal(self, innerText):
         self.dialog = QDialog()
@@ -277,6 +297,11 @@ class PostsPage:
                 buttons_list[i], fbf_grid[i][0], fbf_grid[i][1]
             )
 
+        self.more_btn = CustomButton(text="More Posts")
+        self.more_btn.setEnabled(False)
+        self.more_btn.clicked.connect(lambda: self.display_more_posts())
+        self.page_layout.addWidget(self.more_btn, 3, 0, 1, 3)
+
     def handle_add_post(self):
         """
         Add post GUI logic 
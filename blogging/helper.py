@@ -1,7 +1,13 @@
+import base64
+import binascii
 import hashlib
+import os
 import pickle
+import tempfile
 from typing import Type
 import json
+from blogging.configuration import Configuration
+from blogging.exception.illegal_operation_exception import IllegalOperationException
 
 
 def convert_data( data: list):
@@ -11,28 +17,226 @@ def convert_data( data: list):
         return [[]]
 
     new_list = []
-    if isinstance(data[0], Blog):
-        [new_list.append(blog.to_list()) for blog in data]
-    if isinstance(data[0], Post):
-        [new_list.append(post.to_list()) for post in data]
+    if isinstance(data[0], (Blog, Post)):
+        new_list = list(iter_rows(data))
 
     return new_list
 
 
+def iter_rows(records):
+    """
+    Streaming variant of convert_data, e.g. over Controller.iter_posts
+    Args: records: an iterable of blogs or posts
+    Returns a generator of the table row of each record
+    """
+    for record in records:
+        yield record.to_list()
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalizes text for case-insensitive search,
+    casefolding it so that e.g. "Straße" matches "STRASSE"
+    """
+    return text.casefold()
+
+
+def normalize_email(email: str) -> str:
+    """
+    Normalizes an email address for exact lookups, ignoring case and surrounding spaces
+    """
+    return email.strip().casefold()
+
+
+def normalize_url(url: str) -> str:
+    """
+    Normalizes a URL for exact lookups, so that e.g. "https://www.Blog.com/"
+    and "blog.com" are the same URL
+    """
+    url = url.strip().casefold()
+    for prefix in ("https://", "http://", "www."):
+        if url.startswith(prefix):
+            url = url[len(prefix) :]
+    return url.rstrip("/")
+
+
+# the durability modes of Configuration.durability and the writes,
+# renames and fsyncs each of them issued
+DURABILITY_MODES = ("none", "atomic", "fsync")
+sync_counters = {
+    mode: {"writes": 0, "renames": 0, "fsyncs": 0} for mode in DURABILITY_MODES
+}
+
+
+def get_sync_counters() -> dict:
+    """
+    Returns a copy of the writes, renames and fsyncs issued by each durability mode
+    """
+    return {mode: dict(counters) for mode, counters in sync_counters.items()}
+
+
+def _durability() -> str:
+    if Configuration.durability not in DURABILITY_MODES:
+        raise ValueError(f"unknown durability mode {Configuration.durability}")
+    return Configuration.durability
+
+
+def fsync_directory(path):
+    """
+    Flushes a directory entry (a new or renamed file) to disk.
+    Not every platform can open a directory, those are skipped
+    """
+    try:
+        fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+        sync_counters["fsync"]["fsyncs"] += 1
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def bytes_update_file(payload: bytes, dest_file):
+    """
+    Replaces the content of a file with the given bytes,
+    as safely as the Configuration.durability mode asks for:
+        none: truncates and rewrites the file in place
+        atomic: writes a temporary file and renames it over the file,
+                so a crash leaves either the old or the new content
+        fsync: like atomic, also syncing the file and its directory to disk
+    Args: payload (bytes): the new content of the file
+            dest_file: the destination file
+    """
+    mode = _durability()
+    sync_counters[mode]["writes"] += 1
+    if mode == "none":
+        with open(dest_file, "wb") as file:
+            file.write(payload)
+        return
+
+    fd, temp_file = tempfile.mkstemp(
+        dir=os.path.dirname(os.path.abspath(dest_file)),
+        prefix=os.path.basename(dest_file) + ".",
+        suffix=".tmp",
+    )
+    try:
+        with os.fdopen(fd, "wb") as file:
+            file.write(payload)
+            if mode == "fsync":
+                file.flush()
+                os.fsync(file.fileno())
+                sync_counters[mode]["fsyncs"] += 1
+        os.replace(temp_file, dest_file)
+        sync_counters[mode]["renames"] += 1
+    except BaseException:
+        if os.path.exists(temp_file):
+            os.remove(temp_file)
+        raise
+    if mode == "fsync":
+        fsync_directory(dest_file)
+
+
+def bytes_append_file(payload: bytes, dest_file) -> int:
+    """
+    Appends the given bytes to the end of a file.
+    Appends never overwrite data, so only the fsync mode
+    does more than a plain write: it syncs the file
+    (and its directory when the append created it)
+    Args: payload (bytes): the data to be appended
+            dest_file: the destination file
+    Returns the number of bytes appended
+    """
+    mode = _durability()
+    sync_counters[mode]["writes"] += 1
+    created = mode == "fsync" and not os.path.exists(dest_file)
+    with open(dest_file, "ab") as file:
+        file.write(payload)
+        if mode == "fsync":
+            file.flush()
+            os.fsync(file.fileno())
+            sync_counters[mode]["fsyncs"] += 1
+    if created:
+        fsync_directory(dest_file)
+    return len(payload)
+
+
+def truncate_file(dest_file, size: int):
+    """
+    Cuts a file down to its first bytes, e.g. to drop a torn append,
+    syncing it in the fsync durability mode
+    Args: dest_file: the file to cut
+            size (int): the number of bytes to keep
+    """
+    with open(dest_file, "r+b") as file:
+        file.truncate(size)
+        if _durability() == "fsync":
+            file.flush()
+            os.fsync(file.fileno())
+
+
+def remove_file(dest_file):
+    """
+    Removes a file if it exists, syncing the removal in the fsync durability mode
+    Args: dest_file: the file to remove
+    """
+    if not os.path.exists(dest_file):
+        return
+    os.remove(dest_file)
+    if _durability() == "fsync":
+        fsync_directory(dest_file)
+
+
 def json_update_file(payload, dest_file, Encoder):
     """
     Function to correctly update the json files given a payload
     Args: payload (str): the data to be loading into the .json file
             dest_file: the destination file
             Encoder: the encoder to save the data
+    Returns True if the file was written
     """
     try:
-        file = open(dest_file, "w")
         j_string = json.dumps(payload, indent=4, cls=Encoder)
-        file.write(j_string)
-        file.close()
+        bytes_update_file(j_string.encode("utf-8"), dest_file)
     except Exception as e:
         print(f"Error Writing to File, {e}")
+        return False
+    return True
+
+
+def json_read_lines(src_file, Decoder, repair: bool = False) -> list:
+    """
+    Reads every payload appended to a file as a line of json.
+    A torn line at the end of the file (an interrupted append) ends the read.
+    Args: src_file: the file to read from
+            Decoder: the decoder to load the data
+            repair (bool): cut the file before a torn line, so that the lines
+            appended next are not read after it and dropped along with it
+    Returns a list of the payloads in the order they were appended
+    """
+    payloads = []
+    good_bytes = 0
+    torn = False
+    try:
+        with open(src_file, "rb") as file:
+            for line in file:
+                try:
+                    # every append ends with a newline, a line without one was cut short
+                    if not line.endswith(b"\n"):
+                        raise ValueError("missing newline")
+                    payloads.append(json.loads(line.decode("utf-8"), cls=Decoder))
+                except ValueError:
+                    print(f"Ignoring torn line at the end of {src_file}")
+                    torn = True
+                    break
+                good_bytes += len(line)
+    except FileNotFoundError:
+        pass
+    if torn and repair:
+        truncate_file(src_file, good_bytes)
+    return payloads
 
 
 def pickle_update_file(payload, dest_file):
@@ -44,12 +248,75 @@ def pickle_update_file(payload, dest_file):
         dest_file: the destination file
     """
     try:
-        with open(dest_file, "wb") as file:
-            pickle.dump(payload, file)
+        bytes_update_file(pickle.dumps(payload), dest_file)
     except Exception as e:
         print(f"Error Writing to File, {e}")
 
 
+def pickle_read_records(src_file, repair: bool = False):
+    """
+    Reads every pickled record appended to a file.
+    A torn record at the end of the file (an interrupted append) ends the read.
+    Args:
+        src_file: the file to read from
+        repair (bool): cut the file before a torn record, so that the records
+        appended next are not read after it and dropped along with it
+    Returns a list of the records in the order they were appended
+    """
+    records = []
+    good_bytes = 0
+    torn = False
+    try:
+        with open(src_file, "rb") as file:
+            while True:
+                try:
+                    records.append(pickle.load(file))
+                except EOFError:
+                    # the end of the file, unless a record was cut off within its first bytes
+                    torn = os.fstat(file.fileno()).st_size != good_bytes
+                    if torn:
+                        print(f"Ignoring torn record at the end of {src_file}")
+                    break
+                except (pickle.UnpicklingError, AttributeError, ValueError):
+                    print(f"Ignoring torn record at the end of {src_file}")
+                    torn = True
+                    break
+                good_bytes = file.tell()
+    except FileNotFoundError:
+        pass
+    if torn and repair:
+        truncate_file(src_file, good_bytes)
+    return records
+
+
+def encode_cursor(kind: str, key) -> str:
+    """
+    Encodes the position of a page into an opaque cursor
+    Args: kind (str): what is being paged through, e.g. "post"
+            key: the key of the last item of the page
+    Returns the cursor as URL safe text
+    """
+    payload = json.dumps({"kind": kind, "after": key}).encode()
+    return base64.urlsafe_b64encode(payload).decode("ascii")
+
+
+def decode_cursor(kind: str, cursor: str):
+    """
+    Decodes a cursor made by encode_cursor
+    Args: kind (str): what is being paged through
+            cursor (str): the cursor of the next page
+    Returns the key of the last item of the previous page,
+    raises IllegalOperationException if the cursor is not a cursor of that kind
+    """
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        if payload["kind"] == kind:
+            return payload["after"]
+    except (binascii.Error, ValueError, TypeError, KeyError, AttributeError):
+        pass
+    raise_exception(IllegalOperationException, "invalid page cursor")
+
+
 def binary_search(arr, target):
     left, right = 0, len(arr) - 1
 
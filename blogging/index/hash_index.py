@@ -0,0 +1,54 @@
+class HashIndex:
+    """
+    Exact match index over documents made of one or more fields,
+    mapping every normalized field value to the keys of the documents
+    having it, for constant time lookups and uniqueness checks.
+    """
+
+    def __init__(self, normalize, documents=()):
+        # the function giving the value a field is indexed under
+        self.normalize = normalize
+        # normalized value -> keys of the documents having it
+        self.keys_by_value: dict = {}
+        for key, fields in documents:
+            self.add(key, fields)
+
+    def __len__(self) -> int:
+        return len(self.keys_by_value)
+
+    def add(self, key, fields: tuple) -> None:
+        """
+        Indexes a document
+        Args: key: the unique key of the document
+                fields (tuple): the value of each field
+        """
+        for field in fields:
+            self.keys_by_value.setdefault(self.normalize(field), set()).add(key)
+
+    def remove(self, key, fields: tuple) -> None:
+        """
+        Removes a document from the index
+        Args: key: the unique key of the document
+                fields (tuple): the indexed value of each field
+        """
+        for field in fields:
+            value = self.normalize(field)
+            keys = self.keys_by_value.get(value)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self.keys_by_value[value]
+
+    def update(self, key, old_fields: tuple, fields: tuple) -> None:
+        """
+        Re-indexes a document whose fields changed
+        """
+        self.remove(key, old_fields)
+        self.add(key, fields)
+
+    def lookup(self, field) -> set:
+        """
+        Finds the documents having a field equal to the given one once normalized
+        Returns the set of their keys
+        """
+        return self.keys_by_value.get(self.normalize(field), set())
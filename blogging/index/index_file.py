@@ -0,0 +1,77 @@
+import mmap
+import os
+import pickle
+import struct
+import zlib
+from blogging.helper import bytes_update_file
+
+# identifies an index file
+MAGIC = b"BIDX"
+# bumped whenever the pickled index classes change, so older files are rebuilt
+INDEX_VERSION = 1
+# magic, version, size, mtime and inode of the source file, checksum of the payload
+HEADER = struct.Struct("<4sIQqQI")
+
+
+def source_stamp(source_file):
+    """
+    Returns the size, modification time and inode of the source file,
+    which change whenever it is rewritten, or None if it does not exist
+    """
+    try:
+        stat = os.stat(source_file)
+    except OSError:
+        return None
+    return (stat.st_size, stat.st_mtime_ns, stat.st_ino)
+
+
+def save_indexes(index_file, source_file, payload: bytes) -> bool:
+    """
+    Saves pickled indexes, stamped with the current state of the file they were built from
+    Args: index_file: where to save them
+            source_file: the file holding the indexed data
+            payload (bytes): the pickled indexes
+    Returns True if they were saved
+    """
+    stamp = source_stamp(source_file)
+    if stamp is None:
+        return False
+    header = HEADER.pack(MAGIC, INDEX_VERSION, *stamp, zlib.crc32(payload))
+    try:
+        bytes_update_file(header + payload, index_file)
+    except Exception as e:
+        print(f"Error Writing to File, {e}")
+        return False
+    return True
+
+
+def load_indexes(index_file, source_file):
+    """
+    Loads indexes saved by save_indexes, mapping the index file in memory
+    so the payload is unpickled without being copied first
+    Returns the unpickled indexes, or None if the file is missing, corrupt,
+    of another version or stale, i.e. the source file changed since
+    """
+    stamp = source_stamp(source_file)
+    if stamp is None:
+        return None
+    try:
+        with open(index_file, "rb") as file:
+            mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        # missing or empty
+        return None
+
+    with mapping:
+        if len(mapping) < HEADER.size:
+            return None
+        magic, version, *saved_stamp, checksum = HEADER.unpack_from(mapping)
+        if magic != MAGIC or version != INDEX_VERSION or tuple(saved_stamp) != stamp:
+            return None
+        with memoryview(mapping)[HEADER.size :] as payload:
+            if zlib.crc32(payload) != checksum:
+                return None
+            try:
+                return pickle.loads(payload)
+            except (pickle.UnpicklingError, AttributeError, ImportError, EOFError):
+                return None
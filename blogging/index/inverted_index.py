@@ -0,0 +1,180 @@
+import heapq
+import math
+import re
+from blogging.helper import normalize_text
+
+TOKEN_PATTERN = re.compile(r"\w+")
+# BM25 term frequency saturation and length normalization
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+
+def tokenize(text: str) -> list[str]:
+    """
+    Splits text into its normalized words
+    Args: text (str): the text to split
+    Returns the list of words, in order
+    """
+    return TOKEN_PATTERN.findall(normalize_text(text))
+
+
+class InvertedIndex:
+    """
+    Word index over documents made of several fields (e.g. title and text).
+    Maps every token to the keys of the documents containing it, along with
+    how many times it appears in each field, and remembers the length of
+    every field so relevance can be scored.
+    """
+
+    def __init__(self, field_count: int = 2):
+        self.field_count = field_count
+        # token -> {key: [occurrences in each field]}
+        self.postings: dict[str, dict] = {}
+        # key -> [number of tokens in each field]
+        self.lengths: dict = {}
+        # sum of the field lengths over all documents
+        self.total_lengths: list[int] = [0] * field_count
+
+    def __len__(self) -> int:
+        return len(self.lengths)
+
+    def add(self, key, fields: tuple) -> None:
+        """
+        Indexes a document
+        Args: key: the unique key of the document
+                fields (tuple): the text of each field
+        """
+        if key in self.lengths:
+            self.remove(key)
+
+        lengths = []
+        for position, field in enumerate(fields):
+            tokens = tokenize(field)
+            lengths.append(len(tokens))
+            self.total_lengths[position] += len(tokens)
+            for token in tokens:
+                frequencies = self.postings.setdefault(token, {}).get(key)
+                if frequencies is None:
+                    frequencies = [0] * self.field_count
+                    self.postings[token][key] = frequencies
+                frequencies[position] += 1
+        self.lengths[key] = lengths
+
+    def remove(self, key, fields: tuple = ()) -> None:
+        """
+        Removes a document from the index
+        Args: key: the unique key of the document
+                fields (tuple): the indexed text of each field, if known,
+                which avoids looking at every posting list
+        """
+        lengths = self.lengths.pop(key, None)
+        if lengths is None:
+            return
+        for position, length in enumerate(lengths):
+            self.total_lengths[position] -= length
+
+        if fields:
+            tokens = {token for field in fields for token in tokenize(field)}
+        else:
+            tokens = [token for token, keys in self.postings.items() if key in keys]
+        for token in tokens:
+            keys = self.postings.get(token)
+            if keys is not None and keys.pop(key, None) is not None and not keys:
+                del self.postings[token]
+
+    def update(self, key, old_fields: tuple, fields: tuple) -> None:
+        """
+        Re-indexes a document whose fields changed
+        """
+        self.remove(key, old_fields)
+        self.add(key, fields)
+
+    def document_frequency(self, token: str) -> int:
+        return len(self.postings.get(token, ()))
+
+    def search(self, query: str) -> set:
+        """
+        Finds the documents containing every word of the query
+        Args: query (str): the words to look for
+        Returns the set of matching keys
+        """
+        tokens = set(tokenize(query))
+        if not tokens:
+            return set()
+
+        # intersect starting from the rarest word
+        posting_lists = sorted(
+            (self.postings.get(token, {}) for token in tokens), key=len
+        )
+        matches = set(posting_lists[0])
+        for keys in posting_lists[1:]:
+            matches.intersection_update(keys)
+            if not matches:
+                break
+        return matches
+
+    def top_k(self, query: str, k: int, weights: tuple = ()) -> list:
+        """
+        Ranks the documents containing any word of the query with BM25,
+        combining the fields by weight before saturating the term frequency
+        Args: query (str): the words to look for
+                k (int): the number of documents to return
+                weights (tuple): the weight of each field, 1 by default
+        Returns the keys of the k best scoring documents, best first,
+        ties going to the smallest key
+        """
+        tokens = list(dict.fromkeys(tokenize(query)))
+        if k <= 0 or not tokens or not self.lengths:
+            return []
+        weights = weights or (1.0,) * self.field_count
+
+        document_count = len(self.lengths)
+        average_lengths = [max(total / document_count, 1) for total in self.total_lengths]
+        terms = []
+        for token in tokens:
+            postings = self.postings.get(token)
+            if postings:
+                frequency = len(postings)
+                idf = math.log(1 + (document_count - frequency + 0.5) / (frequency + 0.5))
+                terms.append((postings, idf))
+
+        def score(key) -> float:
+            lengths = self.lengths[key]
+            total = 0.0
+            for postings, idf in terms:
+                frequencies = postings.get(key)
+                if frequencies is None:
+                    continue
+                weighted = sum(
+                    weight * frequency
+                    / (1 - BM25_B + BM25_B * length / average_length)
+                    for weight, frequency, length, average_length in zip(
+                        weights, frequencies, lengths, average_lengths
+                    )
+                )
+                total += idf * weighted / (BM25_K1 + weighted)
+            return total
+
+        def scored():
+            # every matching document once, without collecting them first
+            for position, (postings, _) in enumerate(terms):
+                for key in postings:
+                    if not any(key in earlier for earlier, _ in terms[:position]):
+                        yield score(key), key
+
+        best = heapq.nlargest(k, scored(), key=lambda pair: (pair[0], -pair[1]))
+        return [key for _, key in best]
+
+
+def contains_words(query: str, fields: tuple) -> bool:
+    """
+    Scan equivalent of InvertedIndex.search for a single document
+    Args: query (str): the words to look for
+            fields (tuple): the text of each field of the document
+    Returns True if every word of the query is in one of the fields
+    """
+    tokens = set(tokenize(query))
+    if not tokens:
+        return False
+    document = {token for field in fields for token in tokenize(field)}
+    return tokens <= document
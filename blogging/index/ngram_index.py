@@ -0,0 +1,101 @@
+from collections import Counter
+from blogging.index.inverted_index import tokenize
+
+
+def padded_trigrams(text: str) -> set[str]:
+    """
+    Returns the trigrams of every normalized word of the text, each word
+    padded with two spaces in front and one behind so that its start and
+    end carry more weight and even short words have trigrams
+    """
+    grams: set[str] = set()
+    for word in tokenize(text):
+        padded = f"  {word} "
+        grams.update(padded[i : i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def similarity(first: str, second: str) -> float:
+    """
+    Scan equivalent of NgramIndex.similar for a single pair of texts
+    Returns the share of their padded trigrams the two texts have in common,
+    from 0 (none) to 1 (all)
+    """
+    first_grams = padded_trigrams(first)
+    second_grams = padded_trigrams(second)
+    shared = len(first_grams & second_grams)
+    if not shared:
+        return 0.0
+    return shared / (len(first_grams) + len(second_grams) - shared)
+
+
+class NgramIndex:
+    """
+    Similarity index over documents made of one or more fields.
+    Two texts that differ by a typo still share most of their trigrams,
+    so counting the trigrams a query shares with each document, through
+    the posting lists, scores only the documents that have any in common.
+    """
+
+    def __init__(self):
+        # padded trigram -> keys of the documents containing it
+        self.postings: dict[str, set] = {}
+        # key -> number of distinct trigrams in the document
+        self.sizes: dict = {}
+
+    def _document_trigrams(self, fields: tuple) -> set[str]:
+        grams: set[str] = set()
+        for field in fields:
+            grams |= padded_trigrams(field)
+        return grams
+
+    def add(self, key, fields: tuple) -> None:
+        """
+        Indexes a document
+        Args: key: the unique key of the document
+                fields (tuple): the text of each field
+        """
+        grams = self._document_trigrams(fields)
+        self.sizes[key] = len(grams)
+        for gram in grams:
+            self.postings.setdefault(gram, set()).add(key)
+
+    def remove(self, key, fields: tuple) -> None:
+        """
+        Removes a document from the index
+        Args: key: the unique key of the document
+                fields (tuple): the indexed text of each field
+        """
+        self.sizes.pop(key, None)
+        for gram in self._document_trigrams(fields):
+            keys = self.postings.get(gram)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self.postings[gram]
+
+    def update(self, key, old_fields: tuple, fields: tuple) -> None:
+        """
+        Re-indexes a document whose fields changed
+        """
+        self.remove(key, old_fields)
+        self.add(key, fields)
+
+    def similar(self, query: str, threshold: float) -> dict:
+        """
+        Finds the documents similar to the query
+        Args: query (str): the text to compare with
+                threshold (float): the lowest similarity to keep, from 0 to 1
+        Returns a dict of the similar keys to their similarity
+        """
+        grams = padded_trigrams(query)
+        shared = Counter()
+        for gram in grams:
+            shared.update(self.postings.get(gram, ()))
+
+        scores = {}
+        for key, count in shared.items():
+            score = count / (len(grams) + self.sizes[key] - count)
+            if score >= threshold:
+                scores[key] = score
+        return scores
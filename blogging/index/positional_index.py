@@ -0,0 +1,191 @@
+from bisect import bisect_left, insort
+import math
+from blogging.helper import normalize_text
+from blogging.index.inverted_index import TOKEN_PATTERN
+
+# the positions of a document's words take the low bits of their packed occurrences
+POSITION_BITS = 32
+
+
+def positions(fields: tuple) -> dict[str, list[int]]:
+    """
+    Numbers the normalized words of a document's fields in order,
+    leaving a gap between fields so that no phrase spans two of them
+    Returns token -> ascending positions
+    """
+    found: dict[str, list[int]] = {}
+    position = 0
+    for field in fields:
+        for token in TOKEN_PATTERN.findall(normalize_text(field)):
+            found.setdefault(token, []).append(position)
+            position += 1
+        position += 1
+    return found
+
+
+def starting(tokens: list[str], prefix: str):
+    """
+    Yields the tokens of a sorted list that start with a prefix
+    """
+    position = bisect_left(tokens, prefix)
+    while position < len(tokens) and tokens[position].startswith(prefix):
+        yield tokens[position]
+        position += 1
+
+
+class PositionalIndex:
+    """
+    Phrase index over documents made of one or more fields, keyed by int.
+    Maps every token to its occurrences, each packed with the key of its
+    document into one int, key << POSITION_BITS | position, so that a
+    word following another one is found with a set lookup. A phrase
+    found in a field is made of consecutive words of it: the words inside
+    the phrase are whole words of the field, while its first and last
+    words may be the end and the start of longer ones. Following the
+    occurrences of its rarest word through the others gives a small
+    superset of the matches, to be confirmed with a plain `in` test,
+    which also checks the punctuation and spaces in between.
+    """
+
+    def __init__(self):
+        # token -> packed occurrences of the token
+        self.postings: dict[str, set[int]] = {}
+        # number of occurrences of all tokens
+        self.length = 0
+        # the tokens sorted, and sorted read backwards, to find those
+        # starting or ending with the first or last word of a phrase
+        self.vocabulary: list[str] = []
+        self.reversed_vocabulary: list[str] = []
+
+    def _occurrences(self, key: int, fields: tuple):
+        for token, found in positions(fields).items():
+            yield token, {key << POSITION_BITS | position for position in found}
+
+    def _postings(self, token: str) -> set[int]:
+        postings = self.postings.get(token)
+        if postings is None:
+            postings = self.postings[token] = set()
+            insort(self.vocabulary, token)
+            insort(self.reversed_vocabulary, token[::-1])
+        return postings
+
+    def _forget(self, token: str) -> None:
+        del self.postings[token]
+        del self.vocabulary[bisect_left(self.vocabulary, token)]
+        del self.reversed_vocabulary[bisect_left(self.reversed_vocabulary, token[::-1])]
+
+    def add(self, key: int, fields: tuple) -> None:
+        """
+        Indexes a document
+        Args: key (int): the unique key of the document
+                fields (tuple): the text of each field
+        """
+        for token, occurrences in self._occurrences(key, fields):
+            self._postings(token).update(occurrences)
+            self.length += len(occurrences)
+
+    def remove(self, key: int, fields: tuple) -> None:
+        """
+        Removes a document from the index
+        Args: key (int): the unique key of the document
+                fields (tuple): the indexed text of each field
+        """
+        for token, occurrences in self._occurrences(key, fields):
+            postings = self.postings.get(token)
+            if postings is not None:
+                self.length -= len(postings & occurrences)
+                postings.difference_update(occurrences)
+                if not postings:
+                    self._forget(token)
+
+    def update(self, key: int, old_fields: tuple, fields: tuple) -> None:
+        """
+        Re-indexes a document whose fields changed, only touching
+        the occurrences that moved
+        """
+        old = dict(self._occurrences(key, old_fields))
+        new = dict(self._occurrences(key, fields))
+        for token, occurrences in old.items():
+            removed = occurrences - new.get(token, set())
+            postings = self.postings.get(token)
+            if removed and postings is not None:
+                self.length -= len(postings & removed)
+                postings.difference_update(removed)
+                if not postings:
+                    self._forget(token)
+        for token, occurrences in new.items():
+            added = occurrences - old.get(token, set())
+            if added:
+                self._postings(token).update(added)
+                self.length += len(added)
+
+    def _words(self, phrase: str):
+        """
+        Splits a phrase into the words its matches must have in a row
+        Returns the posting lists of the tokens each word may be, or None
+        when the phrase has fewer than two words
+        """
+        phrase = normalize_text(phrase)
+        matches = list(TOKEN_PATTERN.finditer(phrase))
+        if len(matches) < 2:
+            return None
+
+        words = [
+            [self.postings[match[0]]] if match[0] in self.postings else [] for match in matches
+        ]
+        # a phrase starting or ending inside a word matches any word ending or starting with it
+        if matches[0].start() == 0:
+            ends = starting(self.reversed_vocabulary, matches[0][0][::-1])
+            words[0] = [self.postings[token[::-1]] for token in ends]
+        if matches[-1].end() == len(phrase):
+            starts = starting(self.vocabulary, matches[-1][0])
+            words[-1] = [self.postings[token] for token in starts]
+        return words
+
+    def candidates(self, phrase: str):
+        """
+        Narrows down the documents that may contain the phrase
+        Args: phrase (str): the substring to look for
+        Returns the set of candidate keys, or None when the phrase has
+        fewer than two words and cannot be looked up by position
+        """
+        lookup = self.lookup(phrase)
+        return None if lookup is None else lookup[2]()
+
+    def lookup(self, phrase: str):
+        """
+        Prepares the lookup of a phrase, estimating the documents it finds
+        assuming its words follow each other independently
+        Returns the estimated number of documents, the number of occurrences
+        the lookup reads and the function running it, or None when the
+        phrase has fewer than two words
+        """
+        words = self._words(phrase)
+        if words is None:
+            return None
+
+        counts = [sum(len(postings) for postings in word) for word in words]
+        rarest = min(range(len(words)), key=counts.__getitem__)
+        estimate = float(counts[rarest])
+        for word, count in enumerate(counts):
+            if word != rarest:
+                estimate *= count / max(self.length, 1)
+
+        def run() -> set:
+            # follow the occurrences of the rarest word through the words around it,
+            # looking them up in the posting lists of the others rather than merging those
+            starts = set().union(*words[rarest])
+            for word, others in enumerate(words):
+                if word != rarest and starts:
+                    offset = word - rarest
+                    starts = {
+                        start
+                        for start in starts
+                        if any(start + offset in postings for postings in others)
+                    }
+            return {start >> POSITION_BITS for start in starts}
+
+        # one set lookup per occurrence of the rarest word and token each other word may be
+        others = sum(len(word) for index, word in enumerate(words) if index != rarest)
+        lookups = counts[rarest] * others
+        return math.ceil(estimate), lookups, run
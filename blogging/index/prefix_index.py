@@ -0,0 +1,27 @@
+from bisect import bisect_left
+from blogging.helper import normalize_text
+from blogging.index.sorted_index import SortedIndex
+
+
+class PrefixIndex(SortedIndex):
+    """
+    Prefix index over text fields, kept as a sorted array of
+    (normalized field, key) entries. The fields starting with a prefix
+    are contiguous in the array, so completing a prefix is a binary
+    search followed by reading the next k entries.
+    """
+
+    def normalize(self, field):
+        return normalize_text(field)
+
+    def complete(self, prefix: str):
+        """
+        Walks the documents having a field that starts with the prefix
+        Args: prefix (str): the start of the field
+        Yields the keys in the order of their normalized field, then key
+        """
+        prefix = normalize_text(prefix)
+        position = bisect_left(self.entries, (prefix,))
+        while position < len(self.entries) and self.entries[position][0].startswith(prefix):
+            yield self.entries[position][1]
+            position += 1
@@ -0,0 +1,75 @@
+from bisect import bisect_right
+from functools import lru_cache
+import re
+from blogging.exception.illegal_operation_exception import IllegalOperationException
+from blogging.helper import raise_exception
+
+# ends every field, so the fields of a document are never run together
+SEPARATOR = "\x00"
+# constructs that see past the start or end of a field, and so may not
+# match the same way inside the buffer as on the field alone
+FIELD_BOUND_SYNTAX = ("^", "$", "\\A", "\\Z", "\\z", "(?=", "(?!", "(?<=", "(?<!")
+
+
+@lru_cache(maxsize=128)
+def compile_pattern(pattern: str, flags: int = 0) -> re.Pattern:
+    """
+    Compiles a regular expression, remembering the most recently used ones
+    Args: pattern (str): the regular expression
+            flags (int): the re flags, e.g. re.IGNORECASE
+    Returns the compiled pattern, raises IllegalOperationException if it is invalid
+    """
+    try:
+        return re.compile(pattern, flags)
+    except re.error as e:
+        raise_exception(IllegalOperationException, f"invalid pattern {pattern!r}, {e}")
+
+
+def buffer_safe(pattern: str) -> bool:
+    """
+    Returns True if every match of the pattern in a field is also found
+    when searching the field inside a RegexBuffer, i.e. the pattern has
+    no anchors or lookarounds
+    """
+    return not any(syntax in pattern for syntax in FIELD_BOUND_SYNTAX)
+
+
+class RegexBuffer:
+    """
+    Snapshot of documents made of one or more fields, joined into a single
+    string so that a regular expression scans all of them in one call per
+    matching document instead of one call per field.
+    A match may run from one field into the next, so the documents it
+    points at are only candidates, to be confirmed field by field.
+    """
+
+    def __init__(self, documents=()):
+        parts: list[str] = []
+        # start of every document in the text, and its key
+        self.offsets: list[int] = []
+        self.keys: list = []
+        length = 0
+        for key, fields in documents:
+            self.offsets.append(length)
+            self.keys.append(key)
+            for field in fields:
+                parts.append(field)
+                parts.append(SEPARATOR)
+                length += len(field) + 1
+        self.text = "".join(parts)
+
+    def candidates(self, compiled: re.Pattern):
+        """
+        Walks the documents in which a match of the pattern starts
+        Args: compiled (re.Pattern): a pattern for which buffer_safe is True
+        Yields the keys in document order
+        """
+        match = compiled.search(self.text)
+        while match:
+            slot = bisect_right(self.offsets, match.start()) - 1
+            yield self.keys[slot]
+            if slot + 1 == len(self.offsets):
+                return
+            # resume at the next document, so a match running past the end
+            # of this one hides nothing
+            match = compiled.search(self.text, self.offsets[slot + 1])
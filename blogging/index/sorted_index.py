@@ -0,0 +1,105 @@
+from bisect import bisect_left, insort
+
+
+class SortedIndex:
+    """
+    Secondary index over documents made of one or more fields, kept as a
+    sorted array of (value, key) entries. The entries between two values
+    are contiguous in the array, so a range lookup is a binary search
+    followed by reading the k entries in range.
+    """
+
+    def __init__(self, documents=()):
+        # sorted (value, key) pairs, one per field of every document
+        self.entries: list[tuple] = sorted(
+            (self.normalize(field), key) for key, fields in documents for field in fields
+        )
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def normalize(self, field):
+        """
+        The value a field is indexed under
+        """
+        return field
+
+    def add(self, key, fields: tuple) -> None:
+        """
+        Indexes a document
+        Args: key: the unique key of the document
+                fields (tuple): the value of each field
+        """
+        for field in fields:
+            insort(self.entries, (self.normalize(field), key))
+
+    def remove(self, key, fields: tuple) -> None:
+        """
+        Removes a document from the index
+        Args: key: the unique key of the document
+                fields (tuple): the indexed value of each field
+        """
+        for field in fields:
+            entry = (self.normalize(field), key)
+            position = bisect_left(self.entries, entry)
+            if position < len(self.entries) and self.entries[position] == entry:
+                del self.entries[position]
+
+    def update(self, key, old_fields: tuple, fields: tuple) -> None:
+        """
+        Re-indexes a document whose fields changed
+        """
+        if old_fields == fields:
+            return
+        self.remove(key, old_fields)
+        self.add(key, fields)
+
+    def between(self, start=None, end=None):
+        """
+        Walks the documents having a field value in [start, end)
+        Args: start: the lowest value, None for no lower bound
+                end: the value past the highest, None for no upper bound
+        Yields the keys in the order of their value, then key
+        """
+        position = 0 if start is None else bisect_left(self.entries, (start,))
+        while position < len(self.entries) and (end is None or self.entries[position][0] < end):
+            yield self.entries[position][1]
+            position += 1
+
+    def count(self, start=None, end=None) -> int:
+        """
+        Counts the entries with a value in [start, end), with two binary searches
+        Args: start: the lowest value, None for no lower bound
+                end: the value past the highest, None for no upper bound
+        """
+        low = 0 if start is None else bisect_left(self.entries, (start,))
+        high = len(self.entries) if end is None else bisect_left(self.entries, (end,))
+        return max(high - low, 0)
+
+    def ascending(self, after=None):
+        """
+        Walks the documents in increasing order of value
+        Args: after: start past the documents with this value, None to start at the lowest
+        Yields the keys in the order of their value, then key
+        """
+        position = 0
+        if after is not None:
+            position = bisect_left(self.entries, (after,))
+            while position < len(self.entries) and self.entries[position][0] == after:
+                position += 1
+        while position < len(self.entries):
+            yield self.entries[position][1]
+            position += 1
+
+    def descending(self, before=None):
+        """
+        Walks the documents in decreasing order of value
+        Args: before: start below the documents with this value, None to start at the highest
+        Yields the keys in the reverse order of their value, then key
+        """
+        position = len(self.entries)
+        if before is not None:
+            position = bisect_left(self.entries, (before,))
+        while position > 0:
+            position -= 1
+            yield self.entries[position][1]
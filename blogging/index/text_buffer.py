@@ -0,0 +1,121 @@
+from bisect import bisect_right
+from blogging.helper import normalize_text
+
+# ends every field, so no match can run from one field or document into the next
+SEPARATOR = b"\x00"
+# after this many matches, a search gives up if more than one in
+# DENSE_SHARE of the documents so far matched
+DENSE_CHECK = 256
+DENSE_SHARE = 4
+
+
+class TextBuffer:
+    """
+    Substring search engine over documents made of one or more fields.
+    The normalized fields of every document are packed, UTF-8 encoded,
+    into one contiguous buffer, so a query is a handful of bytes.find
+    calls running at C speed. Match positions are mapped back to
+    documents by bisecting the array of document offsets.
+    Changed and deleted documents are tombstoned rather than cut out of
+    the buffer, and the buffer is repacked once they take up half of it.
+    The engine pays per match, so it is meant for selective queries and
+    leaves queries matching most documents to a plain scan.
+    """
+
+    def __init__(self, documents=()):
+        self.buffer = bytearray()
+        # start of every document in the buffer, in increasing order,
+        # and the key of the document starting there, None once tombstoned
+        self.offsets: list[int] = []
+        self.keys: list = []
+        # key -> position of the live document in offsets
+        self.slots: dict = {}
+        self.dead_bytes = 0
+        for key, fields in documents:
+            self.add(key, fields)
+
+    def __len__(self) -> int:
+        return len(self.slots)
+
+    def add(self, key, fields: tuple) -> None:
+        """
+        Appends a document to the buffer
+        Args: key: the unique key of the document
+                fields (tuple): the text of each field
+        """
+        if key in self.slots:
+            self.remove(key)
+        self.slots[key] = len(self.offsets)
+        self.offsets.append(len(self.buffer))
+        self.keys.append(key)
+        for field in fields:
+            self.buffer += normalize_text(field).encode()
+            self.buffer += SEPARATOR
+
+    def remove(self, key, fields: tuple = ()) -> None:
+        """
+        Tombstones a document
+        Args: key: the unique key of the document
+        """
+        slot = self.slots.pop(key, None)
+        if slot is None:
+            return
+        self.keys[slot] = None
+        self.dead_bytes += self._end(slot) - self.offsets[slot]
+        if self.dead_bytes * 2 > len(self.buffer):
+            self._repack()
+
+    def update(self, key, old_fields: tuple, fields: tuple) -> None:
+        """
+        Replaces a document whose fields changed by a copy at the end of the buffer
+        """
+        self.remove(key)
+        self.add(key, fields)
+
+    def _end(self, slot: int) -> int:
+        if slot + 1 < len(self.offsets):
+            return self.offsets[slot + 1]
+        return len(self.buffer)
+
+    def _repack(self) -> None:
+        """
+        Rebuilds the buffer without the tombstoned documents
+        """
+        buffer = bytearray()
+        offsets: list[int] = []
+        keys: list = []
+        for slot, key in enumerate(self.keys):
+            if key is None:
+                continue
+            self.slots[key] = len(offsets)
+            offsets.append(len(buffer))
+            keys.append(key)
+            buffer += self.buffer[self.offsets[slot] : self._end(slot)]
+        self.buffer, self.offsets, self.keys = buffer, offsets, keys
+        self.dead_bytes = 0
+
+    def search(self, query: str):
+        """
+        Finds the documents having a field that contains the query
+        Args: query (str): the substring to look for
+        Returns the set of matching keys, or None when most documents match,
+        as checking every document is then cheaper than mapping every match
+        """
+        if not query:
+            return None
+
+        pattern = normalize_text(query).encode()
+        if SEPARATOR in pattern:
+            return set()
+
+        matches = set()
+        position = self.buffer.find(pattern)
+        while position != -1:
+            slot = bisect_right(self.offsets, position) - 1
+            if self.keys[slot] is not None:
+                matches.add(self.keys[slot])
+                if len(matches) == DENSE_CHECK and len(matches) * DENSE_SHARE > slot + 1:
+                    return None
+            # one match per document is enough, resume at the next one
+            position = self.buffer.find(pattern, self._end(slot))
+        return matches
@@ -0,0 +1,77 @@
+from blogging.helper import normalize_text
+
+
+def trigrams(text: str) -> set[str]:
+    """
+    Returns the set of three character substrings of the normalized text
+    """
+    text = normalize_text(text)
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+class TrigramIndex:
+    """
+    Substring index over documents made of one or more fields.
+    Every document whose field contains a query also contains all of
+    the query's trigrams, so intersecting their posting lists gives a
+    small superset of the matches, to be confirmed with a plain `in` test.
+    """
+
+    def __init__(self):
+        # trigram -> keys of the documents containing it
+        self.postings: dict[str, set] = {}
+
+    def _document_trigrams(self, fields: tuple) -> set[str]:
+        grams: set[str] = set()
+        for field in fields:
+            grams |= trigrams(field)
+        return grams
+
+    def add(self, key, fields: tuple) -> None:
+        """
+        Indexes a document
+        Args: key: the unique key of the document
+                fields (tuple): the text of each field
+        """
+        for gram in self._document_trigrams(fields):
+            self.postings.setdefault(gram, set()).add(key)
+
+    def remove(self, key, fields: tuple) -> None:
+        """
+        Removes a document from the index
+        Args: key: the unique key of the document
+                fields (tuple): the indexed text of each field
+        """
+        for gram in self._document_trigrams(fields):
+            keys = self.postings.get(gram)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self.postings[gram]
+
+    def update(self, key, old_fields: tuple, fields: tuple) -> None:
+        """
+        Re-indexes a document whose fields changed
+        """
+        self.remove(key, old_fields)
+        self.add(key, fields)
+
+    def candidates(self, query: str):
+        """
+        Narrows down the documents that may contain the query
+        Args: query (str): the substring to look for
+        Returns the set of candidate keys, or None when the query is
+        shorter than a trigram and every document has to be scanned
+        """
+        grams = trigrams(query)
+        if not grams:
+            return None
+
+        # intersect starting from the rarest trigram
+        posting_lists = sorted((self.postings.get(gram, set()) for gram in grams), key=len)
+        matches = set(posting_lists[0])
+        for keys in posting_lists[1:]:
+            matches.intersection_update(keys)
+            if not matches:
+                break
+        return matches
@@ -1,4 +1,5 @@
 from datetime import datetime
+from blogging.helper import normalize_text
 
 
 class Post:
@@ -24,6 +25,42 @@ class Post:
 
         self.update_time: tuple = current_date
 
+    @property
+    def title(self) -> str:
+        return self._title
+
+    @title.setter
+    def title(self, title: str) -> None:
+        self._title = title
+        # normalized once here so searches don't normalize every post on every query
+        self.folded_title = normalize_text(title)
+
+    @property
+    def text(self) -> str:
+        return self._text
+
+    @text.setter
+    def text(self, text: str) -> None:
+        self._text = text
+        self.folded_text = normalize_text(text)
+
+    def __getstate__(self) -> dict:
+        # the normalized fields are not saved, they are recomputed on load
+        return {
+            "code": self.code,
+            "title": self.title,
+            "text": self.text,
+            "creation_time": self.creation_time,
+            "update_time": self.update_time,
+        }
+
+    def __setstate__(self, state: dict) -> None:
+        self.code = state["code"]
+        self.title = state["title"]
+        self.text = state["text"]
+        self.creation_time = state["creation_time"]
+        self.update_time = state["update_time"]
+
     def set_values(self, title, text):
         """
         Updates Values of the post given a title and a text
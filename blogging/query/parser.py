@@ -0,0 +1,308 @@
+from datetime import datetime, timedelta
+import re
+from blogging.exception.invalid_query_exception import InvalidQueryException
+from blogging.helper import normalize_email, normalize_text, normalize_url, raise_exception
+
+# the fields of each kind of document, and what kind of value they hold
+POST_FIELDS = {
+    "title": "text",
+    "text": "text",
+    "created": "time",
+    "updated": "time",
+    "code": "number",
+}
+BLOG_FIELDS = {
+    "name": "text",
+    "url": "url",
+    "email": "email",
+    "id": "number",
+}
+OPERATORS = ("AND", "OR", "NOT")
+
+TOKEN_PATTERN = re.compile(
+    r"""
+    \s*(?:
+        (?P<paren>[()])
+      | "(?P<phrase>(?:[^"\\]|\\.)*)"
+      | (?P<field>[A-Za-z_]+):(?P<comparison>>=|<=|>|<|=)?
+      | (?P<word>[^\s()"]+)
+    )
+    """,
+    re.VERBOSE,
+)
+WORD_PATTERN = re.compile(r'[^\s()"]+')
+QUOTED_PATTERN = re.compile(r'"((?:[^"\\]|\\.)*)"')
+TIME_PATTERN = re.compile(r"(\d{4})(?:-(\d{1,2})(?:-(\d{1,2})(?:[T ](\d{1,2}):(\d{1,2}))?)?)?")
+
+
+class Term:
+    """
+    A single condition on one field of a document. Text terms hold the
+    normalized text to find; time and number terms hold the half-open
+    range [start, end) of the values to match, either bound being None
+    when open; url and email terms hold the normalized value to match.
+    """
+
+    def __init__(self, field, kind: str, value, start=None, end=None, text: str = ""):
+        # None for the default fields of the document
+        self.field = field
+        self.kind = kind
+        self.value = value
+        self.start = start
+        self.end = end
+        # the term as written, for plans
+        self.text = text
+
+    def terms(self) -> list:
+        return [self]
+
+    def __str__(self) -> str:
+        return self.text
+
+
+class Not:
+    """
+    Matches the documents the child does not match
+    """
+
+    def __init__(self, child):
+        self.child = child
+
+    def terms(self) -> list:
+        return self.child.terms()
+
+    def __str__(self) -> str:
+        return f"NOT {self.child}"
+
+
+class And:
+    """
+    Matches the documents every child matches
+    """
+
+    def __init__(self, children: list):
+        self.children = children
+
+    def terms(self) -> list:
+        return [term for child in self.children for term in child.terms()]
+
+    def __str__(self) -> str:
+        return "(" + " AND ".join(str(child) for child in self.children) + ")"
+
+
+class Or:
+    """
+    Matches the documents any child matches
+    """
+
+    def __init__(self, children: list):
+        self.children = children
+
+    def terms(self) -> list:
+        return [term for child in self.children for term in child.terms()]
+
+    def __str__(self) -> str:
+        return "(" + " OR ".join(str(child) for child in self.children) + ")"
+
+
+def invalid(message: str):
+    raise_exception(InvalidQueryException, f"invalid query, {message}")
+
+
+def parse_time(value: str):
+    """
+    Parses a timestamp of any precision from a year down to a minute,
+    e.g. "2026", "2026-01-31" or "2026-01-31T09:30"
+    Returns the range [start, end) of the timestamp tuples it covers
+    """
+    match = TIME_PATTERN.fullmatch(value)
+    if not match:
+        invalid(f"{value!r} is not a date")
+    parts = tuple(int(part) for part in match.groups() if part is not None)
+    try:
+        if len(parts) == 1:
+            return parts, (parts[0] + 1,)
+        if len(parts) == 2:
+            datetime(parts[0], parts[1], 1)
+            if parts[1] == 12:
+                return parts, (parts[0] + 1, 1)
+            return parts, (parts[0], parts[1] + 1)
+        moment = datetime(*parts)
+    except ValueError:
+        invalid(f"{value!r} is not a date")
+    if len(parts) == 3:
+        moment += timedelta(days=1)
+        return parts, (moment.year, moment.month, moment.day)
+    moment += timedelta(minutes=1)
+    return parts, (moment.year, moment.month, moment.day, moment.hour, moment.minute)
+
+
+def parse_number(value: str):
+    """
+    Returns the range [start, end) holding only the integer value
+    """
+    try:
+        number = int(value)
+    except ValueError:
+        invalid(f"{value!r} is not a number")
+    return number, number + 1
+
+
+def make_term(field, kind: str, comparison, value: str, text: str) -> Term:
+    """
+    Builds the term for a field condition, checking the value fits the field
+    Args: field: the field name, None for the default fields
+            kind (str): the kind of value the field holds
+            comparison: one of >, >=, <, <= and =, None for an equality
+            value (str): the value as written
+            text (str): the term as written
+    """
+    if kind in ("time", "number"):
+        start, end = parse_time(value) if kind == "time" else parse_number(value)
+        bounds = {
+            None: (start, end),
+            "=": (start, end),
+            ">": (end, None),
+            ">=": (start, None),
+            "<": (None, start),
+            "<=": (None, end),
+        }
+        return Term(field, kind, value, *bounds[comparison], text=text)
+
+    if comparison not in (None, "="):
+        invalid(f"{field} cannot be compared with {comparison}")
+    if kind == "url":
+        return Term(field, kind, normalize_url(value), text=text)
+    if kind == "email":
+        return Term(field, kind, normalize_email(value), text=text)
+    if not value:
+        invalid("empty search text")
+    return Term(field, kind, normalize_text(value), text=text)
+
+
+def tokenize(query: str, fields: dict) -> list:
+    """
+    Splits a query into parentheses, operators and terms
+    Args: query (str): the query
+            fields (dict): the fields that can be named, and their kind
+    Returns a list of "(", ")", operator names and Terms
+    """
+    tokens: list = []
+    position = 0
+    query = query.rstrip()
+    while position < len(query):
+        match = TOKEN_PATTERN.match(query, position)
+        if not match or match.end() == position:
+            invalid(f"unexpected {query[position:]!r}")
+        position = match.end()
+        if match["paren"]:
+            tokens.append(match["paren"])
+        elif match["phrase"] is not None:
+            phrase = re.sub(r"\\(.)", r"\1", match["phrase"])
+            tokens.append(make_term(None, "text", None, phrase, f'"{phrase}"'))
+        elif match["word"]:
+            word = match["word"]
+            tokens.append(word if word in OPERATORS else make_term(None, "text", None, word, word))
+        else:
+            field = match["field"]
+            if field not in fields:
+                # not a field, e.g. the scheme of a URL, so part of the search text
+                word = WORD_PATTERN.match(query, match.start("field"))[0]
+                position = match.start("field") + len(word)
+                tokens.append(make_term(None, "text", None, word, word))
+                continue
+            value, position = read_value(query, position)
+            comparison = match["comparison"]
+            text = f"{field}:{comparison or ''}{value[1]}"
+            tokens.append(make_term(field, fields[field], comparison, value[0], text))
+    return tokens
+
+
+def read_value(query: str, position: int):
+    """
+    Reads the value after a field name, either quoted or up to the next space or parenthesis
+    Returns the value and how it was written, and the position past it
+    """
+    if query.startswith('"', position):
+        match = QUOTED_PATTERN.match(query, position)
+        if not match:
+            invalid("unterminated quote")
+        value = re.sub(r"\\(.)", r"\1", match[1])
+        return (value, f'"{value}"'), match.end()
+    match = WORD_PATTERN.match(query, position)
+    if not match:
+        invalid(f"missing value after {query[:position]!r}")
+    return (match[0], match[0]), match.end()
+
+
+def parse(query: str, fields: dict):
+    """
+    Parses a query made of terms, e.g. journey, "long journey", title:trip
+    or updated:>=2026-01-31, combined with AND, OR, NOT and parentheses.
+    Terms next to each other must all match, as if joined by AND.
+    Args: query (str): the query
+            fields (dict): the fields that can be named, and their kind,
+            POST_FIELDS or BLOG_FIELDS
+    Returns the root of the parsed query, raises InvalidQueryException if it is invalid
+    """
+    parser = Parser(tokenize(query, fields))
+    if not parser.tokens:
+        invalid("empty query")
+    node = parser.parse_or()
+    if parser.position < len(parser.tokens):
+        invalid(f"unexpected {parser.tokens[parser.position]}")
+    return node
+
+
+class Parser:
+    """
+    Recursive descent parser, NOT binding tighter than AND, and AND tighter than OR
+    """
+
+    def __init__(self, tokens: list):
+        self.tokens = tokens
+        self.position = 0
+
+    def peek(self):
+        if self.position < len(self.tokens):
+            return self.tokens[self.position]
+        return None
+
+    def next(self):
+        token = self.peek()
+        if token is None:
+            invalid("unexpected end of query")
+        self.position += 1
+        return token
+
+    def parse_or(self):
+        children = [self.parse_and()]
+        while self.peek() == "OR":
+            self.next()
+            children.append(self.parse_and())
+        return children[0] if len(children) == 1 else Or(children)
+
+    def parse_and(self):
+        children = [self.parse_not()]
+        while self.peek() not in (None, "OR", ")"):
+            if self.peek() == "AND":
+                self.next()
+            children.append(self.parse_not())
+        return children[0] if len(children) == 1 else And(children)
+
+    def parse_not(self):
+        if self.peek() == "NOT":
+            self.next()
+            return Not(self.parse_not())
+        return self.parse_primary()
+
+    def parse_primary(self):
+        token = self.next()
+        if token == "(":
+            node = self.parse_or()
+            if self.next() != ")":
+                invalid("missing )")
+            return node
+        if isinstance(token, Term):
+            return token
+        invalid(f"unexpected {token}")
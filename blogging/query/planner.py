@@ -0,0 +1,232 @@
+from abc import ABC, abstractmethod
+import time
+from blogging.query.parser import And, Not, Or, Term
+
+# cost of checking one term against one document, in index entries read
+CHECK_COST = 4
+
+
+class AccessPath:
+    """
+    A way to find the documents matching a term through an index,
+    offered by a query source along with what using it would cost
+    """
+
+    def __init__(self, name: str, estimate: int, cost: int, fetch, exact: bool = True):
+        # the index, for plans
+        self.name = name
+        # the number of documents it is expected to return
+        self.estimate = estimate
+        # the number of index entries it is expected to read
+        self.cost = cost
+        # returns the set of keys
+        self.fetch = fetch
+        # False when the keys are only candidates, to be checked against the term
+        self.exact = exact
+
+
+def matches(node, document, source) -> bool:
+    """
+    Checks a document against a parsed query, term by term
+    """
+    if isinstance(node, Term):
+        return source.matches(node, document)
+    if isinstance(node, Not):
+        return not matches(node.child, document, source)
+    if isinstance(node, And):
+        return all(matches(child, document, source) for child in node.children)
+    return any(matches(child, document, source) for child in node.children)
+
+
+class Stage(ABC):
+    """
+    One step of a query plan: its estimated rows and cost and, once run,
+    the rows it produced and the time it took, including its inputs
+    """
+
+    def __init__(self, label: str, estimate: int, cost: int, children=()):
+        self.label = label
+        self.estimate = estimate
+        self.cost = cost
+        self.children = list(children)
+        self.rows: int | None = None
+        self.seconds = 0.0
+
+    def run(self):
+        start = time.perf_counter()
+        keys = self.execute()
+        self.seconds = time.perf_counter() - start
+        self.rows = len(keys)
+        return keys
+
+    @abstractmethod
+    def execute(self):
+        pass
+
+    def lines(self, depth: int = 0) -> list[str]:
+        line = f"{'  ' * depth}{self.label}  (estimated {self.estimate} rows, cost {self.cost})"
+        if self.rows is not None:
+            line += f"  {self.rows} rows in {self.seconds * 1000:.3f} ms"
+        return [line] + [line for child in self.children for line in child.lines(depth + 1)]
+
+
+class IndexStage(Stage):
+    def __init__(self, term: Term, access: AccessPath):
+        kind = "" if access.exact else " for candidates"
+        super().__init__(f"Index {term} using {access.name}{kind}", access.estimate, access.cost)
+        self.access = access
+
+    def execute(self):
+        return self.access.fetch()
+
+
+class IntersectStage(Stage):
+    def __init__(self, children: list, estimate: int):
+        super().__init__("Intersect", estimate, sum(child.cost for child in children), children)
+
+    def execute(self):
+        # starting from the smallest input
+        keys = set(self.children[0].run())
+        for child in self.children[1:]:
+            keys.intersection_update(child.run())
+        return keys
+
+
+class UnionStage(Stage):
+    def __init__(self, children: list, size: int):
+        estimate = min(size, sum(child.estimate for child in children))
+        super().__init__("Union", estimate, sum(child.cost for child in children), children)
+
+    def execute(self):
+        keys: set = set()
+        for child in self.children:
+            keys.update(child.run())
+        return keys
+
+
+class ScanStage(Stage):
+    def __init__(self, source):
+        super().__init__(f"Scan all {source.size} documents", source.size, source.size)
+        self.source = source
+
+    def execute(self):
+        return self.source.keys()
+
+
+class FilterStage(Stage):
+    def __init__(self, node, child: Stage, source):
+        cost = child.cost + child.estimate * CHECK_COST * len(node.terms())
+        super().__init__(f"Filter {node}", child.estimate, cost, [child])
+        self.node = node
+        self.source = source
+
+    def execute(self):
+        keys = self.children[0].run()
+        if isinstance(keys, set):
+            keys = self.source.order(keys)
+        return [
+            key for key in keys if matches(self.node, self.source.document(key), self.source)
+        ]
+
+
+class QueryPlan:
+    """
+    Cost based plan of a parsed query over a source of documents.
+    Every term that an index can answer offers an access path along with
+    the number of documents it expects to return, e.g. from the length of
+    a posting list or two binary searches in a sorted index. The planner
+    drives the query from the cheapest of them, intersects the others
+    while they cut down the documents to check by more than they cost,
+    and checks the remaining documents against the whole query. It falls
+    back to checking every document when that is cheaper, e.g. when no
+    term has an index or the terms match most documents.
+    """
+
+    def __init__(self, node, source):
+        self.node = node
+        self.source = source
+        self.check_cost = CHECK_COST * len(node.terms())
+        self.scan_cost = source.size * self.check_cost
+
+        driver, exact = self._driver(node)
+        filtered = FilterStage(node, driver, source) if driver is not None else None
+        if driver is not None and exact and driver.cost <= self.scan_cost:
+            self.strategy = "index"
+            self.root: Stage = driver
+        elif filtered is not None and filtered.cost < self.scan_cost:
+            self.strategy = "index and filter"
+            self.root = filtered
+        else:
+            self.strategy = "scan"
+            self.root = FilterStage(node, ScanStage(source), source)
+
+    def _driver(self, node):
+        """
+        Finds the cheapest stage returning every document the node may match through indexes
+        Returns the stage, or None if some of them can only be found by a scan,
+        and whether the stage returns exactly the documents the node matches
+        """
+        if isinstance(node, Term):
+            access = self.source.access(node)
+            if access is None:
+                return None, False
+            return IndexStage(node, access), access.exact
+        if isinstance(node, Not):
+            return None, False
+
+        drivers = [self._driver(child) for child in node.children]
+        if isinstance(node, Or):
+            if any(driver is None for driver, _ in drivers):
+                return None, False
+            stages = [driver for driver, _ in drivers]
+            return UnionStage(stages, self.source.size), all(exact for _, exact in drivers)
+
+        drivers = sorted(
+            (pair for pair in drivers if pair[0] is not None), key=lambda pair: pair[0].estimate
+        )
+        if not drivers:
+            return None, False
+        chosen = [drivers[0]]
+        estimate = drivers[0][0].estimate
+        for driver, exact in drivers[1:]:
+            # assuming the terms are independent
+            narrowed = estimate * driver.estimate // max(self.source.size, 1)
+            # intersecting reads the other index, but saves checking the documents it rules out
+            if driver.cost < (estimate - narrowed) * self.check_cost:
+                chosen.append((driver, exact))
+                estimate = narrowed
+        exact = len(chosen) == len(node.children) and all(exact for _, exact in chosen)
+        if len(chosen) == 1:
+            return chosen[0][0], exact
+        return IntersectStage([driver for driver, _ in chosen], estimate), exact
+
+    @property
+    def cost(self) -> int:
+        return self.root.cost
+
+    def execute(self) -> list:
+        """
+        Runs the plan
+        Returns the keys of the matching documents, in the order of the source
+        """
+        keys = self.root.run()
+        if isinstance(keys, set):
+            keys = self.source.order(keys)
+        return keys
+
+    def explain(self) -> str:
+        """
+        Runs the plan, timing every stage
+        Returns the plan as text, one stage per line with its inputs indented below it
+        """
+        start = time.perf_counter()
+        keys = self.execute()
+        seconds = time.perf_counter() - start
+        return "\n".join(
+            [
+                f"Query {self.node}",
+                f"Plan {self.strategy}, cost {self.cost} against {self.scan_cost} for a scan",
+                *self.root.lines(),
+                f"{len(keys)} rows in {seconds * 1000:.3f} ms",
+            ]
+        )
@@ -0,0 +1,155 @@
+from blogging.configuration import Configuration
+from blogging.helper import normalize_email, normalize_url
+from blogging.index.inverted_index import TOKEN_PATTERN
+from blogging.index.trigram_index import trigrams
+from blogging.query.planner import CHECK_COST, AccessPath
+
+# cost of following one word occurrence of a phrase to the next word, in index
+# entries read: a set lookup in Python rather than part of a set intersection
+LOOKUP_COST = 2 * CHECK_COST
+# query field -> Post attribute holding the timestamp
+TIME_ATTRIBUTES = {"created": "creation_time", "updated": "update_time"}
+
+
+def in_range(value, term) -> bool:
+    return (term.start is None or value >= term.start) and (term.end is None or value < term.end)
+
+
+def trigram_access(index, text: str):
+    """
+    Offers the candidates of a trigram index for a substring, estimated
+    by the length of the shortest posting list of its trigrams
+    Returns None when the text is shorter than a trigram
+    """
+    grams = trigrams(text)
+    if not grams:
+        return None
+    estimate = min(len(index.postings.get(gram, ())) for gram in grams)
+    fetch = lambda: index.candidates(text)
+    return AccessPath("trigram index", estimate, estimate * len(grams), fetch, exact=False)
+
+
+def phrase_access(index, text: str):
+    """
+    Offers the candidates of a positional index for a phrase
+    Returns None when the text has fewer than two words
+    """
+    lookup = index.lookup(text)
+    if lookup is None:
+        return None
+    estimate, lookups, fetch = lookup
+    return AccessPath("phrase index", estimate, lookups * LOOKUP_COST, fetch, exact=False)
+
+
+def substring_access(dao, text: str):
+    """
+    Offers the cheapest of the phrase and trigram indexes of a
+    PostDAOPickle enabled in Configuration for a substring of the posts.
+    Only the indexes already built are compared; when none of them is,
+    the one suited to the text is built: the phrase index for a text of
+    several words, the trigram index otherwise.
+    Returns None when neither can narrow the search down
+    """
+    # the indexes hold the titles and texts together, so they find candidates for either
+    usable = []
+    if Configuration.phrase_index and len(TOKEN_PATTERN.findall(text)) > 1:
+        usable.append((dao.phrase_index, dao._get_phrase_index, phrase_access))
+    if Configuration.trigram_index and trigrams(text):
+        usable.append((dao.substring_index, dao._get_substring_index, trigram_access))
+    paths = [access(index, text) for index, _, access in usable if index is not None]
+    if not paths and usable:
+        _, build, access = usable[0]
+        paths = [access(build(), text)]
+    paths = [path for path in paths if path is not None]
+    # counting the candidates to check as well as reading the index
+    return min(paths, key=lambda path: path.cost + path.estimate * CHECK_COST, default=None)
+
+
+def sorted_access(name: str, index, start, end):
+    """
+    Offers the documents of a sorted index in [start, end), counted with two binary searches
+    """
+    estimate = index.count(start, end)
+    return AccessPath(name, estimate, estimate + 1, lambda: set(index.between(start, end)))
+
+
+class PostSource:
+    """
+    The posts of a PostDAOPickle, as seen by the query planner: bare terms
+    search the titles and texts, title: and text: one of them, created:
+    and updated: compare the timestamps and code: the post codes.
+    """
+
+    def __init__(self, dao):
+        self.dao = dao
+        self.size = len(dao.posts_by_code)
+
+    def keys(self) -> list:
+        # codes are never reused, so their insertion order is the creation order
+        return list(self.dao.posts_by_code)
+
+    def order(self, keys) -> list:
+        return sorted(keys)
+
+    def document(self, key):
+        return self.dao.posts_by_code[key]
+
+    def matches(self, term, post) -> bool:
+        if term.kind == "time":
+            return in_range(getattr(post, TIME_ATTRIBUTES[term.field]), term)
+        if term.kind == "number":
+            return in_range(post.code, term)
+        if term.field == "title":
+            return term.value in post.folded_title
+        if term.field == "text":
+            return term.value in post.folded_text
+        return term.value in post.folded_title or term.value in post.folded_text
+
+    def access(self, term):
+        if term.kind == "time":
+            index = self.dao._get_time_index(TIME_ATTRIBUTES[term.field])
+            return sorted_access("time index", index, term.start, term.end)
+        if term.kind == "number":
+            return sorted_access("code index", self.dao._get_code_index(), term.start, term.end)
+        return substring_access(self.dao, term.value)
+
+
+class BlogSource:
+    """
+    The blogs of a BlogDAOJSON, as seen by the query planner: bare terms
+    and name: search the names, url: and email: match whole normalized
+    values and id: compares the blog IDs.
+    """
+
+    def __init__(self, dao):
+        self.dao = dao
+        self.size = len(dao.blogs)
+
+    def keys(self) -> list:
+        return [blog.id for blog in self.dao.blogs]
+
+    def order(self, keys) -> list:
+        return sorted(keys, key=self.dao.blog_positions.__getitem__)
+
+    def document(self, key):
+        return self.dao.blogs_by_id[key]
+
+    def matches(self, term, blog) -> bool:
+        if term.kind == "number":
+            return in_range(blog.id, term)
+        if term.kind == "url":
+            return normalize_url(blog.url) == term.value
+        if term.kind == "email":
+            return normalize_email(blog.email) == term.value
+        return term.value in blog.folded_name
+
+    def access(self, term):
+        if term.kind == "number":
+            return sorted_access("id index", self.dao._get_id_index(), term.start, term.end)
+        if term.kind in ("url", "email"):
+            index = self.dao._get_url_index() if term.kind == "url" else self.dao._get_email_index()
+            keys = index.lookup(term.value)
+            return AccessPath(f"{term.kind} index", len(keys), 1, lambda: set(keys))
+        if Configuration.trigram_index:
+            return trigram_access(self.dao._get_name_index(), term.value)
+        return None
@@ -0,0 +1,95 @@
+import time
+from blogging.query.parser import And, Not, Or
+
+# query field -> the columns it searches, None being the default fields
+POST_COLUMNS = {
+    None: ("title", "text"),
+    "title": ("title",),
+    "text": ("text",),
+    "created": ("creation_time",),
+    "updated": ("update_time",),
+    "code": ("code",),
+}
+BLOG_COLUMNS = {
+    None: ("name",),
+    "name": ("name",),
+    "url": ("url",),
+    "email": ("email",),
+    "id": ("id",),
+}
+# separator written before each part of a timestamp by time_to_text
+TIME_SEPARATORS = ("", "-", "-", " ", ":")
+
+
+def time_bound(parts: tuple) -> str:
+    """
+    Converts a timestamp of any precision to the start of its text as written
+    by time_to_text, which sorts before every timestamp text it begins
+    """
+    return "".join(
+        f"{separator}{part:0{4 if position == 0 else 2}d}"
+        for position, (separator, part) in enumerate(zip(TIME_SEPARATORS, parts))
+    )
+
+
+def range_sql(column: str, term, convert=lambda value: value):
+    conditions = []
+    parameters = []
+    if term.start is not None:
+        conditions.append(f"{column} >= ?")
+        parameters.append(convert(term.start))
+    if term.end is not None:
+        conditions.append(f"{column} < ?")
+        parameters.append(convert(term.end))
+    return " AND ".join(conditions) or "1", parameters
+
+
+def to_sql(node, columns: dict):
+    """
+    Compiles a parsed query into a WHERE condition, leaving the choice of
+    indexes to the SQLite query planner
+    Args: node: the parsed query
+            columns (dict): POST_COLUMNS or BLOG_COLUMNS
+    Returns the condition and its parameters
+    """
+    if isinstance(node, Not):
+        condition, parameters = to_sql(node.child, columns)
+        return f"NOT ({condition})", parameters
+    if isinstance(node, (And, Or)):
+        parts = [to_sql(child, columns) for child in node.children]
+        operator = " AND " if isinstance(node, And) else " OR "
+        condition = operator.join(f"({condition})" for condition, _ in parts)
+        return condition, [parameter for _, parameters in parts for parameter in parameters]
+
+    fields = columns[node.field]
+    if node.kind == "time":
+        return range_sql(fields[0], node, time_bound)
+    if node.kind == "number":
+        return range_sql(fields[0], node)
+    if node.kind == "url":
+        return "norm_url = ?", [node.value]
+    if node.kind == "email":
+        return "norm_email = ?", [node.value]
+    condition = " OR ".join(f"instr(fold({column}), ?) > 0" for column in fields)
+    return condition, [node.value] * len(fields)
+
+
+def explain_sql(connection, node, sql: str, parameters: list) -> str:
+    """
+    Runs a compiled query, timing the planning and the execution
+    Returns the plan SQLite chose as text, one step per line with the
+    steps it is made of indented below it
+    """
+    start = time.perf_counter()
+    steps = connection.execute("EXPLAIN QUERY PLAN " + sql, parameters).fetchall()
+    planned = time.perf_counter()
+    rows = connection.execute(sql, parameters).fetchall()
+    done = time.perf_counter()
+
+    depths = {0: -1}
+    lines = [f"Query {node}", f"SQL {sql}", f"Plan in {(planned - start) * 1000:.3f} ms"]
+    for step, parent, _, detail in steps:
+        depths[step] = depths.get(parent, -1) + 1
+        lines.append(f"{'  ' * depths[step]}{detail}")
+    lines.append(f"{len(rows)} rows in {(done - planned) * 1000:.3f} ms")
+    return "\n".join(lines)
@@ -0,0 +1,441 @@
+import os
+import sqlite3
+from unittest.mock import patch
+import unittest
+from blogging.blog import Blog
+from blogging.configuration import Configuration
+from blogging.dao import blog_dao as blog_dao_module
+from blogging.dao.blog_dao import BlogDAOJSON, BlogDAOSQLite
+from blogging.dao.post_dao import PostDAOSQLite
+from blogging.dao.query_cache import query_cache
+from blogging.dao.sqlite_database import close_connections
+from blogging.dao.write_behind import write_behind_flusher
+from blogging.exception.illegal_operation_exception import IllegalOperationException
+from blogging.post import Post
+from tests.data_dir import DataDirTestCase
+
+
+class BlogDAOJSONTest(DataDirTestCase):
+
+    def test_journal_replay(self):
+        blog_dao = BlogDAOJSON()
+        for i in range(1, 6):
+            blog_dao.create_blog(Blog(i, f"blog {i}", f"url {i}", f"email {i}"))
+        blog_dao.update_blog(2, Blog(20, "renamed", "url 20", "email 20"))
+        blog_dao.delete_blog(4)
+
+        self.assertTrue(os.path.exists(Configuration.blogs_journal_file))
+        with open(Configuration.blogs_journal_file) as file:
+            self.assertEqual(7, len(file.readlines()), "one line per operation")
+
+        reloaded = BlogDAOJSON()
+        self.assertEqual(blog_dao.list_blogs(), reloaded.list_blogs())
+        self.assertEqual(Blog(20, "renamed", "url 20", "email 20"), reloaded.search_blog(20))
+        self.assertIsNone(reloaded.search_blog(4))
+
+    def test_journal_compaction(self):
+        blog_dao = BlogDAOJSON()
+        for i in range(1, 4):
+            blog_dao.create_blog(Blog(i, f"blog {i}", f"url {i}", f"email {i}"))
+
+        blog_dao.compact()
+        self.assertFalse(os.path.exists(Configuration.blogs_journal_file))
+        self.assertEqual(blog_dao.list_blogs(), BlogDAOJSON().list_blogs())
+
+        # replaying an already compacted journal changes nothing
+        with open(Configuration.blogs_journal_file, "w") as file:
+            file.write('{"op": "create", "blog": {"__type__": "Blog", "id": 1, '
+                       '"name": "blog 1", "email": "email 1", "url": "url 1"}}\n')
+        self.assertEqual(blog_dao.list_blogs(), BlogDAOJSON().list_blogs())
+
+    def test_background_compaction(self):
+        self.configuration.__class__.blogs_journal_max_bytes = 1024
+        blog_dao = BlogDAOJSON()
+        for i in range(1, 201):
+            blog_dao.create_blog(Blog(i, f"blog {i}", f"url {i}", f"email {i}"))
+        blog_dao.wait_for_compaction()
+
+        self.assertLess(blog_dao.journal_bytes, os.path.getsize(Configuration.blogs_file))
+        self.assertEqual(blog_dao.list_blogs(), BlogDAOJSON().list_blogs())
+
+    def test_appends_during_compaction(self):
+        blog_dao = BlogDAOJSON()
+        for i in range(1, 4):
+            blog_dao.create_blog(Blog(i, f"blog {i}", f"url {i}", f"email {i}"))
+
+        write_blogs = blog_dao_module.json_update_file
+
+        def write_while_appending(payload, dest_file, Encoder):
+            # appended once the snapshot is taken, while blogs.json is written
+            blog_dao.create_blog(Blog(4, "blog 4", "url 4", "email 4"))
+            blog_dao.update_blog(1, Blog(10, "blog 10", "url 10", "email 10"))
+            return write_blogs(payload, dest_file, Encoder)
+
+        with patch.object(blog_dao_module, "json_update_file", write_while_appending):
+            blog_dao.compact(background=True)
+            blog_dao.wait_for_compaction()
+        with open(Configuration.blogs_journal_file) as file:
+            self.assertEqual(2, len(file.readlines()), "only the lines blogs.json lacks")
+        self.assertEqual(os.path.getsize(Configuration.blogs_journal_file), blog_dao.journal_bytes)
+        self.assertEqual([2, 3, 4, 10], sorted(blog.id for blog in BlogDAOJSON().list_blogs()))
+
+        # a snapshot that failed to be written drops no journal line
+        with patch.object(blog_dao_module, "json_update_file", return_value=False):
+            blog_dao.compact()
+        with open(Configuration.blogs_journal_file) as file:
+            self.assertEqual(2, len(file.readlines()))
+        self.assertEqual(blog_dao.list_blogs(), BlogDAOJSON().list_blogs())
+
+    def test_primary_index(self):
+        blog_dao = BlogDAOJSON()
+        for i in range(1, 6):
+            blog_dao.create_blog(Blog(i, f"blog {i}", f"url {i}", f"email {i}"))
+
+        blog_dao.update_blog(3, Blog(30, "blog 30", "url 30", "email 30"))
+        blog_dao.delete_blog(4)
+
+        self.assertIsNone(blog_dao.search_blog(3), "old ID is no longer indexed")
+        self.assertEqual(Blog(30, "blog 30", "url 30", "email 30"), blog_dao.search_blog(30))
+        self.assertIsNone(blog_dao.search_blog(4))
+        self.assertEqual(
+            sorted(blog.id for blog in blog_dao.list_blogs()),
+            sorted(blog_dao.blogs_by_id),
+            "index holds exactly the listed blogs",
+        )
+        self.assertEqual([1, 2, 30, 5], [blog.id for blog in blog_dao.list_blogs()])
+
+    def test_substring_search_matches_scan(self):
+        # compare the search engines themselves, not the cached results
+        self.configuration.__class__.query_cache_size = 0
+        blog_dao = BlogDAOJSON()
+        names = ["Short Journey", "Long Journey", "Long Trip", "Short Trip", "Boring Blog"]
+        for i, name in enumerate(names * 4):
+            blog_dao.create_blog(Blog(i, f"{name} {i}", f"url {i}", f"email {i}"))
+        blog_dao.update_blog(3, Blog(300, "Renamed Journey", "url", "email"))
+        blog_dao.update_blog(5, Blog(5, "Other", "url", "email"))
+        blog_dao.delete_blog(1)
+
+        queries = ["", "j", "Jo", "journey", "JOURNEY 1", "ort tr", "g blog", "nothing"]
+        indexed = {query: blog_dao.retrieve_blogs(query) for query in queries}
+        self.configuration.__class__.trigram_index = False
+        for query in queries:
+            self.assertEqual(blog_dao.retrieve_blogs(query), indexed[query], query)
+
+    def test_fuzzy_search(self):
+        # compare the search engines themselves, not the cached results
+        self.configuration.__class__.query_cache_size = 0
+        blog_dao = BlogDAOJSON()
+        names = ["Short Journey", "Long Journey", "Long Trip", "Cooking", "Cookies and Cakes"]
+        for i, name in enumerate(names):
+            blog_dao.create_blog(Blog(i, name, f"url {i}", f"email {i}"))
+        self.assertEqual([], blog_dao.retrieve_blogs("jorney"), "no exact match")
+        self.assertEqual(
+            ["Long Journey"], [blog.name for blog in blog_dao.retrieve_blogs("long jorney", fuzzy=True)]
+        )
+        self.assertEqual(
+            ["Long Journey", "Short Journey"],
+            [blog.name for blog in blog_dao.retrieve_blogs("jorney", fuzzy=True)],
+        )
+        self.assertEqual(
+            ["Cookies and Cakes", "Cooking"],
+            [blog.name for blog in blog_dao.retrieve_blogs("cookies", fuzzy=True)],
+        )
+
+        # the index follows updates and deletes
+        blog_dao.update_blog(3, Blog(30, "Baking", "url", "email"))
+        blog_dao.delete_blog(1)
+        self.assertEqual(
+            ["Cookies and Cakes"], [blog.name for blog in blog_dao.retrieve_blogs("cookies", fuzzy=True)]
+        )
+
+        queries = ["", "c", "jorney", "shrot jurney", "long trp", "bakin", "zzz"]
+        indexed = {query: blog_dao.retrieve_blogs(query, fuzzy=True) for query in queries}
+        self.configuration.__class__.trigram_index = False
+        for query in queries:
+            self.assertEqual(blog_dao.retrieve_blogs(query, fuzzy=True), indexed[query], query)
+
+    def test_prefix_completion(self):
+        blog_dao = BlogDAOJSON()
+        names = ["Short Journey", "Long Journey", "Long Trip", "short trip", "Boring Blog"]
+        for i, name in enumerate(names * 3):
+            blog_dao.create_blog(Blog(i, name, f"url {i}", f"email {i}"))
+        self.assertEqual(["Short Journey", "short trip"], blog_dao.complete_blog_names("SH", 5))
+        self.assertEqual(["Long Journey"], blog_dao.complete_blog_names("long", 1))
+
+        # the index follows updates and deletes
+        blog_dao.update_blog(2, Blog(200, "Longest Road", "url", "email"))
+        blog_dao.update_blog(7, Blog(7, "Lonely Road", "url", "email"))
+        for i in (1, 6, 11):
+            blog_dao.delete_blog(i)
+        self.assertEqual(
+            ["Lonely Road", "Long Trip", "Longest Road"], blog_dao.complete_blog_names("lon", 5)
+        )
+
+        queries = ["", "b", "lo", "long ", "Short t", "x"]
+        indexed = {query: blog_dao.complete_blog_names(query, 3) for query in queries}
+        self.configuration.__class__.prefix_index = False
+        for query in queries:
+            self.assertEqual(blog_dao.complete_blog_names(query, 3), indexed[query], query)
+
+    def test_find_by_url_and_email(self):
+        blog_dao = BlogDAOJSON()
+        blog_dao.create_blog(Blog(1, "first", "https://www.Example.com/", "Me@Example.com"))
+        blog_dao.create_blog(Blog(2, "second", "example.com", "other@example.com"))
+        blog_dao.create_blog(Blog(3, "third", "http://blog.example.com", "me@example.com"))
+
+        # the first created blog wins when several share a URL or email
+        self.assertEqual(1, blog_dao.find_blog_by_url("EXAMPLE.com").id)
+        self.assertEqual(3, blog_dao.find_blog_by_url("https://blog.example.com/").id)
+        self.assertEqual(1, blog_dao.find_blog_by_email(" me@example.COM").id)
+        self.assertIsNone(blog_dao.find_blog_by_url("example.org"))
+        self.assertIsNone(blog_dao.find_blog_by_email("nobody@example.com"))
+
+        # the indexes follow updates and deletes
+        blog_dao.update_blog(1, Blog(10, "first", "example.org", "me@example.org"))
+        self.assertEqual(2, blog_dao.find_blog_by_url("example.com").id)
+        self.assertEqual(10, blog_dao.find_blog_by_url("www.example.org").id)
+        self.assertEqual(3, blog_dao.find_blog_by_email("me@example.com").id)
+        blog_dao.delete_blog(3)
+        self.assertIsNone(blog_dao.find_blog_by_email("me@example.com"))
+        self.assertIsNone(blog_dao.find_blog_by_url("blog.example.com"))
+
+    def test_unique_url_and_email(self):
+        blog_dao = BlogDAOJSON()
+        blog_dao.create_blog(Blog(1, "first", "example.com", "me@example.com"))
+        # duplicates are allowed unless asked otherwise
+        blog_dao.create_blog(Blog(2, "second", "example.com", "me@example.com"))
+        blog_dao.delete_blog(2)
+
+        self.configuration.__class__.unique_blog_urls = True
+        self.configuration.__class__.unique_blog_emails = True
+        with self.assertRaises(IllegalOperationException):
+            blog_dao.create_blog(Blog(2, "second", "https://Example.com/", "you@example.com"))
+        with self.assertRaises(IllegalOperationException):
+            blog_dao.create_blog(Blog(2, "second", "example.org", "ME@example.com"))
+        self.assertIsNone(blog_dao.search_blog(2))
+
+        blog_dao.create_blog(Blog(2, "second", "example.org", "you@example.com"))
+        with self.assertRaises(IllegalOperationException):
+            blog_dao.update_blog(2, Blog(2, "second", "www.example.com", "you@example.com"))
+        self.assertEqual("example.org", blog_dao.search_blog(2).url)
+        # a blog keeping its own URL and email is no conflict
+        self.assertTrue(blog_dao.update_blog(2, Blog(3, "renamed", "example.org", "you@example.com")))
+
+    def test_persisted_indexes(self):
+        index_file = os.path.join(self.data_dir.name, "blogs.idx")
+        blog_dao = BlogDAOJSON()
+        for i in range(1, 6):
+            blog_dao.create_blog(Blog(i, f"blog {i}", f"url {i}", f"email {i}"))
+        blog_dao.compact()
+        self.assertFalse(os.path.exists(index_file), "nothing saved before an index is built")
+
+        self.assertEqual(["blog 1"], blog_dao.complete_blog_names("blog", 1))
+        self.assertTrue(os.path.exists(index_file))
+
+        # loaded at startup, then brought up to date with the journal
+        blog_dao.update_blog(2, Blog(2, "renamed", "url 2", "email 2"))
+        blog_dao.create_blog(Blog(6, "blog 6", "url 6", "email 6"))
+        reloaded = BlogDAOJSON()
+        self.assertIsNotNone(reloaded.prefix_index)
+        self.assertEqual(
+            ["blog 1", "blog 3", "blog 4", "blog 5", "blog 6"], reloaded.complete_blog_names("blog", 9)
+        )
+
+        # rebuilt once blogs.json changed since the index was saved
+        reloaded.compact()
+        os.replace(index_file, index_file + ".old")
+        reloaded.delete_blog(1)
+        reloaded.compact()
+        os.replace(index_file + ".old", index_file)
+        reloaded = BlogDAOJSON()
+        self.assertIsNone(reloaded.prefix_index)
+        self.assertEqual(["blog 3"], reloaded.complete_blog_names("blog", 1))
+
+    def test_pagination(self):
+        blog_dao = BlogDAOJSON()
+        for i in (5, 3, 9, 1, 7, 2):
+            blog_dao.create_blog(Blog(i, f"blog {i}", f"url {i}", f"email {i}"))
+
+        blogs, cursor = blog_dao.page_blogs(2)
+        self.assertEqual([1, 2], [blog.id for blog in blogs])
+        blog_dao.update_blog(9, Blog(4, "blog 4", "url 4", "email 4"))
+        blog_dao.delete_blog(3)
+        blogs, cursor = blog_dao.page_blogs(2, cursor)
+        self.assertEqual([4, 5], [blog.id for blog in blogs])
+        blogs, cursor = blog_dao.page_blogs(2, cursor)
+        self.assertEqual([7], [blog.id for blog in blogs])
+        self.assertIsNone(cursor)
+
+        with self.assertRaises(IllegalOperationException):
+            blog_dao.page_blogs(2, "bm90IGEgY3Vyc29y")
+
+    def test_iter_blogs(self):
+        self.configuration.__class__.database_file = os.path.join(
+            self.data_dir.name, "blogging.db"
+        )
+        for blog_dao in (BlogDAOJSON(), BlogDAOSQLite()):
+            for i in (5, 3, 9, 1):
+                blog_dao.create_blog(Blog(i, f"Blog {i}", f"url {i}", f"email {i}"))
+            blog_dao.create_blog(Blog(2, "Notes", "url 2", "email 2"))
+
+            blogs = blog_dao.iter_blogs()
+            self.assertEqual(5, next(blogs).id)
+            self.assertEqual([3, 9, 1, 2], [blog.id for blog in blogs])
+            self.assertEqual(
+                [1, 9, 3, 5], [blog.id for blog in blog_dao.iter_blogs("blog", newest_first=True)]
+            )
+            self.assertEqual(
+                [blog.id for blog in blog_dao.retrieve_blogs("NOTES")],
+                [blog.id for blog in blog_dao.iter_blogs("NOTES")],
+            )
+        close_connections()
+
+    def test_query_cache(self):
+        blog_dao = BlogDAOJSON()
+        for i in range(1, 4):
+            blog_dao.create_blog(Blog(i, f"blog {i}", f"url {i}", f"email {i}"))
+        self.assertEqual([2], [blog.id for blog in blog_dao.retrieve_blogs("Blog 2")])
+
+        hits = query_cache.stats()["hits"]
+        self.assertEqual([2], [blog.id for blog in blog_dao.retrieve_blogs("blog 2")])
+        self.assertEqual(hits + 1, query_cache.stats()["hits"])
+
+        blog_dao.update_blog(2, Blog(20, "renamed", "url 20", "email 20"))
+        self.assertEqual([], blog_dao.retrieve_blogs("blog 2"))
+        blog_dao.create_blog(Blog(4, "blog 2 again", "url 4", "email 4"))
+        self.assertEqual([4], [blog.id for blog in blog_dao.retrieve_blogs("blog 2")])
+        blog_dao.delete_blog(4)
+        self.assertEqual([], blog_dao.retrieve_blogs("blog 2"))
+        self.assertEqual(hits + 1, query_cache.stats()["hits"])
+
+        # a new DAO over the same blogs never sees the cached results of another
+        other_dao = BlogDAOJSON()
+        other_dao.delete_blog(1)
+        self.assertEqual([3], [blog.id for blog in other_dao.retrieve_blogs("blog")])
+        self.assertEqual([1, 3], [blog.id for blog in blog_dao.retrieve_blogs("blog")])
+
+    def test_posts_loaded_lazily(self):
+        blog_dao = BlogDAOJSON()
+        blog = blog_dao.create_blog(Blog(1, "blog 1", "url 1", "email 1"))
+        for i in range(1, 4):
+            blog.create_post(f"title {i}", f"text {i}")
+        blog_dao.compact()
+
+        reloaded = BlogDAOJSON().search_blog(1)
+        self.assertIsNone(reloaded._post_dao, "posts are not loaded at startup")
+        self.assertEqual(3, reloaded.counter, "counter is kept in the blog metadata")
+
+        self.assertEqual(3, len(reloaded.list_posts()))
+        self.assertIsNotNone(reloaded._post_dao)
+
+    def test_rekey_before_posts_load(self):
+        blog = BlogDAOJSON().create_blog(Blog(1, "blog 1", "url 1", "email 1"))
+        blog.create_post("title 1", "text 1")
+        blog.create_post("title 2", "text 2")
+
+        blog_dao = BlogDAOJSON()
+        self.assertIsNone(blog_dao.search_blog(1)._post_dao, "posts not loaded yet")
+        blog_dao.update_blog(1, Blog(2, "blog 2", "url 2", "email 2"))
+        self.assertEqual([2, 1], [post.code for post in blog_dao.search_blog(2).list_posts()])
+
+    def test_write_behind(self):
+        self.configuration.__class__.write_behind = True
+        self.configuration.__class__.write_behind_interval_ms = 60 * 1000
+        blog_dao = BlogDAOJSON()
+        for i in range(1, 4):
+            blog_dao.create_blog(Blog(i, f"blog {i}", f"url {i}", f"email {i}"))
+        self.assertFalse(os.path.exists(Configuration.blogs_journal_file), "nothing written yet")
+
+        write_behind_flusher.drain()
+        with open(Configuration.blogs_journal_file) as file:
+            self.assertEqual(3, len(file.readlines()), "one line per operation")
+        self.assertEqual(blog_dao.list_blogs(), BlogDAOJSON().list_blogs())
+
+    def test_write_behind_failed_flush(self):
+        self.configuration.__class__.write_behind = True
+        self.configuration.__class__.write_behind_interval_ms = 60 * 1000
+        blog_dao = BlogDAOJSON()
+        # the journal cannot be appended to while a directory takes its place
+        os.mkdir(Configuration.blogs_journal_file)
+        blog_dao.create_blog(Blog(1, "blog 1", "url 1", "email 1"))
+        write_behind_flusher.drain()
+        self.assertEqual(1, len(blog_dao.pending_lines), "kept for the next flush")
+
+        os.rmdir(Configuration.blogs_journal_file)
+        write_behind_flusher.drain()
+        self.assertEqual(blog_dao.list_blogs(), BlogDAOJSON().list_blogs())
+
+    def test_journal_torn_line(self):
+        blog_dao = BlogDAOJSON()
+        blog_dao.create_blog(Blog(1, "blog 1", "url 1", "email 1"))
+        with open(Configuration.blogs_journal_file, "a") as file:
+            file.write('{"op": "create", "blo')
+
+        blog_dao = BlogDAOJSON()
+        self.assertEqual([Blog(1, "blog 1", "url 1", "email 1")], blog_dao.list_blogs())
+
+        # the torn line is cut off, so the blogs journaled after it survive a reload
+        blog_dao.create_blog(Blog(2, "blog 2", "url 2", "email 2"))
+        self.assertEqual([1, 2], [blog.id for blog in BlogDAOJSON().list_blogs()])
+
+
+class BlogDAOSQLiteTest(DataDirTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.configuration.__class__.storage_backend = "sqlite"
+
+    def test_unique_urls_and_emails(self):
+        blog_dao = BlogDAOSQLite()
+        blog_dao.create_blog(Blog(1, "Travel", "https://www.travel.com/", "me@travel.com"))
+        # not enforced unless the Configuration asks for it
+        blog_dao.create_blog(Blog(2, "Copy", "travel.com", "other@travel.com"))
+        blog_dao.delete_blog(2)
+
+        self.configuration.__class__.unique_blog_urls = True
+        self.configuration.__class__.unique_blog_emails = True
+        with self.assertRaises(IllegalOperationException):
+            blog_dao.create_blog(Blog(2, "Copy", "HTTP://travel.com", "other@travel.com"))
+        with self.assertRaises(IllegalOperationException):
+            blog_dao.create_blog(Blog(2, "Copy", "cooking.org", " ME@Travel.com"))
+        # a blog keeps its own URL and email
+        blog_dao.update_blog(1, Blog(1, "Travel notes", "travel.com", "ME@travel.com"))
+
+        self.assertEqual(1, blog_dao.find_blog_by_url("http://www.TRAVEL.com").id)
+        self.assertEqual(1, blog_dao.find_blog_by_email("me@travel.COM").id)
+        self.assertIsNone(blog_dao.find_blog_by_url("cooking.org"))
+
+    def test_rekey_moves_posts(self):
+        blog_dao = BlogDAOSQLite()
+        blog = blog_dao.create_blog(Blog(1, "blog 1", "url 1", "email 1"))
+        blog_dao.create_blog(Blog(3, "blog 3", "url 3", "email 3"))
+        PostDAOSQLite(blog).create_post(Post(0, "title 1", "text 1"))
+        PostDAOSQLite(blog).create_post(Post(0, "title 2", "text 2"))
+
+        with self.assertRaises(IllegalOperationException):
+            blog_dao.update_blog(1, Blog(3, "blog 3", "url 3", "email 3"))
+        blog_dao.update_blog(1, Blog(2, "blog 2", "url 2", "email 2"))
+        self.assertIsNone(blog_dao.search_blog(1))
+        self.assertEqual(2, blog_dao.search_blog(2).counter, "the post counter moves along")
+        self.assertEqual([], PostDAOSQLite(Blog(1, "", "", "")).list_posts())
+        self.assertEqual([2, 1], [post.code for post in blog_dao.search_blog(2).list_posts()])
+
+        blog_dao.delete_blog(2)
+        self.assertEqual([], PostDAOSQLite(Blog(2, "", "", "")).list_posts())
+
+    def test_indexes_need_no_functions(self):
+        blog_dao = BlogDAOSQLite()
+        blog_dao.create_blog(Blog(1, "Travel", "https://www.travel.com/", "Me@Travel.com"))
+        self.assertIn("USING INDEX blogs_norm_url", blog_dao.explain_blogs("url:travel.com"))
+        self.assertIn("USING INDEX blogs_norm_email", blog_dao.explain_blogs("email:me@travel.com"))
+
+        # another sqlite client, without the functions of this process, can write and check the file
+        with sqlite3.connect(Configuration.database_file) as connection:
+            connection.execute("UPDATE blogs SET url = 'travel.org' WHERE id = 1")
+            connection.execute("REINDEX")
+            self.assertEqual("ok", connection.execute("PRAGMA integrity_check").fetchone()[0])
+        connection.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -33,6 +33,11 @@ class BlogTest(TestCase):
 
         self.assertEqual(expected_blog, self.blog, "Blog's are equal")
 
+    def test_folded_name(self):
+        self.assertEqual("name", self.blog.folded_name)
+        self.blog.set_values(1, "Größe BLOG", "url", "email")
+        self.assertEqual("grösse blog", self.blog.folded_name)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -613,6 +613,29 @@ class ControllerTest(TestCase):
 		self.assertEqual(expected_post_4, posts_list[0], "post 4 is the first in the list of posts")
 		self.assertEqual(expected_post_2, posts_list[1], "post 2 is the second in the list of posts")
 
+	def test_iter_posts_and_blogs(self):
+		# cannot do operation without logging in, checked before the first post is read
+		with self.assertRaises(IllegalAccessException, msg="cannot stream posts without logging in"):
+			self.controller.iter_posts()
+		with self.assertRaises(IllegalAccessException, msg="cannot stream blogs without logging in"):
+			self.controller.iter_blogs()
+
+		# login
+		self.assertTrue(self.controller.login("user", "123456"), "login correctly")
+		with self.assertRaises(NoCurrentBlogException, msg="cannot stream posts without a valid current blog"):
+			self.controller.iter_posts()
+
+		self.controller.create_blog(1111114444, "Short Journey", "short_journey", "short.journey@gmail.com")
+		self.controller.create_blog(1111114445, "Long Trip", "long_trip", "long.trip@gmail.com")
+		self.assertEqual([1111114445], [blog.id for blog in self.controller.iter_blogs("trip")])
+
+		self.controller.set_current_blog(1111114444)
+		self.controller.create_post("Starting my journey", "Once upon a time\nThere was a kid...")
+		self.controller.create_post("Second step", "Before one could think,\nA storm stroke.")
+		self.controller.create_post("Continuing my journey", "Along the way...\nThere were challenges.")
+		self.assertEqual([3, 1], [post.code for post in self.controller.iter_posts("journey", newest_first=True)])
+		self.assertEqual(self.controller.list_posts(), list(self.controller.iter_posts(newest_first=True)))
+
 
 if __name__ == '__main__':
 	unittest.main()
\ No newline at end of file
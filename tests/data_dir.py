@@ -0,0 +1,36 @@
+import os
+import tempfile
+from unittest import TestCase
+from blogging.configuration import Configuration
+from blogging.dao.sqlite_database import close_connections
+
+
+class DataDirTestCase(TestCase):
+    """
+    Persists into a throwaway data directory, holding blogs.json, its journal,
+    the post records and the sqlite database, and restores every Configuration
+    value the test changed once it ends
+    """
+
+    def setUp(self):
+        self.configuration = Configuration()
+        self.saved_configuration = dict(vars(Configuration))
+        self.data_dir = tempfile.TemporaryDirectory()
+        self.configuration.__class__.autosave = True
+        self.configuration.__class__.blogs_file = os.path.join(
+            self.data_dir.name, "blogs.json"
+        )
+        self.configuration.__class__.blogs_journal_file = os.path.join(
+            self.data_dir.name, "blogs.log"
+        )
+        self.configuration.__class__.records_path = self.data_dir.name
+        self.configuration.__class__.database_file = os.path.join(
+            self.data_dir.name, "blogging.db"
+        )
+
+    def tearDown(self):
+        close_connections()
+        for name, value in self.saved_configuration.items():
+            if not name.startswith("__"):
+                setattr(Configuration, name, value)
+        self.data_dir.cleanup()
@@ -0,0 +1,88 @@
+import os
+import unittest
+from blogging.blog import Blog
+from blogging.dao import global_search
+from blogging.dao.blog_dao import BlogDAOJSON
+from blogging.dao.global_search import search_all_posts, shutdown_executor
+from blogging.dao.query_cache import query_cache
+from tests.data_dir import DataDirTestCase
+
+
+class GlobalSearchTest(DataDirTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.configuration.__class__.search_processes = 2
+
+        self.blog_dao = BlogDAOJSON()
+        for i in range(1, 8):
+            blog = self.blog_dao.create_blog(Blog(i, f"blog {i}", f"url {i}", f"email {i}"))
+            for j in range(1, 5):
+                blog.create_post(f"Trip {j}", f"day {i * j} of the journey")
+            blog.delete_post(2)
+        self.blog_dao.search_blog(3).update_post(1, "Home", "no travel")
+
+    def test_fan_out_matches_in_process(self):
+        blogs = self.blog_dao.list_blogs()
+        for query in ["trip", "journey", "DAY 1", "nothing"]:
+            self.configuration.__class__.search_shard_size = 100
+            in_process = search_all_posts(blogs, query)
+            self.configuration.__class__.search_shard_size = 2
+            fanned_out = search_all_posts(blogs, query)
+            self.assertEqual(
+                [(blog_id, post.code) for blog_id, post in in_process],
+                [(blog_id, post.code) for blog_id, post in fanned_out],
+                query,
+            )
+            self.assertEqual([post for _, post in in_process], [post for _, post in fanned_out])
+
+        trips = [(blog_id, post.code) for blog_id, post in search_all_posts(blogs, "trip")]
+        self.assertEqual(20, len(trips))
+        self.assertNotIn((3, 1), trips, "updated posts are searched as saved")
+
+    def test_limit(self):
+        self.configuration.__class__.search_shard_size = 2
+        results = search_all_posts(self.blog_dao.list_blogs(), "journey", 5)
+        self.assertEqual(
+            [(1, 1), (1, 3), (1, 4), (2, 1), (2, 3)],
+            [(blog_id, post.code) for blog_id, post in results],
+        )
+
+        # the shards past the limit are never searched, whatever their size
+        self.configuration.__class__.search_shard_size = 1
+        results = search_all_posts(self.blog_dao.list_blogs(), "journey", 4)
+        self.assertEqual(
+            [(1, 1), (1, 3), (1, 4), (2, 1)], [(blog_id, post.code) for blog_id, post in results]
+        )
+
+    def test_in_process_skips_query_cache(self):
+        self.configuration.__class__.search_shard_size = 100
+        query_cache.clear()
+        self.assertEqual(20, len(search_all_posts(self.blog_dao.list_blogs(), "trip")))
+        self.assertEqual(0, query_cache.stats()["size"], "no entry per blog")
+
+    def test_executor_shutdown(self):
+        self.configuration.__class__.search_shard_size = 2
+        blogs = self.blog_dao.list_blogs()
+        self.assertEqual(20, len(search_all_posts(blogs, "trip")))
+        self.assertIsNotNone(global_search.executor)
+
+        shutdown_executor()
+        self.assertIsNone(global_search.executor)
+        # the next search starts new workers
+        self.assertEqual(20, len(search_all_posts(blogs, "trip")))
+        self.assertIsNotNone(global_search.executor)
+
+    @unittest.skipUnless(hasattr(os, "fork"), "needs fork")
+    def test_forked_child_has_no_executor(self):
+        self.configuration.__class__.search_shard_size = 2
+        search_all_posts(self.blog_dao.list_blogs(), "trip")
+        pid = os.fork()
+        if pid == 0:
+            os._exit(0 if global_search.executor is None else 1)
+        _, status = os.waitpid(pid, 0)
+        self.assertEqual(0, os.waitstatus_to_exitcode(status), "the pool is not inherited")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+import os
+import unittest
+from blogging.helper import (
+    bytes_append_file,
+    bytes_update_file,
+    get_sync_counters,
+)
+from tests.data_dir import DataDirTestCase
+
+
+class DurabilityTest(DataDirTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.dest_file = os.path.join(self.data_dir.name, "data.dat")
+
+    def write_with(self, mode):
+        self.configuration.__class__.durability = mode
+        before = get_sync_counters()[mode]
+        bytes_update_file(b"first", self.dest_file)
+        bytes_update_file(b"second", self.dest_file)
+        bytes_append_file(b" more", self.dest_file)
+        after = get_sync_counters()[mode]
+
+        with open(self.dest_file, "rb") as file:
+            self.assertEqual(b"second more", file.read())
+        self.assertEqual(["data.dat"], os.listdir(self.data_dir.name), "no temporary files left")
+        return {name: after[name] - before[name] for name in after}
+
+    def test_none(self):
+        self.assertEqual({"writes": 3, "renames": 0, "fsyncs": 0}, self.write_with("none"))
+
+    def test_atomic(self):
+        self.assertEqual({"writes": 3, "renames": 2, "fsyncs": 0}, self.write_with("atomic"))
+
+    def test_fsync(self):
+        issued = self.write_with("fsync")
+        self.assertEqual(2, issued["renames"])
+        # every file write is synced, directory syncs depend on the platform
+        self.assertGreaterEqual(issued["fsyncs"], 3)
+
+    def test_unknown_mode(self):
+        self.configuration.__class__.durability = "sometimes"
+        with self.assertRaises(ValueError):
+            bytes_update_file(b"data", self.dest_file)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,10 +1,12 @@
 import os
+import tempfile
 from unittest import TestCase
 from unittest import main
 from blogging.controller import Controller
 from blogging.blog import Blog
 from blogging.post import Post
 from blogging.configuration import Configuration
+from blogging.dao.sqlite_database import close_connections
 from blogging.exception.invalid_login_exception import InvalidLoginException
 from blogging.exception.duplicate_login_exception import DuplicateLoginException
 from blogging.exception.invalid_logout_exception import InvalidLogoutException
@@ -1339,5 +1341,25 @@ class IntegrationTest(TestCase):
         )
 
 
+
+class SQLiteIntegrationTest(IntegrationTest):
+
+    def setUp(self):
+        # run every integration test against a fresh sqlite database
+        self.database_dir = tempfile.TemporaryDirectory()
+        self.configuration = Configuration()
+        self.configuration.__class__.storage_backend = "sqlite"
+        self.configuration.__class__.database_file = os.path.join(
+            self.database_dir.name, "blogging.db"
+        )
+        super().setUp()
+
+    def tearDown(self):
+        close_connections()
+        self.configuration.__class__.storage_backend = "json"
+        self.configuration.__class__.database_file = "blogging/blogging.db"
+        self.database_dir.cleanup()
+
+
 if __name__ == "__main__":
     main()
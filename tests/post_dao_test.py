@@ -0,0 +1,560 @@
+import os
+import random
+import re
+import unittest
+from blogging.blog import Blog
+from blogging.dao.blog_dao import BlogDAOSQLite
+from blogging.dao.post_dao import PostDAOSQLite
+from blogging.dao.query_cache import query_cache
+from blogging.dao.write_behind import write_behind_flusher
+from blogging.exception.illegal_operation_exception import IllegalOperationException
+from blogging.post import Post
+from tests.data_dir import DataDirTestCase
+
+
+class PostDAOPickleTest(DataDirTestCase):
+
+    def reload_blog(self):
+        return Blog(1, "Name", "URL", "email")
+
+    def test_journal_replay(self):
+        blog = self.reload_blog()
+        for i in range(1, 6):
+            blog.create_post(f"title {i}", f"text {i}")
+        blog.update_post(2, "new title", "new text")
+        blog.delete_post(4)
+
+        journal_file = os.path.join(self.data_dir.name, "1.log")
+        self.assertTrue(os.path.exists(journal_file), "mutations are journaled")
+
+        reloaded = self.reload_blog()
+        self.assertEqual(4, len(reloaded.list_posts()))
+        self.assertEqual(blog.search_post(2), reloaded.search_post(2))
+        self.assertIsNone(reloaded.search_post(4))
+
+    def test_journal_compaction(self):
+        self.configuration.__class__.journal_compaction_threshold = 3
+        blog = self.reload_blog()
+        for i in range(1, 4):
+            blog.create_post(f"title {i}", f"text {i}")
+
+        journal_file = os.path.join(self.data_dir.name, "1.log")
+        self.assertFalse(os.path.exists(journal_file), "journal folded into snapshot")
+
+        blog.create_post("title 4", "text 4")
+        reloaded = self.reload_blog()
+        self.assertEqual(
+            [Post(i, f"title {i}", f"text {i}") for i in range(4, 0, -1)],
+            reloaded.list_posts(),
+        )
+
+    def test_codes_never_reused(self):
+        blog = self.reload_blog()
+        for i in range(1, 4):
+            blog.create_post(f"title {i}", f"text {i}")
+        blog.delete_post(3)
+        self.assertEqual(4, blog.create_post("title 4", "text 4").code)
+
+        blog.delete_post(4)
+        blog.postPickle.compact()
+        reloaded = self.reload_blog()
+        self.assertEqual([2, 1], [post.code for post in reloaded.list_posts()])
+        self.assertEqual(4, reloaded.counter, "sequence survives the snapshot")
+        self.assertEqual(5, reloaded.create_post("title 5", "text 5").code)
+        self.assertEqual([5, 2, 1], [post.code for post in reloaded.list_posts()])
+
+    def test_whole_word_search(self):
+        # compare the search engines themselves, not the cached results
+        self.configuration.__class__.query_cache_size = 0
+        blog = self.reload_blog()
+        blog.create_post("Starting my journey", "Once upon a time")
+        blog.create_post("Second step", "Before one could think, a storm")
+        blog.create_post("Journeys", "Along the way the journey went on")
+        self.assertEqual([1, 3], [post.code for post in blog.retrieve_posts("JOURNEY", whole_words=True)])
+
+        # the index follows updates and deletes
+        blog.update_post(1, "Starting my trip", "Once upon a time")
+        blog.create_post("Fourth step", "the journey again")
+        blog.delete_post(3)
+        self.assertEqual([4], [post.code for post in blog.retrieve_posts("journey", whole_words=True)])
+        self.assertEqual([2, 4], [post.code for post in blog.retrieve_posts("step", whole_words=True)])
+        self.assertEqual([4], [post.code for post in blog.retrieve_posts("again step", whole_words=True)])
+        self.assertEqual([], blog.retrieve_posts("jour", whole_words=True))
+
+        # same answers without the index
+        self.configuration.__class__.full_text_index = False
+        self.assertEqual([2, 4], [post.code for post in blog.retrieve_posts("step", whole_words=True)])
+        self.assertEqual([4], [post.code for post in blog.retrieve_posts("again step", whole_words=True)])
+
+    def test_substring_search_matches_scan(self):
+        # compare the search engines themselves, not the cached results
+        self.configuration.__class__.query_cache_size = 0
+        words = ["Journey", "storm", "trip", "once", "upon", "time", "Ärger", "step"]
+        generator = random.Random(7)
+        blog = self.reload_blog()
+        for i in range(200):
+            blog.create_post(
+                " ".join(generator.choices(words, k=2)), " ".join(generator.choices(words, k=6))
+            )
+        for code in range(1, 200, 7):
+            blog.update_post(code, "updated " + generator.choice(words), "")
+        for code in range(3, 200, 11):
+            blog.delete_post(code)
+
+        blog.create_post("Straße", "")
+
+        queries = ["", "e", "st", "our", "JOURNEY", "ey st", "rger", "upon tim", "zzz", "updated s"]
+        indexed = {query: blog.retrieve_posts(query) for query in queries}
+        self.configuration.__class__.trigram_index = False
+        for query in queries:
+            self.assertEqual(blog.retrieve_posts(query), indexed[query], query)
+
+    def test_phrase_search_matches_scan(self):
+        # compare the search engines themselves, not the cached results
+        self.configuration.__class__.query_cache_size = 0
+        self.configuration.__class__.trigram_index = False
+        words = ["Journey", "storm", "trip", "once", "upon", "time", "Straße", "a", "ab"]
+        separators = [" ", "  ", ", ", "-"]
+        generator = random.Random(11)
+        blog = self.reload_blog()
+
+        def text(count):
+            return "".join(
+                generator.choice(words) + generator.choice(separators) for _ in range(count)
+            ).strip()
+
+        queries = ["ey st", "upon time", "STRASSE trip", "e, on", "a ab", "a  ab", "-trip a",
+                   "once upon time", "p o", "rney sto", "zzz yyy"]
+        for i in range(150):
+            blog.create_post(text(3), text(8))
+
+        # the index is built on the first search and updated post by post after it
+        for round in range(3):
+            indexed = {query: blog.retrieve_posts(query) for query in queries}
+            self.configuration.__class__.phrase_index = False
+            for query in queries:
+                self.assertEqual(blog.retrieve_posts(query), indexed[query], query)
+            self.configuration.__class__.phrase_index = True
+
+            for code in generator.sample(sorted(blog.postPickle.posts_by_code), 30):
+                blog.update_post(code, text(3), text(8))
+            for code in generator.sample(sorted(blog.postPickle.posts_by_code), 10):
+                blog.delete_post(code)
+            blog.create_post("once upon", "a time")
+
+        phrase_index = blog.postPickle.phrase_index
+        # only the posts with the words in a row are checked
+        candidates = phrase_index.candidates("upon time")
+        self.assertLess(len(candidates), len(blog.postPickle.posts_by_code) // 4)
+        # a phrase spanning the title and the text is not found in either
+        self.assertNotIn(blog.postPickle.blog.counter, phrase_index.candidates("upon a"))
+
+    def test_ranked_search(self):
+        blog = self.reload_blog()
+        blog.create_post("Packing list", "what to bring on a journey")
+        blog.create_post("Journey", "the first day")
+        blog.create_post("Weather", "rain")
+        blog.create_post("Journey journey", "a journey about the journey")
+        self.assertEqual([4, 2, 1], [post.code for post in blog.rank_posts("journey")])
+        self.assertEqual([4], [post.code for post in blog.rank_posts("JOURNEY", 1)])
+        self.assertEqual([3, 4], [post.code for post in blog.rank_posts("rain journey", 2)])
+        self.assertEqual([], blog.rank_posts("nothing"))
+        self.assertEqual([], blog.rank_posts("journey", 0))
+
+        # the maintained index ranks like one built from scratch
+        words = ["journey", "storm", "trip", "once", "upon", "time", "step"]
+        generator = random.Random(11)
+        for i in range(100):
+            blog.create_post(
+                " ".join(generator.choices(words, k=2)), " ".join(generator.choices(words, k=8))
+            )
+        for code in range(1, 100, 5):
+            blog.update_post(code, generator.choice(words), "")
+        for code in range(2, 100, 9):
+            blog.delete_post(code)
+        ranked = [post.code for post in blog.rank_posts("storm trip", 15)]
+        self.configuration.__class__.full_text_index = False
+        self.assertEqual(ranked, [post.code for post in blog.rank_posts("storm trip", 15)])
+
+    def test_posts_between(self):
+        blog = self.reload_blog()
+        for day in range(1, 11):
+            post = blog.create_post(f"title {day}", "text")
+            post.creation_time = (2024, 1, day, 12, 0)
+            post.update_time = (2024, 2, 11 - day, 12, 0)
+
+        def codes(start, end, field="update_time"):
+            return [post.code for post in blog.posts_between(start, end, field)]
+
+        self.assertEqual([3, 4, 5], codes((2024, 1, 3, 12, 0), (2024, 1, 6, 0, 0), "creation_time"))
+        self.assertEqual([10, 9], codes(None, (2024, 2, 3, 0, 0)))
+        self.assertEqual([2, 1], codes((2024, 2, 9, 0, 0), None))
+
+        # the index follows creates, updates and deletes
+        blog.update_post(9, "edited", "text")
+        blog.delete_post(1)
+        new_post = blog.create_post("new", "text")
+        self.assertEqual([2, 9, 11], codes((2024, 2, 9, 0, 0), None))
+        self.assertEqual([10], codes(None, (2024, 2, 3, 0, 0)))
+        self.assertEqual([new_post.code], codes(new_post.creation_time, None, "creation_time"))
+
+        with self.assertRaises(ValueError):
+            blog.posts_between(None, None, "title")
+
+    def test_pagination(self):
+        blog = self.reload_blog()
+        for i in range(1, 11):
+            blog.create_post(f"title {i}", f"text {i}")
+
+        posts, cursor = blog.page_posts(4)
+        self.assertEqual([10, 9, 8, 7], [post.code for post in posts])
+        # the cursor keeps its place even when the page's last post is deleted
+        blog.delete_post(7)
+        blog.delete_post(5)
+        blog.create_post("title 11", "text 11")
+        posts, cursor = blog.page_posts(4, cursor)
+        self.assertEqual([6, 4, 3, 2], [post.code for post in posts])
+        posts, cursor = blog.page_posts(4, cursor)
+        self.assertEqual([1], [post.code for post in posts])
+        self.assertIsNone(cursor)
+
+        posts, cursor = blog.page_posts(20)
+        self.assertEqual(blog.list_posts(), posts)
+        self.assertIsNone(cursor)
+
+        with self.assertRaises(IllegalOperationException):
+            blog.page_posts(4, "not a cursor")
+        with self.assertRaises(IllegalOperationException):
+            blog.page_posts(0)
+
+    def test_iter_posts(self):
+        self.configuration.__class__.query_cache_size = 0
+        blog = self.reload_blog()
+        for i in range(1, 601):
+            blog.create_post(f"title {i}", "a long journey" if i % 3 == 0 else "a short trip")
+
+        # stopping early only reads a batch
+        posts = blog.iter_posts(newest_first=True)
+        self.assertEqual([600, 599, 598], [next(posts).code for _ in range(3)])
+
+        # every batch resumes after the last post read, whatever changed in between
+        posts = blog.iter_posts("JOURNEY")
+        self.assertEqual(3, next(posts).code)
+        blog.delete_post(600)
+        blog.update_post(301, "title 301", "journey")
+        blog.create_post("title 601", "another journey")
+        streamed = [3] + [post.code for post in posts]
+        self.assertEqual([post.code for post in blog.retrieve_posts("journey")], streamed)
+
+        self.assertEqual(
+            [post.code for post in blog.retrieve_posts("journey", whole_words=True)][::-1],
+            [post.code for post in blog.iter_posts("journey", whole_words=True, newest_first=True)],
+        )
+        self.assertEqual(600, len(list(blog.iter_posts())))
+
+    def test_iter_posts_builds_no_index(self):
+        index_file = os.path.join(self.data_dir.name, "1.idx")
+        blog = self.reload_blog()
+        for i in range(1, 301):
+            blog.create_post(f"title {i}", f"text {i}")
+        blog.postPickle.compact()
+
+        # a listing walks the loaded posts in code order, building and saving no index
+        blog = self.reload_blog()
+        self.assertEqual(list(range(300, 0, -1)), [post.code for post in blog.iter_posts(newest_first=True)])
+        self.assertEqual(list(range(1, 301)), [post.code for post in blog.iter_posts()])
+        self.assertIsNone(blog.postPickle.code_index)
+        self.assertFalse(os.path.exists(index_file))
+
+    def test_query_cache(self):
+        query_cache.clear()
+        blog = self.reload_blog()
+        blog.create_post("Starting my journey", "Once upon a time")
+        blog.create_post("Second step", "Before one could think, a storm")
+
+        self.assertEqual([1], [post.code for post in blog.retrieve_posts("journey")])
+        self.assertEqual([1], [post.code for post in blog.retrieve_posts("JOURNEY")])
+        self.assertEqual({"hits": 1, "misses": 1, "evictions": 0, "size": 1}, query_cache.stats())
+
+        # every mutation invalidates the cached results of the blog
+        blog.create_post("Journey two", "")
+        self.assertEqual([1, 3], [post.code for post in blog.retrieve_posts("journey")])
+        blog.update_post(1, "Starting my trip", "")
+        self.assertEqual([3], [post.code for post in blog.retrieve_posts("journey")])
+        blog.delete_post(3)
+        self.assertEqual([], blog.retrieve_posts("journey"))
+        self.assertEqual(1, query_cache.stats()["hits"])
+
+        # least recently used searches are evicted first
+        self.configuration.__class__.query_cache_size = 2
+        blog.retrieve_posts("step")
+        blog.retrieve_posts("storm")
+        blog.retrieve_posts("step")
+        blog.retrieve_posts("time")
+        self.assertEqual({"hits": 2, "misses": 7, "evictions": 2, "size": 2}, query_cache.stats())
+        blog.retrieve_posts("step")
+        self.assertEqual(3, query_cache.stats()["hits"])
+
+    def test_text_buffer_matches_scan(self):
+        # compare the search engines themselves, not the cached results
+        self.configuration.__class__.query_cache_size = 0
+        words = ["Journey", "storm", "trip", "once", "upon", "time", "Straße", "step"]
+        generator = random.Random(5)
+        blog = self.reload_blog()
+        self.configuration.__class__.text_buffer = True
+        queries = ["", "e", "st", "our", "JOURNEY", "ey st", "STRASSE", "upon tim", "zzz", "updated s"]
+        for i in range(100):
+            blog.create_post(
+                " ".join(generator.choices(words, k=2)), " ".join(generator.choices(words, k=6))
+            )
+
+        # the buffer is built on the first search and kept up to date after it,
+        # repacking itself as updated and deleted posts pile up
+        for round in range(3):
+            buffered = {query: blog.retrieve_posts(query) for query in queries}
+            self.configuration.__class__.text_buffer = False
+            self.configuration.__class__.trigram_index = False
+            for query in queries:
+                self.assertEqual(blog.retrieve_posts(query), buffered[query], query)
+            self.configuration.__class__.text_buffer = True
+
+            for code in generator.sample(sorted(blog.postPickle.posts_by_code), 30):
+                blog.update_post(code, "updated " + generator.choice(words), generator.choice(words))
+            for code in generator.sample(sorted(blog.postPickle.posts_by_code), 10):
+                blog.delete_post(code)
+            blog.create_post("new", "post")
+        self.assertLess(blog.postPickle.text_buffer.dead_bytes * 2, len(blog.postPickle.text_buffer.buffer))
+
+    def test_text_buffer_stands_in_for_scan(self):
+        self.configuration.__class__.query_cache_size = 0
+        self.configuration.__class__.text_buffer = True
+        blog = self.reload_blog()
+        for i in range(100):
+            blog.create_post(f"title {i}", "a journey" if i == 50 else "a trip")
+
+        # the trigram index narrows a selective query down more cheaply
+        self.assertEqual([51], [post.code for post in blog.retrieve_posts("journey")])
+        self.assertIsNone(blog.postPickle.text_buffer)
+        # while a query too short for it would otherwise check every post
+        self.assertEqual([51], [post.code for post in blog.retrieve_posts("jo")])
+        self.assertIsNotNone(blog.postPickle.text_buffer)
+
+    def test_regex_search(self):
+        blog = self.reload_blog()
+        blog.create_post("Release 2024-03-01", "fixes TICKET-12 and ticket-7")
+        blog.create_post("Planning", "ticket-40 moved to 2024-04-15")
+        blog.create_post("Notes", "nothing to see")
+
+        def codes(pattern, flags=0):
+            return [post.code for post in blog.retrieve_posts_regex(pattern, flags)]
+
+        self.assertEqual([1, 2], codes(r"\d{4}-\d{2}-\d{2}"))
+        self.assertEqual([2], codes(r"ticket-\d\d"))
+        self.assertEqual([1, 2], codes(r"ticket-\d\d", re.IGNORECASE))
+        self.assertEqual([3], codes(r"^Notes$"))
+        self.assertEqual([], codes(r"12.*Planning"), "matches never span posts")
+
+        # results are streamed, so callers can stop at the first one
+        matches = blog.retrieve_posts_regex(r"\d")
+        self.assertEqual(1, next(matches).code)
+
+        with self.assertRaises(IllegalOperationException):
+            blog.retrieve_posts_regex("(unclosed")
+
+    def test_regex_buffer_matches_scan(self):
+        words = ["Journey", "storm", "trip", "once", "upon", "time", "step", "2024", "7"]
+        generator = random.Random(3)
+        blog = self.reload_blog()
+        for i in range(150):
+            blog.create_post(
+                " ".join(generator.choices(words, k=2)), " ".join(generator.choices(words, k=6))
+            )
+        patterns = [
+            r"st\w+", r"e.*t", r"[^a-z ]+", r"\bup", r"o?", r"time\s\d+", r"Journey$",
+            r"(?<=once )upon", r"\d{4}", r"x|y|z", r"S?T.P",
+        ]
+        for round in range(2):
+            buffered = {pattern: list(blog.retrieve_posts_regex(pattern)) for pattern in patterns}
+            self.configuration.__class__.regex_buffer = False
+            for pattern in patterns:
+                self.assertEqual(list(blog.retrieve_posts_regex(pattern)), buffered[pattern], pattern)
+            self.configuration.__class__.regex_buffer = True
+
+            # the buffer is rebuilt after mutations
+            for code in range(1, 150, 4):
+                blog.update_post(code, generator.choice(words), "")
+            for code in range(2, 150, 9):
+                blog.delete_post(code)
+
+    def test_journal_torn_record(self):
+        blog = self.reload_blog()
+        blog.create_post("title 1", "text 1")
+        blog.create_post("title 2", "text 2")
+
+        # simulate a crash in the middle of an append
+        journal_file = os.path.join(self.data_dir.name, "1.log")
+        with open(journal_file, "ab") as file:
+            file.write(b"\x80\x04\x95")
+
+        reloaded = self.reload_blog()
+        self.assertEqual(2, len(reloaded.list_posts()))
+
+        # the torn record is cut off, so the posts journaled after it survive a reload
+        reloaded.create_post("title 3", "text 3")
+        self.assertEqual([3, 2, 1], [post.code for post in self.reload_blog().list_posts()])
+
+    def test_write_behind_coalesces(self):
+        self.configuration.__class__.write_behind = True
+        self.configuration.__class__.write_behind_interval_ms = 60 * 1000
+        self.configuration.__class__.journaling = False
+        blog = self.reload_blog()
+        blog.create_post("title 1", "text 1")
+        blog.create_post("title 2", "text 2")
+        blog.update_post(1, "new title", "new text")
+        self.assertEqual(0, len(self.reload_blog().list_posts()), "nothing written yet")
+
+        flushes = write_behind_flusher.flushes
+        write_behind_flusher.drain()
+        self.assertEqual(flushes + 1, write_behind_flusher.flushes, "one write for the burst")
+        self.assertEqual(blog.list_posts(), self.reload_blog().list_posts())
+
+    def test_write_behind_failed_flush(self):
+        self.configuration.__class__.write_behind = True
+        self.configuration.__class__.write_behind_interval_ms = 60 * 1000
+        blog = self.reload_blog()
+        blog.create_post("title 1", "text 1")
+        # the journal cannot be appended to while a directory takes its place
+        journal_file = os.path.join(self.data_dir.name, "1.log")
+        os.mkdir(journal_file)
+        write_behind_flusher.drain()
+        self.assertEqual(1, len(blog.postPickle.pending_records), "kept for the next flush")
+
+        os.rmdir(journal_file)
+        blog.create_post("title 2", "text 2")
+        write_behind_flusher.drain()
+        self.assertEqual([2, 1], [post.code for post in self.reload_blog().list_posts()])
+
+    def test_persisted_indexes(self):
+        self.configuration.__class__.query_cache_size = 0
+        index_file = os.path.join(self.data_dir.name, "1.idx")
+        blog = self.reload_blog()
+        for i in range(1, 6):
+            blog.create_post(f"title {i}", f"journey number {i}")
+        self.assertFalse(os.path.exists(index_file), "nothing saved before an index is built")
+
+        # an index built while the journal holds posts is left to the next compaction
+        self.assertEqual(5, len(blog.retrieve_posts("journey", whole_words=True)))
+        self.assertFalse(os.path.exists(index_file))
+        self.assertTrue(os.path.exists(os.path.join(self.data_dir.name, "1.log")))
+        blog.postPickle.compact()
+        self.assertTrue(os.path.exists(index_file))
+        self.assertFalse(os.path.exists(os.path.join(self.data_dir.name, "1.log")))
+
+        # loaded at startup, then brought up to date with the journal
+        blog.update_post(2, "title 2", "a trip")
+        blog.delete_post(3)
+        blog.create_post("title 6", "another journey")
+        reloaded = self.reload_blog()
+        self.assertIsNotNone(reloaded.postPickle.word_index)
+        self.assertEqual(
+            [1, 4, 5, 6], [post.code for post in reloaded.retrieve_posts("journey", whole_words=True)]
+        )
+        self.assertEqual([2], [post.code for post in reloaded.retrieve_posts("trip", whole_words=True)])
+
+        # rebuilt when the records file changed since the index was saved
+        reloaded.postPickle.compact()
+        with open(index_file, "rb") as file:
+            saved = file.read()
+        blog = self.reload_blog()
+        blog.create_post("title 7", "last journey")
+        blog.postPickle.compact()
+        with open(index_file, "wb") as file:
+            file.write(saved)
+        self.assertIsNone(self.reload_blog().postPickle.word_index)
+
+        # and when the index file is corrupt
+        blog.retrieve_posts("last", whole_words=True)
+        with open(index_file, "r+b") as file:
+            file.seek(-1, os.SEEK_END)
+            last = file.read(1)
+            file.seek(-1, os.SEEK_END)
+            file.write(bytes([last[0] ^ 0xFF]))
+        reloaded = self.reload_blog()
+        self.assertIsNone(reloaded.postPickle.word_index)
+        self.assertEqual(
+            [1, 4, 5, 6, 7], [post.code for post in reloaded.retrieve_posts("journey", whole_words=True)]
+        )
+
+    def test_without_journaling(self):
+        self.configuration.__class__.journaling = False
+        blog = self.reload_blog()
+        blog.create_post("title 1", "text 1")
+
+        journal_file = os.path.join(self.data_dir.name, "1.log")
+        self.assertFalse(os.path.exists(journal_file))
+        self.assertEqual(1, len(self.reload_blog().list_posts()))
+
+
+class PostDAOSQLiteTest(DataDirTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.configuration.__class__.storage_backend = "sqlite"
+        self.blog = BlogDAOSQLite().create_blog(Blog(1, "Name", "URL", "email"))
+
+    def create_post(self, title: str, text: str, creation_time: tuple, update_time: tuple):
+        post = Post(0, title, text)
+        post.creation_time = creation_time
+        post.update_time = update_time
+        return PostDAOSQLite(self.blog).create_post(post)
+
+    def test_codes_from_blog_counter(self):
+        for i in range(1, 4):
+            self.blog.create_post(f"title {i}", f"text {i}")
+        self.blog.delete_post(3)
+        self.assertFalse(self.blog.delete_post(3))
+
+        # the counter is kept in the blogs table, so a fresh DAO carries on from it
+        reloaded = BlogDAOSQLite().search_blog(1)
+        self.assertEqual(3, reloaded.counter)
+        self.assertEqual(4, reloaded.create_post("title 4", "text 4").code)
+        self.assertEqual([4, 2, 1], [post.code for post in reloaded.list_posts()])
+
+        reloaded.update_post(2, "new title", "new text")
+        self.assertEqual("new title", PostDAOSQLite(self.blog).search_post(2).title)
+
+    def test_posts_between(self):
+        self.create_post("march", "", (2026, 3, 10, 8, 0), (2026, 6, 1, 0, 0))
+        self.create_post("may", "", (2026, 5, 1, 0, 0), (2026, 5, 2, 0, 0))
+        self.create_post("april", "", (2026, 4, 30, 23, 59), (2026, 4, 30, 23, 59))
+        post_dao = PostDAOSQLite(self.blog)
+
+        def titles(start, end, field="update_time"):
+            return [post.title for post in post_dao.posts_between(start, end, field)]
+
+        self.assertEqual(
+            ["march", "april"], titles((2026, 3, 1, 0, 0), (2026, 5, 1, 0, 0), "creation_time")
+        )
+        self.assertEqual(["april", "may", "march"], titles(None, None))
+        self.assertEqual(["march"], titles((2026, 6, 1, 0, 0), None))
+        with self.assertRaises(ValueError):
+            post_dao.posts_between(None, None, "title")
+
+    def test_query_sql(self):
+        self.create_post("Trip", "the river", (2026, 1, 5, 0, 0), (2026, 1, 5, 0, 0))
+        self.create_post("Storm", "the trip", (2026, 2, 5, 0, 0), (2026, 3, 5, 0, 0))
+        self.create_post("TRIP again", "coffee", (2026, 3, 5, 0, 0), (2026, 3, 5, 0, 0))
+        post_dao = PostDAOSQLite(self.blog)
+
+        self.assertEqual([1, 3], [post.code for post in post_dao.query_posts("title:trip")])
+        self.assertEqual([2], [post.code for post in post_dao.query_posts("trip NOT title:trip")])
+        self.assertEqual([2, 3], [post.code for post in post_dao.query_posts("updated:2026-03")])
+
+        plan = post_dao.explain_posts("created:>=2026-02 AND code:<3")
+        self.assertIn("SQL SELECT", plan)
+        self.assertIn("creation_time >= ?", plan)
+        self.assertIn("1 rows in", plan.splitlines()[-1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,3 +1,4 @@
+import pickle
 from unittest import TestCase
 import unittest
 from blogging.post import Post
@@ -46,6 +47,22 @@ class PostTest(TestCase):
         self.assertEqual(expected_post2, actual_list[1])
         self.assertEqual(expected_post3, actual_list[0])
 
+    def test_folded_fields(self):
+        post = Post(1, "Straße Trip", "DAY One")
+        self.assertEqual("strasse trip", post.folded_title)
+        self.assertEqual("day one", post.folded_text)
+
+        # the normalized fields follow the values
+        post.set_values("New TITLE", "New Text")
+        self.assertEqual("new title", post.folded_title)
+        self.assertEqual("new text", post.folded_text)
+
+        # and are recomputed on load rather than saved
+        self.assertNotIn("folded_title", post.__getstate__())
+        copy = pickle.loads(pickle.dumps(post))
+        self.assertEqual(post, copy)
+        self.assertEqual("new title", copy.folded_title)
+
 
 def test_stress_test(self): 
     for i in range(1, 1001): 
@@ -0,0 +1,151 @@
+import random
+from unittest import TestCase
+import unittest
+from blogging.blog import Blog
+from blogging.dao.blog_dao import BlogDAOJSON, BlogDAOSQLite
+from blogging.dao.post_dao import PostDAOPickle, PostDAOSQLite
+from blogging.exception.invalid_query_exception import InvalidQueryException
+from blogging.post import Post
+from blogging.query.parser import BLOG_FIELDS, POST_FIELDS, parse
+from tests.data_dir import DataDirTestCase
+
+WORDS = ["journey", "storm", "trip", "river", "coffee", "Straße", "garden"]
+QUERIES = [
+    "journey",
+    "ss",
+    '"river coffee"',
+    "title:trip AND NOT text:storm",
+    "title:stra OR text:garden",
+    "updated:>2026-06-15",
+    "created:2026-03 OR code:<5",
+    "code:>=280 journey",
+    "code:100",
+    "updated:<=2026-02 AND (title:coffee OR text:garden)",
+    "NOT (journey OR storm)",
+    "created:2026-05-01T00:00 OR created:>=2026-12-31",
+]
+
+
+class QueryParserTest(TestCase):
+
+    def test_precedence(self):
+        self.assertEqual("(a OR (b AND NOT c))", str(parse("a OR b NOT c", POST_FIELDS)))
+        self.assertEqual("((a OR b) AND c)", str(parse("(a OR b) AND c", POST_FIELDS)))
+        self.assertEqual('(title:"a b" AND text:c)', str(parse('title:"a b" text:c', POST_FIELDS)))
+        # words that only look like fields are searched as they are
+        self.assertEqual("https://example.com", parse("https://example.com", POST_FIELDS).value)
+
+    def test_ranges(self):
+        term = parse("updated:>2026-12-31", POST_FIELDS)
+        self.assertEqual(((2027, 1, 1), None), (term.start, term.end))
+        term = parse("created:<=2026-12", POST_FIELDS)
+        self.assertEqual((None, (2027, 1)), (term.start, term.end))
+        term = parse("created:2026-01-31T23:59", POST_FIELDS)
+        self.assertEqual(((2026, 1, 31, 23, 59), (2026, 2, 1, 0, 0)), (term.start, term.end))
+        term = parse("id:<3", BLOG_FIELDS)
+        self.assertEqual((None, 3), (term.start, term.end))
+
+    def test_invalid_queries(self):
+        for query in ["", "a AND", "(a", "a)", "NOT", "code:x", "updated:2026-13",
+                      "title:>a", "title:", '"a', "url:<b"]:
+            with self.assertRaises(InvalidQueryException, msg=query):
+                parse(query, BLOG_FIELDS if "url" in query else POST_FIELDS)
+
+
+class QueryPlannerTest(DataDirTestCase):
+
+    def setUp(self):
+        super().setUp()
+        # compare the plans themselves, not the cached results
+        self.configuration.__class__.query_cache_size = 0
+
+    def create_posts(self, *daos):
+        generator = random.Random(3)
+        for code in range(1, 301):
+            title = " ".join(generator.choices(WORDS, k=2))
+            post = Post(code, title, " ".join(generator.choices(WORDS, k=6)))
+            post.creation_time = (2026, generator.randint(1, 12), generator.randint(1, 28), 0, 0)
+            post.update_time = (2026, generator.randint(1, 12), generator.randint(1, 28), 12, 30)
+            for dao in daos:
+                dao.create_post(post)
+
+    def test_plans_match_scans_and_sqlite(self):
+        BlogDAOSQLite().create_blog(Blog(1, "blog", "url", "email"))
+        pickle_dao = PostDAOPickle(Blog(1, "blog", "url", "email"))
+        sqlite_dao = PostDAOSQLite(Blog(1, "blog", "url", "email"))
+        self.create_posts(pickle_dao, sqlite_dao)
+
+        for query in QUERIES:
+            planned = [post.code for post in pickle_dao.query_posts(query)]
+            self.assertEqual(planned, [post.code for post in sqlite_dao.query_posts(query)], query)
+            self.configuration.__class__.trigram_index = False
+            self.assertEqual(planned, [post.code for post in pickle_dao.query_posts(query)], query)
+            self.configuration.__class__.trigram_index = True
+
+    def test_explain(self):
+        dao = PostDAOPickle(Blog(1, "blog", "url", "email"))
+        self.create_posts(dao)
+
+        plan = dao.explain_posts("code:100")
+        self.assertIn("Plan index,", plan)
+        self.assertIn("Index code:100 using code index", plan)
+        self.assertTrue(plan.endswith("ms"))
+        self.assertIn("1 rows in", plan.splitlines()[-1])
+
+        # the most selective index drives the query, the rest is checked on its results
+        plan = dao.explain_posts("journey AND code:>=290")
+        self.assertIn("Plan index and filter", plan)
+        self.assertIn("  Index code:>=290 using code index", plan)
+        self.assertNotIn("trigram", plan)
+
+        # too short for the trigram index, and negations have no index
+        self.assertIn("Scan all 300 documents", dao.explain_posts("ss"))
+        self.assertIn("Scan all 300 documents", dao.explain_posts("NOT journey"))
+
+        # a range covering every post is cheaper to scan than to read from the index
+        self.assertIn("Plan scan", dao.explain_posts("updated:>=2026 journey"))
+
+        # words in a row are looked up by position
+        self.configuration.__class__.trigram_index = False
+        dao.create_post(Post(301, "Rare words", "coffee at the river, then a rare journey"))
+        plan = dao.explain_posts('"a rare journey"')
+        self.assertIn('Index "a rare journey" using phrase index for candidates', plan)
+        self.assertIn("1 rows in", plan.splitlines()[-1])
+
+    def test_substring_index_built_once_needed(self):
+        dao = PostDAOPickle(Blog(1, "blog", "url", "email"))
+        self.create_posts(dao)
+
+        # a phrase builds the phrase index alone, rather than both indexes to compare them
+        dao.query_posts('"river coffee"')
+        self.assertIsNotNone(dao.phrase_index)
+        self.assertIsNone(dao.substring_index)
+        # a single word needs the trigram index
+        dao.query_posts("journey")
+        self.assertIsNotNone(dao.substring_index)
+
+    def test_blog_queries(self):
+        json_dao = BlogDAOJSON()
+        sqlite_dao = BlogDAOSQLite()
+        for dao in (json_dao, sqlite_dao):
+            dao.create_blog(Blog(1, "Travel notes", "https://www.travel.com/", "me@travel.com"))
+            dao.create_blog(Blog(2, "Cooking", "cooking.org", "Me@Travel.com"))
+            dao.create_blog(Blog(3, "Night travel", "travel.com/night", "night@travel.com"))
+
+        expected = {
+            "travel": [1, 3],
+            "url:travel.com": [1],
+            "email:ME@travel.com": [1, 2],
+            "email:me@travel.com NOT name:cook": [1],
+            "id:>1 OR url:http://travel.com": [1, 2, 3],
+            'name:"night travel"': [3],
+        }
+        for query, ids in expected.items():
+            self.assertEqual(ids, [blog.id for blog in json_dao.query_blogs(query)], query)
+            self.assertEqual(ids, [blog.id for blog in sqlite_dao.query_blogs(query)], query)
+        self.assertIn("using url index", json_dao.explain_blogs("url:travel.com"))
+        self.assertIn("SQL SELECT", sqlite_dao.explain_blogs("url:travel.com"))
+
+
+if __name__ == "__main__":
+    unittest.main()